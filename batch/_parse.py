@@ -0,0 +1,37 @@
+"""Column parsers shared by the batch tools.
+
+Each takes a sequence of cell strings and returns an array, with NaT/NaN for
+cells that do not parse, so one bad row never fails a whole chunk.
+"""
+import numpy as np
+
+
+def parse_datetimes(values):
+    """datetime64[s] array from ISO 8601 strings."""
+    try:
+        return np.array(values, dtype="datetime64[s]")
+    except ValueError:
+        pass
+    # Slow path only for chunks that contain a malformed timestamp.
+    out = np.empty(len(values), dtype="datetime64[s]")
+    for i, value in enumerate(values):
+        try:
+            out[i] = np.datetime64(value, "s")
+        except ValueError:
+            out[i] = np.datetime64("NaT")
+    return out
+
+
+def parse_floats(values):
+    """float array from numeric strings."""
+    try:
+        return np.array(values, dtype=float)
+    except ValueError:
+        pass
+    out = np.empty(len(values))
+    for i, value in enumerate(values):
+        try:
+            out[i] = float(value)
+        except ValueError:
+            out[i] = np.nan
+    return out
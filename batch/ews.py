@@ -0,0 +1,235 @@
+"""Watch a ward's PEWS-style early-warning scores from a stream of vital-sign observations.
+
+    python -m batch.ews observations.csv                    # score a file once, print the ward board
+    python -m batch.ews observations.csv --follow --board 60
+    python -m batch.ews --listen 127.0.0.1:9900             # newline-delimited CSV over TCP
+
+Input columns (header row required; on a socket, the first line of each
+connection; extra columns are ignored):
+
+    patient        bed or MRN
+    obs_datetime   ISO 8601 hospital local time (KKH_HOSPITAL_TZ), e.g. 2026-03-01 08:15
+    age_years      age in years (fractions for infants, e.g. 0.25)
+    hr, rr, sbp    heart rate, respiratory rate and systolic BP; blank if not taken
+    temp           optional, °C
+
+Lines are scored in micro-batches: whatever has arrived since the last poll
+goes through one vectorized call, then advances each patient's rolling
+window (core.ews), so no history is ever recomputed. Escalations and newly
+rising trends above the routine band are printed as they happen.
+"""
+import argparse
+import csv
+import selectors
+import socket
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from batch._parse import parse_datetimes, parse_floats
+from core.ews import ESCALATION, RISING_BY, WINDOW_HOURS, EwsUpdate, Ward
+from core.hospital_time import epoch_seconds, hospital_tz
+
+REQUIRED_COLUMNS = ("patient", "obs_datetime", "age_years", "hr", "rr", "sbp")
+
+
+# ===============================
+# SCORING
+# ===============================
+def _check_header(header):
+    missing = [c for c in REQUIRED_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"missing required column(s): {', '.join(missing)}")
+
+
+def score_rows(ward, header, rows):
+    """Feed CSV rows (lists of strings) under `header` to `ward`; returns its updates."""
+    n = len(header)
+    rows = [(row + [""] * n)[:n] for row in rows if any(row)]
+    if not rows:
+        return []
+    columns = dict(zip(header, zip(*rows)))
+    hours = epoch_seconds(parse_datetimes([v.strip() or "NaT" for v in columns["obs_datetime"]])) / 3600
+    floats = {
+        name: parse_floats([v.strip() or "nan" for v in columns[name]])
+        for name in ("age_years", "hr", "rr", "sbp", "temp") if name in columns
+    }
+    return ward.update(
+        [p.strip() for p in columns["patient"]], hours,
+        floats["age_years"], floats["hr"], floats["rr"], floats["sbp"], floats.get("temp", np.nan),
+    )
+
+
+def _local(hours):
+    return datetime.fromtimestamp(hours * 3600, hospital_tz()).strftime("%Y-%m-%d %H:%M")
+
+
+def describe(u: EwsUpdate, window=WINDOW_HOURS):
+    return (
+        f"{_local(u.hours)}  {u.patient:<10} score {u.score:>2}  peak {u.peak:>2}  "
+        f"mean {u.mean:4.1f}  {u.trend:+d} over {window:g}h  {ESCALATION[u.band][1]}"
+    )
+
+
+def print_board(ward, out=sys.stdout):
+    board = ward.board()
+    print(f"--- ward board: {len(board)} patient(s) ---", file=out)
+    for u in board:
+        print(describe(u, ward.window), file=out)
+    out.flush()
+
+
+# ===============================
+# SOURCES
+# ===============================
+# Each source yields (header, rows) batches, and (None, []) when idle so the
+# caller can refresh the board.
+def _header(line):
+    return [c.strip().lower() for c in next(csv.reader([line]))]
+
+
+def tail_file(path, follow=False, poll=0.5):
+    """Rows of a CSV file; with `follow`, keep reading lines appended to it."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = _header(f.readline())
+        _check_header(header)
+        partial = ""
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                if not follow:
+                    if partial:
+                        yield header, list(csv.reader([partial]))
+                    return
+                yield None, []
+                time.sleep(poll)
+                continue
+            # Hold back an incomplete last line until the writer finishes it.
+            text, _, partial = (partial + chunk).rpartition("\n")
+            if text:
+                yield header, list(csv.reader(text.splitlines()))
+
+
+def listen(address, poll=0.5):
+    """Rows sent to a local TCP socket, one CSV line each, header first per connection.
+
+    A stand-in for a monitor gateway feed: `nc 127.0.0.1 9900 < observations.csv`.
+    """
+    host, _, port = address.rpartition(":")
+    server = socket.create_server((host or "127.0.0.1", int(port)))
+    server.setblocking(False)
+    selector = selectors.DefaultSelector()
+    selector.register(server, selectors.EVENT_READ)
+    # connection -> [header or None, incomplete line]
+    streams = {}
+    try:
+        while True:
+            batch = defaultdict(list)
+            for key, _ in selector.select(timeout=poll):
+                if key.fileobj is server:
+                    conn, _ = server.accept()
+                    conn.setblocking(False)
+                    selector.register(conn, selectors.EVENT_READ)
+                    streams[conn] = [None, b""]
+                    continue
+                conn = key.fileobj
+                state = streams[conn]
+                data = conn.recv(1 << 16)
+                if data:
+                    *lines, state[1] = (state[1] + data).split(b"\n")
+                else:
+                    lines = [state[1]]
+                    selector.unregister(conn)
+                    conn.close()
+                    del streams[conn]
+                for line in lines:
+                    line = line.decode("utf-8-sig").rstrip("\r")
+                    if not line:
+                        continue
+                    if state[0] is None:
+                        header = _header(line)
+                        try:
+                            _check_header(header)
+                        except ValueError as e:
+                            print(f"rejected connection: {e}", file=sys.stderr)
+                            header = ()
+                        state[0] = tuple(header)
+                    elif state[0]:
+                        batch[state[0]].append(line)
+            if not batch:
+                yield None, []
+            for header, lines in batch.items():
+                yield list(header), list(csv.reader(lines))
+    finally:
+        for conn in streams:
+            conn.close()
+        server.close()
+
+
+# ===============================
+# WATCH LOOP
+# ===============================
+def watch(batches, ward, board_every=0.0, discharge_after=24.0, alerts=True, out=sys.stdout):
+    """Score every batch; print escalations, newly rising trends and the board."""
+    rising = set()
+    latest = -np.inf
+    last_board = time.monotonic()
+    for header, rows in batches:
+        for u in score_rows(ward, header, rows) if rows else ():
+            latest = max(latest, u.hours)
+            # A rise within the routine band is noise, not deterioration.
+            deteriorating = u.rising and u.band > 0
+            if deteriorating and u.patient not in rising:
+                rising.add(u.patient)
+                if alerts:
+                    print(f"RISING     {describe(u, ward.window)}", file=out)
+            elif u.escalated and alerts:
+                print(f"ESCALATED  {describe(u, ward.window)}", file=out)
+            if not deteriorating:
+                rising.discard(u.patient)
+        if board_every and time.monotonic() - last_board >= board_every:
+            ward.discharge(latest - discharge_after)
+            rising &= set(ward.patients)
+            print_board(ward, out)
+            last_board = time.monotonic()
+        out.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("input", nargs="?", help="observations CSV")
+    source.add_argument("--listen", metavar="HOST:PORT", help="read observations from a local TCP socket")
+    parser.add_argument("--follow", action="store_true", help="keep reading lines appended to the input")
+    parser.add_argument("--window", type=float, default=WINDOW_HOURS, help=f"rolling window in hours (default {WINDOW_HOURS:g})")
+    parser.add_argument("--board", type=float, default=0, metavar="SECONDS", help="reprint the ward board this often")
+    parser.add_argument("--discharge-after", type=float, default=24, metavar="HOURS",
+                        help="drop patients with no observation for this long (default 24)")
+    parser.add_argument("--poll", type=float, default=0.5, help="seconds between polls when idle (default 0.5)")
+    parser.add_argument("--quiet", action="store_true", help="no per-observation alerts")
+    args = parser.parse_args(argv)
+
+    ward = Ward(args.window)
+    try:
+        batches = listen(args.listen, args.poll) if args.listen else tail_file(args.input, args.follow, args.poll)
+        start = time.perf_counter()
+        watch(batches, ward, args.board, args.discharge_after, alerts=not args.quiet)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    except KeyboardInterrupt:
+        pass
+    elapsed = time.perf_counter() - start
+
+    print_board(ward)
+    print(
+        f"{len(ward.patients)} patient(s) in {elapsed:.2f}s; rising trend = +{RISING_BY} points over "
+        f"{args.window:g}h; {ward.late} late and {ward.unscored} unscored observation(s) skipped",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
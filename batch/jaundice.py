@@ -0,0 +1,196 @@
+"""Re-score a census extract of TcB/SB readings against the KKH jaundice thresholds.
+
+    python -m batch.jaundice readings.csv scored.csv [--chunksize 50000]
+
+Input columns (header row required; extra columns are passed through):
+
+    birth_datetime     ISO 8601 hospital local time (KKH_HOSPITAL_TZ), e.g. 2026-03-01 08:15
+    sample_datetime    ISO 8601 local time of the reading
+    value              bilirubin in µmol/L
+    measurement_type   "TcB"/"transcutaneous" or "SB"/"serum"; anything else is an invalid row
+    risk_factors       free text; any non-empty entry makes the infant High-Risk
+    on_phototherapy    optional; 1/true/yes for inpatients on phototherapy
+
+The file is streamed in fixed-size chunks, so memory use does not grow with
+the number of rows. Parquet input, scored into Parquet or CSV, is supported
+when pyarrow is installed. Summary counts per action band are printed at the end. Blank
+lines are skipped; rows with the wrong number of cells are scored as
+"Invalid row".
+"""
+import argparse
+import csv
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from batch._parse import parse_datetimes, parse_floats
+from core.hospital_time import hours_of_life_array
+from core.jaundice import ACTIONS, TCB_MESSAGES, jaundice_actions, tcb_sb_needed
+
+REQUIRED_COLUMNS = ("birth_datetime", "sample_datetime", "value", "measurement_type", "risk_factors")
+OUTPUT_COLUMNS = ("hours_of_life", "risk", "action")
+
+INVALID_ROW = "Invalid row"
+_NO_RISK = {"", "none", "nil", "no", "0", "false"}
+_TRUE = {"1", "true", "yes", "y"}
+_TCB_PREFIXES = ("tcb", "transcutaneous")
+_SB_PREFIXES = ("serum",)
+
+_ACTION_LABELS = np.array([ACTIONS[code][0] for code in sorted(ACTIONS)], dtype=object)
+_TCB_LABELS = np.array([TCB_MESSAGES[False], TCB_MESSAGES[True]], dtype=object)
+
+
+# ===============================
+# PARSING
+# ===============================
+def _flags(values, truthy):
+    return np.array([str(v).strip().lower() in truthy for v in values], dtype=bool)
+
+
+# ===============================
+# SCORING
+# ===============================
+def score_chunk(columns):
+    """Score one chunk given as {column name: sequence}; returns output columns."""
+    birth = parse_datetimes(columns["birth_datetime"])
+    sample = parse_datetimes(columns["sample_datetime"])
+    value = parse_floats(columns["value"])
+    types = [str(m).strip().lower() for m in columns["measurement_type"]]
+    is_tcb = np.array([m.startswith(_TCB_PREFIXES) for m in types], dtype=bool)
+    is_sb = np.array([m == "sb" or m.startswith(_SB_PREFIXES) for m in types], dtype=bool)
+    high_risk = ~_flags(columns["risk_factors"], _NO_RISK)
+    n = len(value)
+    on_pt = _flags(columns["on_phototherapy"], _TRUE) if "on_phototherapy" in columns else np.zeros(n, bool)
+
+    hours = hours_of_life_array(birth, sample)
+
+    action = np.where(
+        is_tcb,
+        _TCB_LABELS[tcb_sb_needed(hours, value, high_risk).astype(np.intp)],
+        _ACTION_LABELS[jaundice_actions(hours, value, high_risk, on_pt)],
+    )
+    # A blank or unrecognised type must not fall through to the serum thresholds.
+    action[np.isnan(hours) | np.isnan(value) | ~(is_tcb | is_sb)] = INVALID_ROW
+
+    return {
+        "hours_of_life": np.round(hours, 1),
+        "risk": np.where(high_risk, "High-Risk", "Normal-Risk"),
+        "action": action,
+    }
+
+
+# ===============================
+# CSV STREAMING
+# ===============================
+def _csv_chunks(reader, header, chunksize):
+    """(rows, columns, malformed) per chunk. Blank lines are skipped; rows
+    with too few or too many cells are padded or cut to the header width, so
+    the columns stay aligned, and flagged as malformed."""
+    n = len(header)
+    while True:
+        rows = [row for _, row in zip(range(chunksize), reader)]
+        if not rows:
+            return
+        rows = [row for row in rows if any(cell.strip() for cell in row)]
+        if not rows:
+            continue
+        malformed = np.array([len(row) != n for row in rows], dtype=bool)
+        rows = [(row + [""] * n)[:n] for row in rows]
+        yield rows, dict(zip(header, zip(*rows))), malformed
+
+
+def _check_header(header):
+    missing = [c for c in REQUIRED_COLUMNS if c not in header]
+    if missing:
+        raise SystemExit(f"missing required column(s): {', '.join(missing)}")
+
+
+def rescore_csv(src, dst, chunksize):
+    counts = Counter()
+    with open(src, newline="", encoding="utf-8-sig") as fin, open(dst, "w", newline="", encoding="utf-8") as fout:
+        reader = csv.reader(fin)
+        header = next(reader, None)
+        if header is None:
+            raise SystemExit(f"{src}: empty file")
+        _check_header(header)
+        writer = csv.writer(fout)
+        writer.writerow(header + list(OUTPUT_COLUMNS))
+
+        for rows, columns, malformed in _csv_chunks(reader, header, chunksize):
+            scored = score_chunk(columns)
+            scored["action"][malformed] = INVALID_ROW
+            out = [scored[c].tolist() for c in OUTPUT_COLUMNS]
+            writer.writerows(row + list(extra) for row, extra in zip(rows, zip(*out)))
+            counts.update(out[-1])
+    return counts
+
+
+# ===============================
+# PARQUET STREAMING
+# ===============================
+def rescore_parquet(src, dst, chunksize):
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet support needs pyarrow: pip install pyarrow")
+
+    counts = Counter()
+    source = pq.ParquetFile(src)
+    _check_header(source.schema_arrow.names)
+    writer = None
+    try:
+        for batch in source.iter_batches(batch_size=chunksize):
+            columns = {name: batch.column(name).to_numpy(zero_copy_only=False) for name in batch.schema.names}
+            for name in ("birth_datetime", "sample_datetime", "value"):
+                if columns[name].dtype == object:
+                    columns[name] = columns[name].astype(str)
+            scored = score_chunk(columns)
+            table = pa.Table.from_batches([batch])
+            for name in OUTPUT_COLUMNS:
+                table = table.append_column(name, pa.array(scored[name].tolist()))
+            if writer is None:
+                writer = (
+                    pq.ParquetWriter(dst, table.schema)
+                    if dst.endswith(".parquet")
+                    else pacsv.CSVWriter(dst, table.schema)
+                )
+            writer.write_table(table)
+            counts.update(scored["action"].tolist())
+    finally:
+        if writer is not None:
+            writer.close()
+    return counts
+
+
+def rescore(src, dst, chunksize=50_000):
+    """Score `src` into `dst`; returns a Counter of rows per action band."""
+    if src.endswith(".parquet"):
+        return rescore_parquet(src, dst, chunksize)
+    if dst.endswith(".parquet"):
+        raise SystemExit(f"{dst}: Parquet output needs Parquet input; write a .csv instead")
+    return rescore_csv(src, dst, chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score TcB/SB readings against the KKH jaundice thresholds.")
+    parser.add_argument("input", help="CSV or .parquet readings extract")
+    parser.add_argument("output", help="scored CSV to write (or .parquet, from .parquet input)")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="rows per chunk (default 50000)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    counts = rescore(args.input, args.output, args.chunksize)
+    elapsed = time.perf_counter() - start
+
+    total = sum(counts.values())
+    for action, count in counts.most_common():
+        print(f"{count:>10}  {action}")
+    print(f"{total:>10}  rows scored in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Regenerate the jaundice nomogram artifact (data/jaundice_nomogram.npy + .json).
+
+    python -m batch.nomogram [--check]
+
+Run this after editing the rule tables in core/jaundice.py and commit both
+files so the change is reviewable; until then the app ignores the stale
+file and builds the nomogram in memory on every start. --check only
+reports, exiting 1 when the stored file does not match the tables (for CI).
+"""
+import argparse
+import sys
+
+from core import jaundice
+from core.artifacts import is_current, write_artifact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate the jaundice nomogram artifact.")
+    parser.add_argument("--check", action="store_true", help="exit 1 if the stored artifact is stale")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        current = is_current(jaundice.NOMOGRAM_NAME, jaundice.NOMOGRAM_SOURCE)
+        print(f"{jaundice.NOMOGRAM_NAME}: {'up to date' if current else 'STALE'}")
+        sys.exit(0 if current else 1)
+
+    nomogram = jaundice.build_nomogram()
+    meta = write_artifact(jaundice.NOMOGRAM_NAME, nomogram, jaundice.NOMOGRAM_SOURCE, jaundice.nomogram_summary(nomogram))
+    print(f"wrote {jaundice.NOMOGRAM_NAME} {tuple(meta['shape'])} sha256 {meta['sha256'][:12]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Verify a medication-order export against the formulary "Check Dose" rules.
+
+    python -m batch.orders orders.csv checked.csv [--chunksize 50000] [--workers 4]
+
+Input columns (header row required; extra columns are passed through):
+
+    weight      patient weight in kg
+    drug        formulary name, synonym or brand (e.g. Rocephin)
+    route       e.g. IV, PO, "IV / IM"; blank matches any route
+    dose        ordered dose in the formulary unit
+    frequency   QnH (Q4H, Q36H, ...), OD/BD/TDS/QDS or STAT
+    system      optional diagnosis system (e.g. Respiratory) to narrow the drug
+
+When a drug and route are listed under several systems and no system is
+given, the order is checked against the most permissive of those entries.
+STAT/ONCE orders are checked against the max per dose and max daily dose
+only, not the mg/kg/day range.
+Blank lines are skipped; rows with the wrong number of cells are flagged
+"Malformed row" and not dose-checked.
+Orders are read in generator chunks so files larger than memory stream
+through; --workers spreads chunks over a process pool.
+"""
+import argparse
+import csv
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from core.dosage import dose_warnings
+from core.formulary import formulary
+from core.frequency import doses_per_day, is_once_only
+from core.search import EXACT, medication_index, normalize
+
+REQUIRED_COLUMNS = ("weight", "drug", "route", "dose", "frequency")
+OUTPUT_COLUMNS = ("resolved_drug", "warnings")
+
+NOT_IN_FORMULARY = "Drug/route not in formulary"
+UNKNOWN_FREQUENCY = "Unrecognised frequency"
+INVALID_ROW = "Invalid weight or dose"
+MALFORMED_ROW = "Malformed row"
+NO_WARNINGS = "No warnings"
+
+_UNRESOLVED = ("", (np.nan,) * 4)
+
+
+# ===============================
+# RESOLUTION
+# ===============================
+def _route_matches(order_route, formulary_route):
+    return set(order_route.split()) <= set(normalize(formulary_route).split())
+
+
+@lru_cache(maxsize=65536)
+def resolve(drug, route, system):
+    """(formulary drug name, envelope) for an order, or ("", NaNs) if unknown."""
+    table = formulary()
+    rows = table.rows(drug)
+    if not len(rows):
+        hits = medication_index().search(drug, limit=1)
+        if not hits or hits[0].score != EXACT:
+            return _UNRESOLVED
+        rows = table.rows(hits[0].name)
+
+    route = normalize(route)
+    rows = [
+        r for r in rows
+        if (not system or table.systems[table.system_id[r]] == system)
+        and _route_matches(route, table.routes[table.route_id[r]])
+    ]
+    if not rows:
+        return _UNRESOLVED
+    return table.drugs[table.drug_id[rows[0]]], table.envelope(rows)
+
+
+def _doses_per_day(frequency):
+    per_day = doses_per_day(frequency)
+    return np.nan if per_day is None else per_day
+
+
+def _floats(values):
+    out = np.empty(len(values))
+    for i, value in enumerate(values):
+        try:
+            out[i] = float(value)
+        except ValueError:
+            out[i] = np.nan
+    return out
+
+
+# ===============================
+# VERIFICATION
+# ===============================
+def verify_chunk(header, rows):
+    """Check one chunk of order rows; returns (output columns per row, Counter).
+
+    Rows with too few or too many cells are padded or cut to the header
+    width and flagged as malformed, with no other warnings, rather than
+    raising.
+    """
+    col = {name: i for i, name in enumerate(header)}
+    n = len(header)
+    malformed = np.array([len(row) != n for row in rows], dtype=bool)
+    rows = [(row + [""] * n)[:n] for row in rows]
+    system_col = col.get("system")
+    counts = Counter()
+
+    resolved = [
+        resolve(
+            row[col["drug"]].strip(),
+            row[col["route"]],
+            row[system_col].strip() if system_col is not None else "",
+        )
+        for row in rows
+    ]
+    names = [name for name, _ in resolved]
+    low, high, max_dose, max_day = np.array([env for _, env in resolved], dtype=float).reshape(-1, 4).T
+
+    weight = _floats([row[col["weight"]] for row in rows])
+    dose = _floats([row[col["dose"]] for row in rows])
+    per_day = np.array([_doses_per_day(row[col["frequency"]]) for row in rows], dtype=float)
+    once_only = np.array([is_once_only(row[col["frequency"]]) for row in rows], dtype=bool)
+    weight[weight <= 0] = np.nan
+
+    flags = dose_warnings(weight, dose, per_day, low, high, max_dose, max_day, once_only)
+    flags[NOT_IN_FORMULARY] = np.array([not name for name in names], dtype=bool)
+    flags[UNKNOWN_FREQUENCY] = np.isnan(per_day)
+    flags[INVALID_ROW] = np.isnan(weight) | np.isnan(dose)
+    # Cells of a misaligned row may sit under the wrong column, so its other
+    # flags mean nothing.
+    for label in flags:
+        flags[label] &= ~malformed
+    flags[MALFORMED_ROW] = malformed
+
+    labels = list(flags)
+    matrix = np.stack([flags[label] for label in labels], axis=1)
+    out = []
+    for name, row_flags in zip(names, matrix):
+        warnings = [label for label, hit in zip(labels, row_flags) if hit]
+        counts.update(warnings or [NO_WARNINGS])
+        out.append((name, "; ".join(warnings)))
+    return out, counts
+
+
+def _chunks(reader, chunksize):
+    while True:
+        rows = [row for _, row in zip(range(chunksize), reader)]
+        if not rows:
+            return
+        rows = [row for row in rows if any(cell.strip() for cell in row)]  # blank lines
+        if rows:
+            yield rows
+
+
+def _verified(header, chunks, workers):
+    """Yield (rows, output, counts) per chunk, in input order."""
+    if workers <= 1:
+        for rows in chunks:
+            yield (rows, *verify_chunk(header, rows))
+        return
+
+    # Keep a bounded number of chunks in flight so memory stays flat.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for rows in chunks:
+            pending.append((rows, pool.submit(verify_chunk, header, rows)))
+            if len(pending) >= workers * 2:
+                rows, future = pending.popleft()
+                yield (rows, *future.result())
+        while pending:
+            rows, future = pending.popleft()
+            yield (rows, *future.result())
+
+
+def verify(src, dst, chunksize=50_000, workers=1):
+    """Verify `src` into `dst`; returns (orders read, Counter of orders per warning type)."""
+    counts = Counter()
+    total = 0
+    with open(src, newline="", encoding="utf-8-sig") as fin, open(dst, "w", newline="", encoding="utf-8") as fout:
+        reader = csv.reader(fin)
+        header = next(reader, None)
+        if header is None:
+            raise SystemExit(f"{src}: empty file")
+        header = [name.strip() for name in header]
+        missing = [c for c in REQUIRED_COLUMNS if c not in header]
+        if missing:
+            raise SystemExit(f"missing required column(s): {', '.join(missing)}")
+        writer = csv.writer(fout)
+        writer.writerow(header + list(OUTPUT_COLUMNS))
+
+        for rows, out, chunk_counts in _verified(header, _chunks(reader, chunksize), workers):
+            writer.writerows((row + [""] * len(header))[:len(header)] + list(extra) for row, extra in zip(rows, out))
+            counts.update(chunk_counts)
+            total += len(rows)
+    return total, counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify medication orders against the formulary dose rules.")
+    parser.add_argument("input", help="CSV order export")
+    parser.add_argument("output", help="CSV to write with per-order warnings")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="orders per chunk (default 50000)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1, no pool)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    total, counts = verify(args.input, args.output, args.chunksize, args.workers)
+    elapsed = time.perf_counter() - start
+
+    for warning, count in counts.most_common():
+        print(f"{count:>10}  {warning}")
+    print(f"{total:>10}  orders verified in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
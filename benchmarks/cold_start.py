@@ -0,0 +1,76 @@
+"""Cold-start benchmark: time-to-first-render for the home page and each calculator.
+
+Every target is rendered in a fresh interpreter so module imports are cold,
+exactly as on the first script run after a server restart.
+
+    python benchmarks/cold_start.py [--repeat 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "streamlit_app.py")
+
+TARGETS = [
+    "home",
+    "dosage_dispensing",
+    "fluids",
+    "bmi",
+    "jaundice",
+    "corrected_age",
+    "neonate_feeds",
+    "compatibility",
+    "vitals",
+    "urine_output",
+]
+
+# Runs inside the child interpreter. Streamlit itself is imported before the
+# clock starts: it is loaded once per server, not once per page.
+_CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file({app!r}, default_timeout=60)
+at.query_params["page"] = {page!r}
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+if at.exception:
+    sys.exit("render failed: " + str(at.exception[0].value))
+print(json.dumps({{"seconds": elapsed, "modules": len(sys.modules)}}))
+"""
+
+
+def render_once(page):
+    code = _CHILD.format(app=APP, page=page)
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'page':<20}{'median ms':>12}{'min ms':>10}{'modules':>10}")
+    for page in TARGETS:
+        runs = [render_once(page) for _ in range(args.repeat)]
+        times = [r["seconds"] * 1000 for r in runs]
+        print(
+            f"{page:<20}{statistics.median(times):>12.1f}"
+            f"{min(times):>10.1f}{runs[-1]['modules']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
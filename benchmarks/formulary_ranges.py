@@ -0,0 +1,33 @@
+"""Whole-formulary dose range computation at realistic and 100x formulary sizes.
+
+    python benchmarks/formulary_ranges.py [--scale 100]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import scaled_formulary  # noqa: E402
+from core.formulary import compile_formulary  # noqa: E402
+
+BUDGET_MS = 5.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    for scale in (1, args.scale):
+        table = compile_formulary(*scaled_formulary(scale))
+        number = 200
+        best = min(timeit.repeat(lambda: table.dose_ranges(23.4, 3), number=number, repeat=5)) / number
+        ms = best * 1000
+        status = "ok" if ms < BUDGET_MS else f"OVER {BUDGET_MS} ms BUDGET"
+        print(f"scale {scale:>4}x  {len(table):>6} rows  {ms:8.3f} ms/call  {status}")
+
+
+if __name__ == "__main__":
+    main()
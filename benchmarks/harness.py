@@ -0,0 +1,96 @@
+"""Minimal asv-style benchmark registry, timer and JSON history.
+
+Benchmarks register a setup function per scale; setup returns the callable
+to time (and may return a teardown as a second value). Timing uses timeit's
+autorange, then takes the best of several repeats.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+import timeit
+from typing import Callable, Dict, List, NamedTuple, Sequence
+
+REALISTIC, SCALED = 1, 100
+DEFAULT_SCALES = (REALISTIC, SCALED)
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable
+    scales: Sequence[int]
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(name: str, scales: Sequence[int] = DEFAULT_SCALES):
+    """Register `setup(scale) -> callable | (callable, teardown)` under `name`."""
+    def decorator(setup):
+        BENCHMARKS.append(Benchmark(name, setup, tuple(scales)))
+        return setup
+    return decorator
+
+
+def time_callable(func: Callable, repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best_us": min(runs) * 1e6, "median_us": sorted(runs)[len(runs) // 2] * 1e6, "number": number}
+
+
+def run(selected: Sequence[Benchmark], repeat: int = 5, min_time: float = 0.2) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for bench in selected:
+        for scale in bench.scales:
+            prepared = bench.setup(scale)
+            func, teardown = prepared if isinstance(prepared, tuple) else (prepared, None)
+            try:
+                results[f"{bench.name}[{scale}x]"] = time_callable(func, repeat, min_time)
+            finally:
+                if teardown is not None:
+                    teardown()
+    return results
+
+
+def git_commit(root: str) -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root, capture_output=True, text=True)
+        return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_history(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def append_history(path: str, commit: str, results: dict) -> dict:
+    history = load_history(path)
+    entry = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": platform.node(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+    history.append(entry)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path)
+    return entry
+
+
+def previous_results(history: list, machine: str) -> dict:
+    """Results of the latest recorded run on the same machine, if any."""
+    for entry in reversed(history):
+        if entry.get("machine") == machine:
+            return entry["results"]
+    return {}
@@ -0,0 +1,63 @@
+"""Throughput of the batch jaundice re-scorer on a synthetic census extract.
+
+    python benchmarks/jaundice_batch.py [--rows 1000000] [--chunksize 50000]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch.jaundice import rescore  # noqa: E402
+
+RISK_FACTORS = ["", "", "", "ABO incompatibility", "G6PD deficiency & other hemolytic conditions"]
+
+
+def write_synthetic(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    birth = np.datetime64("2026-01-01T00:00") + rng.integers(0, 60 * 24 * 60, rows).astype("timedelta64[m]")
+    sample = birth + rng.integers(0, 336 * 60, rows).astype("timedelta64[m]")
+    value = rng.integers(40, 450, rows)
+    kind = rng.choice(["TcB", "SB"], rows)
+    risk = rng.choice(RISK_FACTORS, rows)
+    on_pt = rng.choice(["0", "1"], rows, p=[0.8, 0.2])
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["birth_datetime", "sample_datetime", "value", "measurement_type", "risk_factors", "on_phototherapy"])
+        step = 100_000
+        for i in range(0, rows, step):
+            s = slice(i, i + step)
+            writer.writerows(zip(
+                birth[s].astype(str), sample[s].astype(str), value[s].tolist(),
+                kind[s], risk[s], on_pt[s],
+            ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "readings.csv")
+        dst = os.path.join(tmp, "scored.csv")
+        write_synthetic(src, args.rows)
+
+        start = time.perf_counter()
+        counts = rescore(src, dst, args.chunksize)
+        elapsed = time.perf_counter() - start
+
+    total = sum(counts.values())
+    assert total == args.rows
+    print(f"{total:,} rows in {elapsed:.2f}s -> {total / elapsed:,.0f} rows/s (chunksize {args.chunksize:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Throughput of the batch order verifier on a synthetic eMAR export.
+
+    python benchmarks/order_verification.py [--rows 500000] [--workers 1 4]
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch.orders import verify  # noqa: E402
+from core.formulary import formulary  # noqa: E402
+from core.frequency import COMMON_FREQUENCIES, doses_per_day  # noqa: E402
+
+
+def write_synthetic(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    table = formulary()
+    pick = rng.integers(0, len(table), rows)
+    drugs = np.array(table.drugs, dtype=object)[table.drug_id[pick]]
+    routes = np.array(table.routes, dtype=object)[table.route_id[pick]]
+    weight = np.round(rng.uniform(0.8, 80, rows), 1)
+    freq_labels = np.array(COMMON_FREQUENCIES, dtype=object)
+    freq_pick = rng.integers(0, len(freq_labels), rows)
+    freq = freq_labels[freq_pick]
+    per_day = np.array([doses_per_day(f) for f in freq_labels])[freq_pick]
+    usual = np.nan_to_num(table.usual_high[pick], nan=10.0)
+    dose = np.round(usual * weight / per_day * rng.uniform(0.5, 1.5, rows), 1)
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["weight", "drug", "route", "dose", "frequency"])
+        writer.writerows(zip(weight.tolist(), drugs, routes, dose.tolist(), freq))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "orders.csv")
+        write_synthetic(src, args.rows)
+        for workers in args.workers:
+            start = time.perf_counter()
+            total, counts = verify(src, os.path.join(tmp, "checked.csv"), args.chunksize, workers)
+            elapsed = time.perf_counter() - start
+            print(f"workers {workers}: {total:,} orders in {elapsed:.2f}s -> {total / elapsed:,.0f} rows/s")
+        for warning, count in counts.most_common():
+            print(f"{count:>10}  {warning}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Run the benchmark suite and append the results to a local JSON history.
+
+    python -m benchmarks.run [-k jaundice] [--quick] [--history PATH] [--no-save]
+
+Each run is compared with the previous run recorded on the same machine.
+"""
+import argparse
+import os
+import platform
+
+from benchmarks import suite  # noqa: F401  (registers the benchmarks)
+from benchmarks.harness import BENCHMARKS, append_history, git_commit, load_history, previous_results, run
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "history.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="fewer, shorter repeats")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument("--no-save", action="store_true", help="do not append to the history file")
+    args = parser.parse_args(argv)
+
+    selected = [b for b in BENCHMARKS if args.pattern in b.name]
+    repeat, min_time = (3, 0.05) if args.quick else (5, 0.2)
+
+    previous = previous_results(load_history(args.history), platform.node())
+    results = run(selected, repeat, min_time)
+
+    print(f"{'benchmark':<48}{'best':>12}{'median':>12}{'vs last':>10}")
+    for name, r in results.items():
+        last = previous.get(name)
+        change = f"{(r['best_us'] / last['best_us'] - 1):+.0%}" if last else ""
+        print(f"{name:<48}{r['best_us']:>10.1f}us{r['median_us']:>10.1f}us{change:>10}")
+
+    if not args.no_save:
+        entry = append_history(args.history, git_commit(ROOT), results)
+        print(f"\nrecorded {len(results)} results for {entry['commit']} in {os.path.relpath(args.history)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Open-loop load test for the calculation service: latency percentiles at a fixed rate.
+
+Requests are issued on a fixed schedule (default 1000/s) whether or not
+earlier ones have answered, and latency is measured from the scheduled send
+time, so a stalled server shows up in p99 instead of silently lowering the
+offered load. Uses only the standard library (raw HTTP/1.1 keep-alive).
+
+    python -m benchmarks.service_load [--rate 1000] [--duration 10] [--endpoint fluids] [--batch 1]
+    python -m benchmarks.service_load --spawn       # start python -m service on a free port first
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _fluids_item(rng):
+    return {"weight": round(rng.uniform(0.5, 80), 1), "rehydration_percent": rng.choice([0, 3, 5])}
+
+
+def _jaundice_item(rng):
+    hours = rng.randint(1, 300)
+    return {
+        "birth_datetime": "2026-03-01T00:00:00",
+        "sample_datetime": str(np.datetime64("2026-03-01T00:00:00") + np.timedelta64(hours, "h")),
+        "value": rng.randint(50, 450),
+        "measurement_type": rng.choice(["SB", "TcB"]),
+        "risk_factors": rng.choice(["", "", "G6PD deficiency"]),
+    }
+
+
+def _dose_item(rng):
+    drug, route, dose = rng.choice([
+        ("Ceftriaxone", "IV", 1000), ("Rocephin", "IV", 2500), ("Amoxicillin", "PO", 500),
+        ("Gentamicin", "IV", 100), ("Vancomycin", "IV", 400), ("Omeprazole", "PO", 10),
+    ])
+    return {"weight": round(rng.uniform(3, 60), 1), "drug": drug, "route": route, "dose": dose,
+            "frequency": rng.choice(["Q8H", "Q12H", "Q24H", "BD"])}
+
+
+ENDPOINTS = {
+    "fluids": ("/v1/fluids", _fluids_item),
+    "jaundice": ("/v1/jaundice", _jaundice_item),
+    "dose-check": ("/v1/dose-check", _dose_item),
+}
+
+
+# ===============================
+# MINIMAL HTTP/1.1 CLIENT
+# ===============================
+class Connection:
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def post(self, path, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                length = int(value)
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def load(host, port, path, bodies, rate, duration, connections):
+    idle = asyncio.Queue()
+    for _ in range(connections):
+        idle.put_nowait(Connection(host, port))
+
+    latencies, errors = [], 0
+
+    async def one(scheduled, body):
+        nonlocal errors
+        conn = await idle.get()
+        try:
+            status = await conn.post(path, body)
+            if status != 200:
+                errors += 1
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            errors += 1
+            conn.close()
+        finally:
+            idle.put_nowait(conn)
+        latencies.append(time.perf_counter() - scheduled)
+
+    total = int(rate * duration)
+    start = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(scheduled, bodies[i % len(bodies)])))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    while not idle.empty():
+        idle.get_nowait().close()
+    return np.array(latencies) * 1000, errors, total / elapsed
+
+
+# ===============================
+# SERVER
+# ===============================
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_service(port, workers):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "service", "--port", str(port), "--workers", str(workers)], cwd=ROOT
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise SystemExit("service did not start within 30 s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="fluids")
+    parser.add_argument("--rate", type=float, default=1000, help="requests per second (default 1000)")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of load (default 10)")
+    parser.add_argument("--batch", type=int, default=1, help="items per request (default 1)")
+    parser.add_argument("--connections", type=int, default=64, help="keep-alive connections (default 64)")
+    parser.add_argument("--spawn", action="store_true", help="start the service on a free local port")
+    parser.add_argument("--workers", type=int, default=1, help="service worker processes with --spawn")
+    args = parser.parse_args(argv)
+
+    path, make_item = ENDPOINTS[args.endpoint]
+    rng = random.Random(0)
+    bodies = [json.dumps({"items": [make_item(rng) for _ in range(args.batch)]}).encode() for _ in range(256)]
+
+    proc = None
+    if args.spawn:
+        args.host, args.port = "127.0.0.1", _free_port()
+        proc = spawn_service(args.port, args.workers)
+    try:
+        ms, errors, achieved = asyncio.run(
+            load(args.host, args.port, path, bodies, args.rate, args.duration, args.connections)
+        )
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    print(f"{args.endpoint} x{args.batch}: {len(ms)} requests at {achieved:,.0f}/s (target {args.rate:,.0f}/s), {errors} errors")
+    print(f"latency ms  p50 {p50:.2f}  p90 {p90:.2f}  p99 {p99:.2f}  max {ms.max():.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""Headless rerun benchmark: drive the app through scripted user sessions.
+
+Each session replays a sequence of widget interactions against
+streamlit_app.py with Streamlit's AppTest (no server, no browser) and
+records, for every rerun, the script execution time and the size of the
+user session state. Any exception raised by the script fails the run.
+
+    python -m benchmarks.sessions [-k dosage] [--repeat 5] [--json out.json] [--budget-ms 500]
+"""
+import argparse
+import json
+import os
+import pickle
+import statistics
+import sys
+import time
+from typing import Callable, List, NamedTuple
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "streamlit_app.py")
+
+
+class Step(NamedTuple):
+    label: str
+    action: Callable[[AppTest], object]
+
+
+class Rerun(NamedTuple):
+    session: str
+    step: str
+    ms: float
+    state_bytes: int
+    state_keys: int
+
+
+# ===============================
+# WIDGET HELPERS
+# ===============================
+def widget(at, kind, label):
+    """First widget of `kind` (e.g. "number_input") whose label starts with `label`."""
+    for w in getattr(at, kind):
+        if w.label.startswith(label):
+            return w
+    raise LookupError(f"no {kind} labelled {label!r}")
+
+
+def open_page(key):
+    return Step(f"open {key}", lambda at: at.button(key=key).click())
+
+
+def back_home():
+    return Step("back to home", lambda at: widget(at, "button", "🏠 Back to Home").click())
+
+
+def set_value(kind, label, value, step_label=None):
+    return Step(step_label or f"{label.rstrip(':')} = {value}", lambda at: widget(at, kind, label).set_value(value))
+
+
+def click(label):
+    return Step(f"click {label}", lambda at: widget(at, "button", label).click())
+
+
+# ===============================
+# SESSIONS
+# ===============================
+SESSIONS = {
+    "dosage": [
+        open_page("dosage_dispensing"),
+        set_value("number_input", "Patient weight", 20.0),
+        set_value("toggle", "Search across all systems", True, "search all systems"),
+        set_value("text_input", "Search medication", "amox", "search 'amox'"),
+        set_value("number_input", "Ordered dose", 900.0),
+        set_value("selectbox", "Frequency", "Q8H"),
+        click("Check Dose"),
+        set_value("toggle", "Show recommended dose range", True, "show formulary ranges"),
+        back_home(),
+    ],
+    "fluids": [
+        open_page("fluids"),
+        set_value("text_input", "Enter child's weight", "12.5"),
+        click("Calculate Fluids Requirement"),
+        set_value("radio", "Include Rehydration?", "Maintenance + 5% Rehydration", "5% rehydration"),
+        click("Calculate Fluids Requirement"),
+        set_value("radio", "Mode:", "Ward census", "census mode"),
+        Step("paste 40-bed census", lambda at: widget(at, "text_area", "…or paste").input(
+            "bed,weight,rehydration\n" + "\n".join(f"{i},{3 + i * 1.7:.1f},{(0, 3, 5)[i % 3]}" for i in range(40))
+        )),
+        back_home(),
+    ],
+    "jaundice": [
+        open_page("jaundice"),
+        set_value("radio", "Measurement Type", "Serum Bilirubin (SB)", "choose SB"),
+        set_value("number_input", "Enter SB level", 220),
+        click("Evaluate SB"),
+        set_value("checkbox", "Infant is currently on phototherapy", True, "on phototherapy"),
+        click("Evaluate SB"),
+        back_home(),
+    ],
+    "compatibility": [
+        open_page("compatibility"),
+        click("Check Compatibility"),
+        set_value("radio", "Check:", "Multiple infusions (Y-site)", "Y-site mode"),
+        Step("select 4 infusions", lambda at: at.multiselect(key="compat_multi").set_value(at.multiselect(key="compat_multi").options[:4])),
+        back_home(),
+    ],
+    "vitals": [
+        open_page("vitals"),
+        set_value("radio", "Age unit", "Years (≥1 yr)", "age in years"),
+        set_value("number_input", "Age (years)", 3),
+        set_value("number_input", "Heart Rate", 150),
+        set_value("number_input", "Respiratory Rate", 25),
+        set_value("number_input", "Systolic BP", 60),
+        back_home(),
+    ],
+}
+
+
+# ===============================
+# RUNNER
+# ===============================
+def state_size(at):
+    """(pickled bytes, key count) of the user-visible session state."""
+    state = at.session_state
+    keys = list(state)
+    total = 0
+    for value in (state[key] for key in keys):
+        try:
+            total += len(pickle.dumps(value))
+        except Exception:
+            total += sys.getsizeof(value)
+    return total, len(keys)
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+
+def run_session(name, steps, timeout=30):
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    ms = timed_run(at)
+    reruns = [Rerun(name, "home", ms, *state_size(at))]
+    for step in steps:
+        step.action(at)
+        try:
+            ms = timed_run(at)
+        except RuntimeError as e:
+            raise RuntimeError(f"{name}: {step.label}: {e}") from None
+        reruns.append(Rerun(name, step.label, ms, *state_size(at)))
+    return reruns
+
+
+def summarize(runs):
+    """Per-step median/max time over repeated runs; size from the last run."""
+    by_step = {}
+    for rerun in runs:
+        by_step.setdefault((rerun.session, rerun.step), []).append(rerun)
+    return [
+        {
+            "session": session,
+            "step": step,
+            "median_ms": statistics.median(r.ms for r in reruns),
+            "max_ms": max(r.ms for r in reruns),
+            "state_bytes": reruns[-1].state_bytes,
+            "state_keys": reruns[-1].state_keys,
+        }
+        for (session, step), reruns in by_step.items()
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only run sessions whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="replays of each session")
+    parser.add_argument("--json", help="write the per-step summary to this file")
+    parser.add_argument("--budget-ms", type=float, help="exit non-zero if any step's median exceeds this")
+    args = parser.parse_args(argv)
+
+    runs: List[Rerun] = []
+    for name, steps in SESSIONS.items():
+        if args.pattern in name:
+            for _ in range(args.repeat):
+                runs.extend(run_session(name, steps))
+
+    rows = summarize(runs)
+    print(f"{'session':<15}{'step':<38}{'median ms':>10}{'max ms':>9}{'state B':>9}{'keys':>6}")
+    for r in rows:
+        print(
+            f"{r['session']:<15}{r['step'][:37]:<38}{r['median_ms']:>10.1f}"
+            f"{r['max_ms']:>9.1f}{r['state_bytes']:>9}{r['state_keys']:>6}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    if args.budget_ms is not None:
+        slow = [r for r in rows if r["median_ms"] > args.budget_ms]
+        for r in slow:
+            print(f"over budget: {r['session']} / {r['step']}: {r['median_ms']:.1f} ms", file=sys.stderr)
+        if slow:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""Benchmarks for the page-independent parts of every calculator.
+
+Each runs at a realistic size (1x) and at 100x: a synthetic formulary,
+rule table or matrix 100 times larger or, for the single-patient
+calculators, 100 patients per call instead of one.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+import core.jaundice as jaundice
+import core.vitals as vitals
+from benchmarks.harness import benchmark
+from benchmarks.synthetic import compatibility_statuses, scaled_formulary, scaled_sb_rules
+from core.bmi import bmi
+from core.compatibility import CompatibilityMatrix, compatibility_matrix
+from core.corrected_age import cohort_ages, preterm_age
+from core.dosage import check_dose, dose_warnings
+from core.fluids import fluid_requirement, fluid_requirements
+from core.formulary import compile_formulary
+from core.search import build_index
+
+RNG = np.random.default_rng(0)
+
+
+def _patients(scale):
+    return RNG.uniform(0.5, 80, scale).tolist()
+
+
+def _patched(module, **values):
+    """Temporarily replace module globals; returns the restore callable."""
+    saved = {name: getattr(module, name) for name in values}
+    for name, value in values.items():
+        setattr(module, name, value)
+    return lambda: [setattr(module, name, value) for name, value in saved.items()]
+
+
+# ===============================
+# SINGLE-PATIENT CALCULATORS
+# ===============================
+@benchmark("fluids.fluid_requirement")
+def bench_fluids(scale):
+    weights = _patients(scale)
+    return lambda: [fluid_requirement(w, 5) for w in weights]
+
+
+@benchmark("bmi.bmi")
+def bench_bmi(scale):
+    pairs = list(zip(RNG.uniform(45, 190, scale).tolist(), _patients(scale)))
+    return lambda: [bmi(h, w) for h, w in pairs]
+
+
+@benchmark("corrected_age.preterm_age")
+def bench_corrected_age(scale):
+    today = date(2026, 6, 1)
+    infants = [(today - timedelta(days=int(d)), int(w), int(d) % 7) for d, w in zip(RNG.integers(0, 700, scale), RNG.integers(23, 37, scale))]
+    return lambda: [preterm_age(dob, w, d, today) for dob, w, d in infants]
+
+
+# ===============================
+# WARD CENSUS
+# ===============================
+def _census(scale):
+    n = 1000 * scale
+    return RNG.uniform(0.5, 80, n).round(1), RNG.choice([0, 3, 5], n)
+
+
+@benchmark("fluids.fluid_requirements[1k rows]")
+def bench_fluids_census(scale):
+    weights, percents = _census(scale)
+    return lambda: fluid_requirements(weights, percents)
+
+
+@benchmark("fluids census paste -> CSV download[1k rows]")
+def bench_fluids_census_table(scale):
+    from pages.fluids import census_table, read_census
+
+    weights, percents = _census(scale)
+    text = "bed,weight,rehydration\n" + "\n".join(f"{i},{w},{p}" for i, (w, p) in enumerate(zip(weights, percents)))
+    return lambda: census_table(read_census(text)).to_csv(index=False)
+
+
+def _cohort(scale):
+    n = 1000 * scale
+    dob = np.datetime64("2026-06-01") - RNG.integers(0, 900, n).astype("timedelta64[D]")
+    return dob, RNG.integers(23, 37, n), RNG.integers(0, 7, n)
+
+
+@benchmark("corrected_age.cohort_ages[1k rows]")
+def bench_cohort_ages(scale):
+    dob, weeks, days = _cohort(scale)
+    return lambda: cohort_ages(dob, weeks, days, date(2026, 6, 1))
+
+
+@benchmark("corrected-age cohort paste -> CSV download[1k rows]")
+def bench_cohort_table(scale):
+    from pages.corrected_age import cohort_table, read_cohort
+
+    text = "id,dob,ga_weeks,ga_days\n" + "\n".join(f"{i},{d},{w},{g}" for i, (d, w, g) in enumerate(zip(*_cohort(scale))))
+    return lambda: cohort_table(read_cohort(text), date(2026, 6, 1), 28).to_csv(index=False)
+
+
+# ===============================
+# JAUNDICE
+# ===============================
+def _scaled_jaundice(scale):
+    rules = scaled_sb_rules(scale)
+    edges, thresholds = jaundice._compile([rules, rules], 5)
+    restore_tables = _patched(jaundice, SB_EDGES=edges, SB_THRESHOLDS=thresholds, NOMOGRAM_HOURS=edges[-1])
+    nomogram = jaundice.build_nomogram()
+    restore_nomogram = _patched(jaundice, NOMOGRAM=nomogram, _SB_ROWS=nomogram[..., :5].tolist())
+    return (lambda: (restore_nomogram(), restore_tables())), 337 * scale
+
+
+@benchmark("jaundice.evaluate_jaundice")
+def bench_jaundice_scalar(scale):
+    restore, span = _scaled_jaundice(scale)
+    readings = list(zip(RNG.uniform(0, span, 1000).tolist(), RNG.integers(50, 450, 1000).tolist()))
+    return (lambda: [jaundice.evaluate_jaundice(h, sb, jaundice.HIGH_RISK, False) for h, sb in readings]), restore
+
+
+@benchmark("jaundice.jaundice_actions[10k readings]")
+def bench_jaundice_vectorized(scale):
+    restore, span = _scaled_jaundice(scale)
+    n = 10_000
+    args = (RNG.uniform(0, span, n), RNG.uniform(50, 450, n), RNG.random(n) < 0.5, RNG.random(n) < 0.2)
+    return (lambda: jaundice.jaundice_actions(*args)), restore
+
+
+# ===============================
+# VITALS
+# ===============================
+def _scaled_vitals(scale):
+    """Patch in `scale` times as many age bands, still on whole months."""
+    if scale == 1:
+        return lambda: None
+    n = len(vitals.VITAL_RANGES) * scale
+    edges = np.linspace(0, vitals.VITAL_RANGES[-1][1] * 12, n + 1).round().astype(int) / 12
+    ranges = [
+        (edges[i], edges[i + 1], *vitals.VITAL_RANGES[i % len(vitals.VITAL_RANGES)][2:])
+        for i in range(n)
+    ]
+    month_bands, hr, rr = vitals._compile(ranges)
+    return _patched(
+        vitals, VITAL_RANGES=ranges, _MONTH_BANDS=month_bands, _MONTH_BAND_LIST=month_bands.tolist(),
+        _HR_BOUNDS=hr, _RR_BOUNDS=rr,
+    )
+
+
+@benchmark("vitals.reference_ranges")
+def bench_vitals(scale):
+    restore = _scaled_vitals(scale)
+    ages = RNG.uniform(0, 18, 1000).tolist()
+    return (lambda: [vitals.reference_ranges(a) for a in ages]), restore
+
+
+@benchmark("vitals.score_vitals[100k rows]")
+def bench_vitals_bulk(scale):
+    restore = _scaled_vitals(scale)
+    n = 100_000
+    age, hr, rr, sbp = RNG.uniform(0, 18, n), RNG.integers(40, 200, n), RNG.integers(8, 70, n), RNG.integers(50, 140, n)
+    temp = np.where(RNG.random(n) < 0.2, RNG.uniform(38, 41, n).round(1), np.nan)
+    return (lambda: vitals.score_vitals(age, hr, rr, sbp, temp)), restore
+
+
+@benchmark("ews.Ward.update[40 beds x 1k batches of 10]")
+def bench_ews_stream(scale):
+    from core.ews import Ward
+
+    beds, n = 40 * scale, 10_000
+    patient = [f"Bed{i}" for i in RNG.integers(0, beds, n)]
+    hours = np.sort(RNG.uniform(0, 72, n))
+    age, hr, rr, sbp = RNG.uniform(0, 18, n), RNG.integers(40, 200, n), RNG.integers(8, 70, n), RNG.integers(50, 140, n)
+
+    def stream():
+        ward = Ward()
+        for i in range(0, n, 10):
+            ward.update(patient[i:i + 10], hours[i:i + 10], age[i:i + 10], hr[i:i + 10], rr[i:i + 10], sbp[i:i + 10])
+    return stream
+
+
+# ===============================
+# COMPATIBILITY
+# ===============================
+def _matrix(scale):
+    if scale == 1:
+        return compatibility_matrix()
+    n = len(compatibility_matrix()) * scale
+    return CompatibilityMatrix([f"Drug {i}" for i in range(n)], compatibility_statuses(n))
+
+
+@benchmark("compatibility.status[1k pairs]")
+def bench_compatibility_status(scale):
+    matrix = _matrix(scale)
+    pairs = [tuple(RNG.choice(matrix.drugs, 2)) for _ in range(1000)]
+    return lambda: [matrix.status(a, b) for a, b in pairs]
+
+
+@benchmark("compatibility.analyse[6 drugs]")
+def bench_compatibility_analyse(scale):
+    matrix = _matrix(scale)
+    drugs = list(RNG.choice(matrix.drugs, 6, replace=False))
+    return lambda: matrix.analyse(drugs)
+
+
+# ===============================
+# FORMULARY
+# ===============================
+@benchmark("search.search")
+def bench_search(scale):
+    index = build_index(*scaled_formulary(scale))
+    queries = ["amox", "ceftriax", "vanco", "gent", "salbutamol neb", "o"]
+    return lambda: [index.search(q) for q in queries]
+
+
+@benchmark("search.filter")
+def bench_filter(scale):
+    index = build_index(*scaled_formulary(scale))
+    return lambda: index.filter("cef", "Respiratory")
+
+
+@benchmark("dosage.check_dose")
+def bench_check_dose(scale):
+    antibiotics, _ = scaled_formulary(scale)
+    options = [o for drugs in antibiotics.values() for opts in drugs.values() for o in opts]
+    return lambda: [check_dose(o, 20.0, 500.0, 3) for o in options]
+
+
+@benchmark("formulary.dose_ranges")
+def bench_dose_ranges(scale):
+    table = compile_formulary(*scaled_formulary(scale))
+    return lambda: table.dose_ranges(23.4, 3)
+
+
+@benchmark("dosage.dose_warnings[orders]")
+def bench_dose_warnings(scale):
+    table = compile_formulary(*scaled_formulary(scale))
+    n = 1000 * scale
+    rows = RNG.integers(0, len(table), n)
+    args = (
+        RNG.uniform(1, 80, n), RNG.uniform(10, 2000, n), RNG.choice([1, 2, 3, 4], n),
+        table.usual_low[rows], table.usual_high[rows], table.max_dose[rows], table.max_day[rows],
+    )
+    return lambda: dose_warnings(*args)
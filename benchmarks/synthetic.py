@@ -0,0 +1,63 @@
+"""Synthetic data sets scaled from the real formulary and rule tables."""
+import copy
+
+import numpy as np
+
+from data.antibiotics_data import antibiotics_data
+from data.others_data import others_data
+
+
+def scaled_formulary(scale, seed=0):
+    """(antibiotics, others) dicts with every drug repeated `scale` times.
+
+    Copies get a numeric suffix and jittered dose ranges so they are distinct
+    entries rather than aliases of the originals.
+    """
+    rng = np.random.default_rng(seed)
+
+    def jitter(options):
+        options = copy.deepcopy(options)
+        for option in options:
+            factor = float(rng.uniform(0.8, 1.2))
+            for key in ("usual", "severe", "high"):
+                if option.get(key):
+                    option[key] = [round(v * factor, 2) for v in option[key]]
+        return options
+
+    antibiotics = {
+        system: {
+            (name if i == 0 else f"{name} {i}"): (options if i == 0 else jitter(options))
+            for i in range(scale)
+            for name, options in drugs.items()
+        }
+        for system, drugs in antibiotics_data.items()
+    }
+    others = {
+        (name if i == 0 else f"{name} {i}"): (options if i == 0 else jitter(options))
+        for i in range(scale)
+        for name, options in others_data.items()
+    }
+    return antibiotics, others
+
+
+def scaled_sb_rules(scale):
+    """High-risk SB table stretched over `scale` × 337 hours with `scale` times the brackets.
+
+    Each original bracket is split into `scale` sub-brackets of its original
+    width, so lookups against it should use hours × scale.
+    """
+    from core.jaundice import HIGH_RISK_RULES
+
+    rules = []
+    for start, end, *thresholds in HIGH_RISK_RULES:
+        width = end + 1 - start
+        for k in range(scale):
+            first = start * scale + k * width
+            rules.append((first, first + width - 1, *thresholds))
+    return rules
+
+
+def compatibility_statuses(n_drugs, seed=0):
+    """Random packed upper triangle for `n_drugs`, roughly matching the real mix."""
+    rng = np.random.default_rng(seed)
+    return rng.choice(4, n_drugs * (n_drugs - 1) // 2, p=[0.5, 0.3, 0.05, 0.15])
@@ -0,0 +1,99 @@
+"""Precomputed lookup arrays shipped under data/ as ``<name>.npy`` plus a JSON sidecar.
+
+The sidecar records the array's shape, dtype and SHA-256 together with a
+SHA-256 of the source tables it was generated from. `load_artifact`
+memory-maps the .npy after checking its shape, dtype and hash against the
+sidecar. If the file is missing or damaged, or was built from different
+source tables, it warns and builds the array in memory instead, so a
+guideline edit is never served from a stale file. The app never writes
+to data/: regenerate with the module's generator and commit the pair with
+the table change; the sidecar's summary makes the change reviewable in a
+diff.
+"""
+import hashlib
+import json
+import os
+import warnings
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def _paths(name: str):
+    base = os.path.join(DATA_DIR, name)
+    return base + ".npy", base + ".json"
+
+
+def source_hash(source: Any) -> str:
+    """SHA-256 of a JSON-serialisable description of the inputs."""
+    return hashlib.sha256(json.dumps(source, sort_keys=True).encode()).hexdigest()
+
+
+def read_metadata(name: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_paths(name)[1], encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _stored(name: str, source: Any) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    """(read-only memory map, None) if the stored artifact is sound and was
+    generated from `source`, else (None, reason)."""
+    meta = read_metadata(name)
+    if meta is None:
+        return None, "missing"
+    if meta.get("source_sha256") != source_hash(source):
+        return None, "stale"
+    try:
+        array = np.load(_paths(name)[0], mmap_mode="r")
+    except (OSError, ValueError) as e:
+        return None, f"unreadable ({e})"
+    if list(array.shape) != meta.get("shape") or array.dtype.str != meta.get("dtype"):
+        return None, "damaged (shape or dtype differs from its sidecar)"
+    # The artifacts are a few KB, so hashing the mapped bytes is cheap.
+    if hashlib.sha256(array.tobytes()).hexdigest() != meta.get("sha256"):
+        return None, "damaged (contents differ from its sidecar hash)"
+    return array, None
+
+
+def is_current(name: str, source: Any) -> bool:
+    """True when the stored artifact is intact and was generated from `source`."""
+    return _stored(name, source)[1] is None
+
+
+def write_artifact(name: str, array: np.ndarray, source: Any, summary: Any = None) -> Dict[str, Any]:
+    """Atomically write `<name>.npy` and its sidecar; returns the metadata."""
+    npy, meta_path = _paths(name)
+    array = np.ascontiguousarray(array)
+    meta = {
+        "name": name,
+        "shape": list(array.shape),
+        "dtype": array.dtype.str,
+        "sha256": hashlib.sha256(array.tobytes()).hexdigest(),
+        "source_sha256": source_hash(source),
+        "summary": summary,
+    }
+    for path, write in (
+        (npy, lambda f: np.save(f, array)),
+        (meta_path, lambda f: f.write(json.dumps(meta, indent=2, ensure_ascii=False).encode() + b"\n")),
+    ):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    return meta
+
+
+def load_artifact(name: str, source: Any, build: Callable[[], np.ndarray]) -> np.ndarray:
+    """Read-only memory map of the artifact, or a fresh in-memory build if it
+    is missing, stale or damaged."""
+    array, problem = _stored(name, source)
+    if problem is None:
+        return array
+    warnings.warn(f"data/{name}.npy is {problem}; using an in-memory build. Regenerate and commit it.")
+    array = build()
+    array.flags.writeable = False
+    return array
@@ -0,0 +1,141 @@
+"""Serial bilirubin readings per infant with an incrementally updated rate of rise.
+
+A `Trajectory` holds one infant's TcB and SB readings. Each reading updates
+a trailing-window rate of rise in amortised O(1): readings older than the
+window are evicted from the front of a deque, never rescanned. A serum
+rise above `RAPID_RISE_PER_DAY` sets the "rapidly rising serum bilirubin"
+high-risk criterion.
+"""
+from bisect import insort
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, MutableMapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.jaundice import NOMOGRAM, NOMOGRAM_HOURS, threshold_steps
+
+TCB = "TcB"
+SB = "SB"
+
+RAPID_RISE_PER_DAY = 103  # µmol/L per day
+RAPID_RISE_CRITERION = "Rapidly rising serum bilirubin (>103 µmol/L per day)"
+
+RATE_WINDOW_HOURS = 24.0
+SESSION_KEY = "_bilirubin"
+
+
+class Reading(NamedTuple):
+    hours: float
+    value: float
+    kind: str
+    rate: Optional[float]  # µmol/L per day at the time of this reading
+
+
+class RollingRate:
+    """Rate of rise across the readings of the trailing `window` hours.
+
+    The rate is taken from the oldest reading still in the window to the
+    newest. When the window holds only the newest reading, the last reading
+    evicted from it is used instead, so widely spaced samples still give a
+    rate. Readings must arrive in time order.
+    """
+
+    __slots__ = ("window", "_window", "_anchor")
+
+    def __init__(self, window: float = RATE_WINDOW_HOURS):
+        self.window = window
+        self._window: "deque[Tuple[float, float]]" = deque()
+        self._anchor: Optional[Tuple[float, float]] = None
+
+    def add(self, hours: float, value: float) -> Optional[float]:
+        self._window.append((hours, value))
+        while hours - self._window[0][0] > self.window:
+            self._anchor = self._window.popleft()
+        start = self._window[0] if len(self._window) > 1 else self._anchor
+        if start is None or start[0] == hours:
+            return None
+        return (value - start[1]) / (hours - start[0]) * 24
+
+
+class Trajectory:
+    """One infant's serial readings, kept sorted by hours of life."""
+
+    def __init__(self, window: float = RATE_WINDOW_HOURS):
+        self.window = window
+        self.readings: List[Reading] = []
+        self.max_rate: Dict[str, float] = {}
+        self._rates: Dict[str, RollingRate] = {}
+
+    def add(self, hours: float, value: float, kind: str = SB) -> Optional[float]:
+        """Record a reading; returns its rate of rise in µmol/L per day, if any."""
+        if hours < 0:
+            raise ValueError("reading is before birth")
+        if kind not in (TCB, SB):
+            raise ValueError(f"unknown measurement type {kind!r}")
+
+        if self.readings and hours < self.readings[-1].hours:
+            # Back-dated entry: the only case that replays history.
+            insort(self.readings, Reading(hours, value, kind, None), key=lambda r: r.hours)
+            self._replay()
+            return next(r.rate for r in self.readings if r.hours == hours and r.kind == kind)
+
+        rate = self._rates.setdefault(kind, RollingRate(self.window)).add(hours, value)
+        self.readings.append(Reading(hours, value, kind, rate))
+        if rate is not None and rate > self.max_rate.get(kind, -np.inf):
+            self.max_rate[kind] = rate
+        return rate
+
+    def _replay(self):
+        readings = self.readings
+        self.readings, self.max_rate, self._rates = [], {}, {}
+        for r in readings:
+            self.add(r.hours, r.value, r.kind)
+
+    def latest_rate(self, kind: str = SB) -> Optional[float]:
+        for r in reversed(self.readings):
+            if r.kind == kind:
+                return r.rate
+        return None
+
+    @property
+    def rapid_rise(self) -> bool:
+        """True once any serum rise has exceeded `RAPID_RISE_PER_DAY`."""
+        return self.max_rate.get(SB, -np.inf) > RAPID_RISE_PER_DAY
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(hours, value, kind) arrays for plotting."""
+        if not self.readings:
+            return np.empty(0), np.empty(0), np.empty(0, dtype=object)
+        hours, values, kinds, _ = zip(*self.readings)
+        return np.array(hours), np.array(values), np.array(kinds, dtype=object)
+
+
+def session_trajectories(state: MutableMapping) -> Dict[str, Trajectory]:
+    """Infant identifier -> Trajectory kept in a session-state mapping."""
+    if SESSION_KEY not in state:
+        state[SESSION_KEY] = {}
+    return state[SESSION_KEY]
+
+
+# ===============================
+# THRESHOLD CURVES
+# ===============================
+# Nomogram column -> curve name.
+CURVES = {"single": "Phototherapy", "exchange": "Exchange transfusion"}
+
+
+@lru_cache(maxsize=None)
+def threshold_curves(risk: str) -> Tuple[Tuple[str, Tuple[float, ...], Tuple[float, ...]], ...]:
+    """Step curves (name, hours, µmol/L) for one risk group from the nomogram.
+
+    Each value holds from its hour until the next one (step-after); NaN marks
+    hours the guideline does not cover.
+    """
+    curves = []
+    for column, name in CURVES.items():
+        steps = threshold_steps(NOMOGRAM, risk, column)
+        hours = tuple(float(h) for h, _ in steps) + (float(NOMOGRAM_HOURS),)
+        values = tuple(v for _, v in steps) + (steps[-1][1],)
+        curves.append((name, hours, values))
+    return tuple(curves)
@@ -0,0 +1,10 @@
+"""Body mass index."""
+from core.metrics import instrumented
+
+
+@instrumented("bmi.bmi")
+def bmi(height_cm: float, weight_kg: float) -> float:
+    """BMI in kg/m² from height in cm and weight in kg."""
+    if height_cm <= 0 or weight_kg <= 0:
+        raise ValueError("height and weight must be positive")
+    return weight_kg / ((height_cm / 100) ** 2)
@@ -0,0 +1,204 @@
+"""Symmetric Y-site compatibility lookups over a packed upper-triangular matrix."""
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.metrics import instrumented
+from data.compatibility_data import COMPATIBLE, CONDITIONAL, INCOMPATIBLE, UNKNOWN
+
+STATUS_LABELS = {
+    UNKNOWN: "No information",
+    COMPATIBLE: "Compatible",
+    CONDITIONAL: "Compatible with conditions",
+    INCOMPATIBLE: "Not compatible",
+}
+
+
+class CompatibilityMatrix:
+    """Status codes for every unordered drug pair, one byte per pair."""
+
+    def __init__(self, drugs, packed, conditions=None):
+        self.drugs = tuple(drugs)
+        self._index = {drug: i for i, drug in enumerate(self.drugs)}
+        n = len(self.drugs)
+        self._packed = np.asarray(packed, dtype=np.uint8)
+        if self._packed.shape != (n * (n - 1) // 2,):
+            raise ValueError(f"expected {n * (n - 1) // 2} pair statuses for {n} drugs, got {self._packed.size}")
+        if self._packed.max(initial=0) > INCOMPATIBLE:
+            raise ValueError("unknown status code in compatibility matrix")
+        # Offset of row i in the packed triangle; pair (i, j>i) sits at
+        # _row_start[i] + j.
+        rows = np.arange(n)
+        self._row_start = rows * (2 * n - rows - 1) // 2 - rows - 1
+        self._conditions = {self._pair(self._index[a], self._index[b]): text for (a, b), text in (conditions or {}).items()}
+
+    def __len__(self) -> int:
+        return len(self.drugs)
+
+    def index(self, drug: str) -> int:
+        return self._index[drug]
+
+    def _pair(self, i: int, j: int) -> int:
+        if i > j:
+            i, j = j, i
+        return int(self._row_start[i]) + j
+
+    def status(self, a: str, b: str) -> int:
+        i, j = self._index[a], self._index[b]
+        if i == j:
+            return COMPATIBLE
+        return int(self._packed[self._pair(i, j)])
+
+    def condition(self, a: str, b: str) -> Optional[str]:
+        i, j = self._index[a], self._index[b]
+        return None if i == j else self._conditions.get(self._pair(i, j))
+
+    def describe(self, a: str, b: str) -> Tuple[int, str]:
+        """(status code, display text) for a pair."""
+        status = self.status(a, b)
+        return status, self.condition(a, b) or STATUS_LABELS[status]
+
+    def pairwise(self, drugs: Sequence[str]) -> np.ndarray:
+        """k×k status matrix for `drugs`, gathered from the packed triangle at once."""
+        idx = np.array([self._index[d] for d in drugs], dtype=np.intp)
+        i, j = np.minimum.outer(idx, idx), np.maximum.outer(idx, idx)
+        statuses = self._packed[np.where(i == j, 0, self._row_start[i] + j)] if len(self._packed) else np.zeros(i.shape, np.uint8)
+        statuses[i == j] = COMPATIBLE
+        return statuses
+
+    @instrumented("compatibility.analyse")
+    def analyse(self, drugs: Sequence[str], unknown_is_incompatible: bool = True) -> "YSiteAnalysis":
+        """Pairwise statuses, incompatible groups and a minimal lumen split for `drugs`."""
+        drugs = list(dict.fromkeys(drugs))
+        statuses = self.pairwise(drugs)
+        conflict = statuses == INCOMPATIBLE
+        if unknown_is_incompatible:
+            conflict |= statuses == UNKNOWN
+        adjacency = [sum(1 << int(j) for j in np.flatnonzero(row)) for row in conflict]
+
+        cliques = [c for c in _maximal_cliques(adjacency) if len(c) > 1]
+        lower = max((len(c) for c in cliques), default=1)
+        colours = _min_colouring(adjacency, lower)
+        lumens = [[drugs[v] for v in range(len(drugs)) if colours[v] == c] for c in range(max(colours, default=-1) + 1)]
+
+        return YSiteAnalysis(
+            drugs=drugs,
+            statuses=statuses,
+            incompatible_groups=sorted(([drugs[v] for v in sorted(c)] for c in cliques), key=len, reverse=True),
+            lumens=lumens,
+        )
+
+
+class YSiteAnalysis(NamedTuple):
+    drugs: List[str]
+    statuses: np.ndarray
+    # Maximal sets of drugs that are pairwise in conflict (each needs its own lumen).
+    incompatible_groups: List[List[str]]
+    # Drugs that can share a lumen; as few lumens as the search could prove.
+    lumens: List[List[str]]
+
+
+# ===============================
+# CONFLICT GRAPH
+# ===============================
+# Vertices are positions in the analysed drug list; adjacency is a list of
+# bitmasks with bit j set in adjacency[i] when drugs i and j conflict.
+
+def _bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _maximal_cliques(adjacency) -> List[List[int]]:
+    """Bron–Kerbosch with pivoting."""
+    cliques = []
+
+    def expand(r, p, x):
+        if not p and not x:
+            cliques.append(r)
+            return
+        pivot = max(_bits(p | x), key=lambda u: bin(adjacency[u] & p).count("1"))
+        for v in _bits(p & ~adjacency[pivot]):
+            expand(r + [v], p & adjacency[v], x & adjacency[v])
+            p &= ~(1 << v)
+            x |= 1 << v
+
+    if adjacency:
+        expand([], (1 << len(adjacency)) - 1, 0)
+    return cliques
+
+
+class _SearchBudgetExceeded(Exception):
+    pass
+
+
+def _min_colouring(adjacency, lower_bound: int, budget: int = 200_000) -> List[int]:
+    """Colour the conflict graph with as few colours as possible.
+
+    DSatur gives an initial colouring; a DSatur-ordered branch and bound then
+    tries to beat it until it reaches `lower_bound` (the largest conflict
+    clique) or spends `budget` search nodes, in which case the best colouring
+    found so far is returned.
+    """
+    n = len(adjacency)
+    neighbours = [list(_bits(mask)) for mask in adjacency]
+    colours = [-1] * n
+
+    def next_vertex():
+        best, best_key = None, None
+        for v in range(n):
+            if colours[v] < 0:
+                key = (len({colours[u] for u in neighbours[v] if colours[u] >= 0}), len(neighbours[v]))
+                if best_key is None or key > best_key:
+                    best, best_key = v, key
+        return best
+
+    # Greedy DSatur.
+    for _ in range(n):
+        v = next_vertex()
+        used = {colours[u] for u in neighbours[v]}
+        colours[v] = next(c for c in range(n) if c not in used)
+    best = list(colours)
+    best_count = max(best, default=-1) + 1
+    if best_count <= lower_bound:
+        return best
+
+    colours = [-1] * n
+    nodes = 0
+
+    def search(used_count):
+        nonlocal best, best_count, nodes
+        nodes += 1
+        if nodes > budget:
+            raise _SearchBudgetExceeded
+        v = next_vertex()
+        if v is None:
+            best, best_count = list(colours), used_count
+            return best_count <= lower_bound
+        forbidden = {colours[u] for u in neighbours[v]}
+        # Opening a new colour is only worth it while it still beats the best.
+        for c in range(min(used_count + 1, best_count - 1)):
+            if c in forbidden:
+                continue
+            colours[v] = c
+            if search(max(used_count, c + 1)):
+                return True
+            colours[v] = -1
+        return False
+
+    try:
+        search(0)
+    except _SearchBudgetExceeded:
+        pass
+    return best
+
+
+@lru_cache(maxsize=None)
+def compatibility_matrix() -> CompatibilityMatrix:
+    """Process-wide matrix loaded from data.compatibility_data."""
+    from data.compatibility_data import compatibility_conditions, compatibility_drugs, compatibility_matrix
+
+    return CompatibilityMatrix(compatibility_drugs, compatibility_matrix, compatibility_conditions)
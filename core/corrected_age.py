@@ -0,0 +1,117 @@
+"""Chronological age, corrected age and post-menstrual age for preterm infants."""
+from datetime import date
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from core.metrics import instrumented
+
+FULL_TERM_DAYS = 40 * 7
+GA_WEEKS_RANGE = (22, 42)
+
+# Follow-up clinic milestones, as days of corrected age (0 = 40+0 weeks PMA).
+DAYS_PER_MONTH = 365.25 / 12
+MILESTONES = {
+    "Term equivalent (40+0 PMA)": 0,
+    "3 months corrected": round(3 * DAYS_PER_MONTH),
+    "6 months corrected": round(6 * DAYS_PER_MONTH),
+    "12 months corrected": round(12 * DAYS_PER_MONTH),
+    "18 months corrected": round(18 * DAYS_PER_MONTH),
+    "24 months corrected": round(24 * DAYS_PER_MONTH),
+}
+MILESTONE_NAMES = tuple(MILESTONES)
+_MILESTONE_DAYS = np.array(list(MILESTONES.values()))
+
+
+class PretermAge(NamedTuple):
+    chronological_days: int
+    gestational_days: int
+    # None until the infant reaches term-equivalent age.
+    corrected_days: Optional[int]
+    pma_days: int
+
+
+def weeks_days(total_days: int) -> tuple:
+    return total_days // 7, total_days % 7
+
+
+@instrumented("corrected_age.preterm_age")
+def preterm_age(dob: date, ga_weeks: int, ga_days: int, current: date) -> PretermAge:
+    """Ages in days on `current` for an infant born at `ga_weeks`+`ga_days`."""
+    chronological_days = (current - dob).days
+    if chronological_days < 0:
+        raise ValueError("current date is before the date of birth")
+
+    gestational_days = ga_weeks * 7 + ga_days
+    corrected_days = chronological_days - (FULL_TERM_DAYS - gestational_days)
+    return PretermAge(
+        chronological_days=chronological_days,
+        gestational_days=gestational_days,
+        corrected_days=corrected_days if corrected_days >= 0 else None,
+        pma_days=gestational_days + chronological_days,
+    )
+
+
+# ===============================
+# COHORT
+# ===============================
+class CohortAges(NamedTuple):
+    """`PretermAge` fields as float arrays (NaN where the row is invalid),
+    plus the next milestone due within the window: its index into
+    `MILESTONE_NAMES` (-1 if none), date and days until it."""
+    chronological_days: np.ndarray
+    gestational_days: np.ndarray
+    corrected_days: np.ndarray
+    pma_days: np.ndarray
+    milestone: np.ndarray
+    milestone_date: np.ndarray
+    days_to_milestone: np.ndarray
+
+
+@instrumented("corrected_age.cohort_ages")
+def cohort_ages(dob, ga_weeks, ga_days, reference, window_days: int = 28) -> CohortAges:
+    """Vectorized `preterm_age` for a clinic list on `reference` date.
+
+    Pure datetime64[D] arithmetic. Rows with a missing date of birth, a
+    gestation outside `GA_WEEKS_RANGE` (or days outside 0-6) or a birth
+    after `reference` come back as NaN with no milestone. An infant is
+    flagged when a milestone falls on `reference` or in the following
+    `window_days` days.
+    """
+    dob = np.asarray(dob, dtype="datetime64[D]")
+    ga_weeks = np.asarray(ga_weeks, dtype=float)
+    ga_days = np.broadcast_to(np.asarray(ga_days, dtype=float), ga_weeks.shape)
+    reference = np.datetime64(reference, "D")
+
+    chronological = (reference - dob).astype(float)
+    chronological[np.isnat(dob)] = np.nan
+    gestational = ga_weeks * 7 + ga_days
+    valid = (
+        (chronological >= 0)
+        & (ga_weeks >= GA_WEEKS_RANGE[0]) & (ga_weeks <= GA_WEEKS_RANGE[1])
+        & (ga_days >= 0) & (ga_days <= 6) & (ga_weeks % 1 == 0) & (ga_days % 1 == 0)
+    )
+    chronological = np.where(valid, chronological, np.nan)
+    gestational = np.where(valid, gestational, np.nan)
+    # Negative before term-equivalent age.
+    corrected = chronological - (FULL_TERM_DAYS - gestational)
+
+    # First milestone on or after today's corrected age.
+    index = np.searchsorted(_MILESTONE_DAYS, np.where(valid, corrected, np.inf))
+    ahead = index < len(_MILESTONE_DAYS)
+    days_to = np.full(dob.shape, np.nan)
+    days_to[ahead] = _MILESTONE_DAYS[index[ahead]] - corrected[ahead]
+    due = ahead & (days_to < window_days)
+    days_to[~due] = np.nan
+
+    milestone_date = np.full(dob.shape, np.datetime64("NaT"), dtype="datetime64[D]")
+    milestone_date[due] = reference + days_to[due].astype(np.int64)
+    return CohortAges(
+        chronological_days=chronological,
+        gestational_days=gestational,
+        corrected_days=np.where(corrected >= 0, corrected, np.nan),
+        pma_days=gestational + chronological,
+        milestone=np.where(due, index, -1),
+        milestone_date=milestone_date,
+        days_to_milestone=days_to,
+    )
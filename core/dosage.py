@@ -0,0 +1,85 @@
+"""Weight-based dose verification and dispensing volume."""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.metrics import instrumented
+
+BELOW_RANGE = "Below recommended range"
+ABOVE_RANGE = "Above recommended range"
+OVER_MAX_DAY = "Exceeds max daily dose"
+OVER_MAX_DOSE = "Exceeds max per dose"
+
+
+class DoseCheck(NamedTuple):
+    daily: float
+    mg_kg_day: float
+    # Recommended usual range (mg/kg/day) and the matching per-dose range.
+    usual: Optional[Tuple[float, float]]
+    per_dose: Optional[Tuple[float, float]]
+    warnings: List[str]
+
+
+@instrumented("dosage.check_dose")
+def check_dose(med_info: dict, weight: float, dose: float, doses_per_day: float,
+               once_only: bool = False) -> DoseCheck:
+    """Compare an ordered dose with a formulary entry's usual range and caps.
+
+    A once-only (STAT) dose is not a daily regimen: it is checked against
+    the caps only, not the mg/kg/day range. For intervals longer than 24 h
+    the whole dose still falls within one day, so the max daily dose is
+    checked against at least one dose.
+    """
+    daily = dose * doses_per_day
+    mg_kg_day = daily / weight
+    usual = med_info.get("usual")
+    per_dose = None
+    warnings = []
+
+    if usual and not once_only:
+        low, high = usual
+        per_dose = (low * weight / doses_per_day, high * weight / doses_per_day)
+        if mg_kg_day < low:
+            warnings.append(BELOW_RANGE)
+        if mg_kg_day > high:
+            warnings.append(ABOVE_RANGE)
+
+    max_day = med_info.get("max_day")
+    if max_day is not None and max(daily, dose) > max_day:
+        warnings.append(OVER_MAX_DAY)
+
+    max_dose = med_info.get("max_dose")
+    if max_dose is not None and dose > max_dose:
+        warnings.append(OVER_MAX_DOSE)
+
+    return DoseCheck(daily, mg_kg_day, tuple(usual) if usual else None, per_dose, warnings)
+
+
+@instrumented("dosage.dose_warnings")
+def dose_warnings(weight, dose, doses_per_day, usual_low, usual_high, max_dose, max_day,
+                  once_only=False) -> Dict[str, np.ndarray]:
+    """Vectorized `check_dose` rules over arrays of orders.
+
+    Missing ranges and caps are NaN; comparisons against them are False.
+    `once_only` (boolean array or scalar) skips the range checks for STAT
+    orders. Returns {warning text: boolean array}.
+    """
+    dose = np.asarray(dose, dtype=float)
+    daily = dose * np.asarray(doses_per_day, dtype=float)
+    mg_kg_day = daily / np.asarray(weight, dtype=float)
+    regular = ~np.asarray(once_only, dtype=bool)
+    return {
+        BELOW_RANGE: (mg_kg_day < usual_low) & regular,
+        ABOVE_RANGE: (mg_kg_day > usual_high) & regular,
+        # At least one whole dose falls in any day (Q36H, Q48H, ...).
+        OVER_MAX_DAY: (daily > max_day) | (dose > max_day),
+        OVER_MAX_DOSE: dose > max_dose,
+    }
+
+
+@instrumented("dosage.dispensing_volume")
+def dispensing_volume(ordered_dose: float, strength: float, volume_ml: float) -> float:
+    """Volume (ml) to draw up for `ordered_dose` from a `strength` per `volume_ml` stock."""
+    if strength <= 0 or volume_ml <= 0:
+        raise ValueError("strength and volume must be positive")
+    return ordered_dose / (strength / volume_ml)
@@ -0,0 +1,156 @@
+"""Composite early-warning score over a rolling window of observations per patient.
+
+Each observation's HR, RR and SBP classifications (`core.vitals.score_vitals`)
+are turned into points and summed into a PEWS-style score. A `Ward` keeps
+one `PatientWindow` per patient holding the scores of the trailing `window`
+hours with a running total and a monotonic deque for the peak, so a new
+observation costs amortised O(1) however long the patient's history is.
+"""
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.metrics import instrumented
+from core.vitals import NOT_SCORED, score_vitals
+
+WINDOW_HOURS = 12.0
+
+# Points per classification code (not scored, low, normal, high). Low HR,
+# RR or SBP in a child is a late, ominous sign and weighs the most.
+POINTS = {
+    "hr": (0, 3, 0, 2),
+    "rr": (0, 3, 0, 2),
+    "sbp": (0, 3, 0, 1),
+}
+_POINTS = {name: np.array(points, dtype=np.int8) for name, points in POINTS.items()}
+
+# (lowest score, action); a score takes the last band it reaches.
+ESCALATION = (
+    (0, "Routine observations"),
+    (3, "Increase observations; inform nurse in charge"),
+    (5, "Urgent medical review"),
+)
+_BAND_FROM = np.array([low for low, _ in ESCALATION])
+
+# Rise over the window (points) that flags a deteriorating trend.
+RISING_BY = 2
+
+
+class EwsScores(NamedTuple):
+    score: np.ndarray
+    scored: np.ndarray  # parameters that contributed (0-3)
+    band: np.ndarray
+
+
+@instrumented("ews.ews_scores")
+def ews_scores(age_years, hr, rr, sbp, temp=np.nan) -> EwsScores:
+    """Vectorized composite score; inputs as for `score_vitals`."""
+    codes = score_vitals(age_years, hr, rr, sbp, temp)
+    score = sum(_POINTS[name][getattr(codes, name)].astype(np.int16) for name in POINTS)
+    scored = sum((getattr(codes, name) != NOT_SCORED).astype(np.int8) for name in POINTS)
+    band = np.searchsorted(_BAND_FROM, score, side="right") - 1
+    return EwsScores(score, scored, band)
+
+
+# ===============================
+# ROLLING WINDOW
+# ===============================
+class EwsUpdate(NamedTuple):
+    patient: str
+    hours: float  # epoch hours of the observation
+    score: int
+    band: int  # index into ESCALATION
+    mean: float  # over the window, this observation included
+    peak: int
+    trend: int  # score minus the oldest score still in the window
+    escalated: bool  # band is higher than at the previous observation
+
+    @property
+    def rising(self) -> bool:
+        return self.trend >= RISING_BY
+
+
+class PatientWindow:
+    """Scores of one patient's trailing `window` hours. Observations must
+    arrive in time order."""
+
+    __slots__ = ("window", "_scores", "_peaks", "_total", "last")
+
+    def __init__(self, window: float = WINDOW_HOURS):
+        self.window = window
+        self._scores: "deque[Tuple[float, int]]" = deque()
+        # Decreasing scores, so the front is the window's peak.
+        self._peaks: "deque[Tuple[float, int]]" = deque()
+        self._total = 0
+        self.last: Optional[EwsUpdate] = None
+
+    def add(self, patient: str, hours: float, score: int, band: int) -> EwsUpdate:
+        scores, peaks = self._scores, self._peaks
+        scores.append((hours, score))
+        self._total += score
+        while hours - scores[0][0] > self.window:
+            self._total -= scores.popleft()[1]
+        while peaks and peaks[-1][1] <= score:
+            peaks.pop()
+        peaks.append((hours, score))
+        while hours - peaks[0][0] > self.window:
+            peaks.popleft()
+
+        previous = self.last
+        self.last = EwsUpdate(
+            patient=patient,
+            hours=hours,
+            score=score,
+            band=band,
+            mean=self._total / len(scores),
+            peak=peaks[0][1],
+            trend=score - scores[0][1],
+            escalated=previous is not None and band > previous.band,
+        )
+        return self.last
+
+
+class Ward:
+    """Patient identifier -> PatientWindow, fed with batches of observations."""
+
+    def __init__(self, window: float = WINDOW_HOURS):
+        self.window = window
+        self.patients: Dict[str, PatientWindow] = {}
+        self.late = 0  # observations older than the patient's latest, skipped
+        self.unscored = 0  # observations with no usable time or vital sign
+
+    def update(self, patient, hours, age_years, hr, rr, sbp, temp=np.nan) -> List[EwsUpdate]:
+        """Score a batch in one vectorized call, then advance each patient's window."""
+        hours = np.asarray(hours, dtype=float)
+        scores = ews_scores(age_years, hr, rr, sbp, temp)
+        usable = (scores.scored > 0) & ~np.isnan(hours)
+        self.unscored += int((~usable).sum())
+
+        updates = []
+        for p, h, score, band, ok in zip(
+            patient, hours.tolist(), scores.score.tolist(), scores.band.tolist(), usable.tolist()
+        ):
+            if not ok:
+                continue
+            window = self.patients.get(p)
+            if window is None:
+                window = self.patients[p] = PatientWindow(self.window)
+            elif h < window.last.hours:
+                self.late += 1
+                continue
+            updates.append(window.add(p, h, score, band))
+        return updates
+
+    def discharge(self, before_hours: float) -> int:
+        """Forget patients with no observation since `before_hours`; returns how many."""
+        stale = [p for p, w in self.patients.items() if w.last.hours < before_hours]
+        for p in stale:
+            del self.patients[p]
+        return len(stale)
+
+    def board(self) -> List[EwsUpdate]:
+        """Latest state of every patient, highest score (then steepest rise) first."""
+        return sorted(
+            (w.last for w in self.patients.values()), key=lambda u: (-u.score, -u.trend, u.patient)
+        )
@@ -0,0 +1,148 @@
+"""Neonatal enteral feed volumes and day-by-day feed schedules."""
+import threading
+from functools import lru_cache
+from itertools import islice
+from typing import Iterator, List, NamedTuple, Tuple
+
+from core.metrics import instrumented
+
+# Feed ml/kg/day by day of life; from day 4 onwards 150 ml/kg/day.
+FEED_ML_PER_KG = {1: 60, 2: 90, 3: 120}
+DEFAULT_FEED_ML_PER_KG = 150
+FEEDS_PER_DAY = {"2-hourly": 12, "3-hourly": 8}
+IV_FLUIDS_ML_PER_KG = 100
+
+
+class FeedVolumes(NamedTuple):
+    total_feed: float
+    per_feed: float
+    iv_fluids: float
+
+
+def feed_ml_per_kg(day_of_life: int) -> int:
+    return FEED_ML_PER_KG.get(day_of_life, DEFAULT_FEED_ML_PER_KG)
+
+
+@instrumented("feeds.feed_volumes")
+def feed_volumes(weight: float, day_of_life: int, interval: str) -> FeedVolumes:
+    """Daily feed volume, volume per feed and IV fluid volume in ml."""
+    total_feed = weight * feed_ml_per_kg(day_of_life)
+    return FeedVolumes(
+        total_feed=total_feed,
+        per_feed=total_feed / FEEDS_PER_DAY[interval],
+        iv_fluids=weight * IV_FLUIDS_ML_PER_KG,
+    )
+
+
+# ===============================
+# SCHEDULE TO DAY 28
+# ===============================
+SCHEDULE_DAYS = 28
+
+
+class FeedProtocol(NamedTuple):
+    """Enteral advancement: ml/kg/day on day d is min(start + advance * (d - 1), maximum)."""
+    start: float
+    advance: float
+    maximum: float
+
+    def enteral_ml_per_kg(self, day: int) -> float:
+        return min(self.start + self.advance * (day - 1), self.maximum)
+
+
+PROTOCOLS = {
+    # Days 1-3 match FEED_ML_PER_KG.
+    "Standard (60 → 150 ml/kg/day)": FeedProtocol(60, 30, DEFAULT_FEED_ML_PER_KG),
+    "Cautious (+30 ml/kg/day from 30)": FeedProtocol(30, 30, DEFAULT_FEED_ML_PER_KG),
+    "Slow (+20 ml/kg/day from 20)": FeedProtocol(20, 20, DEFAULT_FEED_ML_PER_KG),
+}
+
+
+def iv_top_up(weight: float, enteral: float) -> float:
+    """IV fluids (ml/day) still needed alongside `enteral` ml/day of feeds.
+
+    The IV rate of `feed_volumes` (IV_FLUIDS_ML_PER_KG) is reduced ml for ml
+    as feeds advance, never below zero.
+    """
+    return max(weight * IV_FLUIDS_ML_PER_KG - enteral, 0.0)
+
+
+class FeedDay(NamedTuple):
+    day: int
+    weight: float
+    enteral_ml_per_kg: float
+    enteral: float
+    per_feed: float
+    iv_top_up: float
+
+
+class Feed(NamedTuple):
+    number: int
+    hour: int  # hours after the first feed of the day
+    volume: float
+
+
+def weight_on_day(weights: Tuple[Tuple[int, float], ...], day: int) -> float:
+    """Latest recorded weight on or before `day` (the first one before any is recorded)."""
+    current = weights[0][1]
+    for recorded_day, weight in weights:
+        if recorded_day > day:
+            break
+        current = weight
+    return current
+
+
+def schedule_days(weights, interval: str, protocol: FeedProtocol, days: int = SCHEDULE_DAYS) -> Iterator[FeedDay]:
+    """Lazily yield the plan for days 1..`days`.
+
+    `weights` is a sequence of (day of life, kg) sorted by day.
+    """
+    feeds = FEEDS_PER_DAY[interval]
+    for day in range(1, days + 1):
+        weight = weight_on_day(weights, day)
+        ml_per_kg = protocol.enteral_ml_per_kg(day)
+        enteral = weight * ml_per_kg
+        yield FeedDay(day, weight, ml_per_kg, enteral, enteral / feeds, iv_top_up(weight, enteral))
+
+
+def day_feeds(plan_day: FeedDay, interval: str) -> Iterator[Feed]:
+    """Feed-by-feed volumes for one planned day."""
+    feeds = FEEDS_PER_DAY[interval]
+    spacing = 24 // feeds
+    for n in range(feeds):
+        yield Feed(n + 1, n * spacing, plan_day.per_feed)
+
+
+class FeedPlan:
+    """A schedule that is computed only as far as it has been looked at.
+
+    Plans are shared between sessions (see `feed_plan`), so advancing the
+    underlying generator is serialised.
+    """
+
+    def __init__(self, days: Iterator[FeedDay], length: int):
+        self._pending = days
+        self._days: List[FeedDay] = []
+        self._lock = threading.Lock()
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def days(self, first: int, last: int) -> List[FeedDay]:
+        """Plan for days `first`..`last` inclusive (1-based)."""
+        if last > len(self._days):
+            with self._lock:
+                self._days.extend(islice(self._pending, max(last - len(self._days), 0)))
+        return self._days[first - 1:last]
+
+    @property
+    def computed(self) -> int:
+        return len(self._days)
+
+
+@lru_cache(maxsize=256)
+def feed_plan(weights: Tuple[Tuple[int, float], ...], interval: str, protocol: str,
+              days: int = SCHEDULE_DAYS) -> FeedPlan:
+    """Shared lazy plan per (weight trajectory, interval, protocol name)."""
+    return FeedPlan(schedule_days(weights, interval, PROTOCOLS[protocol], days), days)
@@ -0,0 +1,71 @@
+"""Pediatric maintenance and rehydration fluids (Holliday-Segar)."""
+from typing import NamedTuple
+
+import numpy as np
+
+from core.metrics import instrumented
+
+REHYDRATION_ML_PER_KG = {0: 0, 3: 30, 5: 50}
+
+# Rehydration percent -> ml/kg, NaN for percentages without a rule.
+_REHYDRATION_LUT = np.full(max(REHYDRATION_ML_PER_KG) + 1, np.nan)
+_REHYDRATION_LUT[list(REHYDRATION_ML_PER_KG)] = list(REHYDRATION_ML_PER_KG.values())
+
+
+class FluidRequirement(NamedTuple):
+    maintenance: float
+    rehydration: float
+    total: float
+
+    @property
+    def ml_per_hr(self) -> float:
+        return self.total / 24
+
+
+def maintenance_fluids(weight: float) -> float:
+    """Holliday-Segar maintenance volume in ml/day."""
+    if weight <= 10:
+        return weight * 100
+    elif weight <= 20:
+        return 1000 + (weight - 10) * 50
+    else:
+        return 1500 + (weight - 20) * 20
+
+
+@instrumented("fluids.fluid_requirement")
+def fluid_requirement(weight: float, rehydration_percent: int = 0) -> FluidRequirement:
+    """Maintenance plus optional 3% / 5% rehydration, in ml/day."""
+    if weight <= 0:
+        raise ValueError("weight must be positive")
+    maintenance = maintenance_fluids(weight)
+    rehydration = weight * REHYDRATION_ML_PER_KG[rehydration_percent]
+    return FluidRequirement(maintenance, rehydration, maintenance + rehydration)
+
+
+def maintenance_fluids_array(weight) -> np.ndarray:
+    """Vectorized `maintenance_fluids`: the three weight bands summed, no branches."""
+    weight = np.asarray(weight, dtype=float)
+    return (
+        100 * np.minimum(weight, 10)
+        + 50 * np.clip(weight - 10, 0, 10)
+        + 20 * np.maximum(weight - 20, 0)
+    )
+
+
+@instrumented("fluids.fluid_requirements")
+def fluid_requirements(weight, rehydration_percent=0) -> FluidRequirement:
+    """Vectorized `fluid_requirement` over a census; fields are arrays.
+
+    Rows with a non-positive weight or an unsupported rehydration percentage
+    come back as NaN rather than raising.
+    """
+    weight = np.asarray(weight, dtype=float)
+    percent = np.broadcast_to(np.asarray(rehydration_percent, dtype=float), weight.shape)
+    known = np.isin(percent, list(REHYDRATION_ML_PER_KG))
+    ml_per_kg = _REHYDRATION_LUT[np.where(known, percent, 0).astype(np.intp)]
+    ml_per_kg[~known] = np.nan
+
+    weight = np.where(weight > 0, weight, np.nan)
+    maintenance = maintenance_fluids_array(weight)
+    rehydration = weight * ml_per_kg
+    return FluidRequirement(maintenance, rehydration, maintenance + rehydration)
@@ -0,0 +1,191 @@
+"""Columnar formulary compiled from the nested antibiotics/others dicts.
+
+One row per (system, drug, route option). String fields are interned into
+small tables and stored as integer codes; dose ranges and caps are float64
+columns with NaN where the source entry has no value. The table is compiled
+once per process and shared by every session.
+"""
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.dosage import dose_warnings
+from core.metrics import instrumented
+from core.search import OTHERS, normalize
+
+RANGE_KEYS = ("usual", "severe", "high")
+FLOAT_COLUMNS = tuple(f"{k}_{end}" for k in RANGE_KEYS for end in ("low", "high")) + ("max_dose", "max_day")
+
+
+class FormularyRow(NamedTuple):
+    system: str
+    drug: str
+    route: str
+    unit: str
+    usual: Optional[Tuple[float, float]]
+    severe: Optional[Tuple[float, float]]
+    high: Optional[Tuple[float, float]]
+    max_dose: Optional[float]
+    max_day: Optional[float]
+    notes: str
+
+
+def _intern(table: Dict[str, int], value: str) -> int:
+    return table.setdefault(value, len(table))
+
+
+def _float(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+class Formulary:
+    def __init__(self, records):
+        # records: iterable of (system, drug, option dict)
+        tables = {name: {} for name in ("system", "drug", "route", "unit", "notes")}
+        codes = {name: [] for name in tables}
+        floats = {name: [] for name in FLOAT_COLUMNS}
+
+        for system, drug, option in records:
+            codes["system"].append(_intern(tables["system"], system))
+            codes["drug"].append(_intern(tables["drug"], drug))
+            codes["route"].append(_intern(tables["route"], option.get("route", "")))
+            codes["unit"].append(_intern(tables["unit"], option.get("unit", "")))
+            codes["notes"].append(_intern(tables["notes"], option.get("notes", "")))
+            for key in RANGE_KEYS:
+                low, high = option.get(key) or (None, None)
+                floats[f"{key}_low"].append(_float(low))
+                floats[f"{key}_high"].append(_float(high))
+            floats["max_dose"].append(_float(option.get("max_dose")))
+            floats["max_day"].append(_float(option.get("max_day")))
+
+        self.systems = tuple(tables["system"])
+        self.drugs = tuple(tables["drug"])
+        self.routes = tuple(tables["route"])
+        self.units = tuple(tables["unit"])
+        self.notes = tuple(tables["notes"])
+
+        self.system_id = np.array(codes["system"], dtype=np.int16)
+        self.drug_id = np.array(codes["drug"], dtype=np.int32)
+        self.route_id = np.array(codes["route"], dtype=np.int16)
+        self.unit_id = np.array(codes["unit"], dtype=np.int16)
+        self.notes_id = np.array(codes["notes"], dtype=np.int32)
+        for name, values in floats.items():
+            setattr(self, name, np.array(values, dtype=np.float64))
+
+        self._by_drug: Dict[str, List[int]] = defaultdict(list)
+        for row, drug_id in enumerate(codes["drug"]):
+            self._by_drug[normalize(self.drugs[drug_id])].append(row)
+
+    def __len__(self) -> int:
+        return len(self.drug_id)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.system_id, self.drug_id, self.route_id, self.unit_id, self.notes_id]
+        arrays += [getattr(self, name) for name in FLOAT_COLUMNS]
+        return sum(a.nbytes for a in arrays)
+
+    def rows(self, drug: str, system: Optional[str] = None, route: Optional[str] = None) -> np.ndarray:
+        """Row indices for a drug, optionally narrowed to a system and route."""
+        rows = self._by_drug.get(normalize(drug), [])
+        if system is not None:
+            rows = [r for r in rows if self.systems[self.system_id[r]] == system]
+        if route is not None:
+            route = normalize(route)
+            rows = [r for r in rows if normalize(self.routes[self.route_id[r]]) == route]
+        return np.array(rows, dtype=np.intp)
+
+    def record(self, row: int) -> FormularyRow:
+        def pair(key):
+            low, high = getattr(self, f"{key}_low")[row], getattr(self, f"{key}_high")[row]
+            return None if np.isnan(low) else (float(low), float(high))
+
+        def scalar(name):
+            value = getattr(self, name)[row]
+            return None if np.isnan(value) else float(value)
+
+        return FormularyRow(
+            system=self.systems[self.system_id[row]],
+            drug=self.drugs[self.drug_id[row]],
+            route=self.routes[self.route_id[row]],
+            unit=self.units[self.unit_id[row]],
+            usual=pair("usual"),
+            severe=pair("severe"),
+            high=pair("high"),
+            max_dose=scalar("max_dose"),
+            max_day=scalar("max_day"),
+            notes=self.notes[self.notes_id[row]],
+        )
+
+    @instrumented("formulary.dose_ranges")
+    def dose_ranges(self, weight: float, doses_per_day: float) -> Dict[str, np.ndarray]:
+        """Usual per-dose range for every row at `weight`, clamped to its caps.
+
+        The per-dose cap is the tighter of max_dose and max_day / doses per
+        day. `cap_binds` marks rows whose usual high dose exceeds that cap.
+        Rows without a usual range are NaN.
+        """
+        low = self.usual_low * (weight / doses_per_day)
+        high = self.usual_high * (weight / doses_per_day)
+        cap = np.fmin(self.max_dose, self.max_day / doses_per_day)
+        return {
+            "per_dose_low": low,
+            "per_dose_high": high,
+            "cap": cap,
+            "capped_low": np.fmin(low, cap),
+            "capped_high": np.fmin(high, cap),
+            "cap_binds": high > cap,
+        }
+
+    def dose_flags(self, rows, weight, dose, doses_per_day, once_only=False) -> Dict[str, np.ndarray]:
+        """Vectorized "Check Dose" rules for arrays of orders against `rows`.
+
+        Returns {warning text: boolean array}. Comparisons against a missing
+        (NaN) range or cap are False, matching the scalar check_dose.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        return dose_warnings(
+            weight, dose, doses_per_day,
+            self.usual_low[rows], self.usual_high[rows], self.max_dose[rows], self.max_day[rows], once_only,
+        )
+
+    def envelope(self, rows) -> Tuple[float, float, float, float]:
+        """Most permissive (usual low, usual high, max_dose, max_day) over `rows`.
+
+        Used when an order matches the same drug and route under several
+        systems: a warning then means the order is outside every listed use.
+        A cap missing from any row means no cap.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        if not len(rows):
+            return (np.nan,) * 4
+        low, high = self.usual_low[rows], self.usual_high[rows]
+        caps = [self.max_dose[rows], self.max_day[rows]]
+        has_range = ~np.isnan(low)
+        return (
+            float(low[has_range].min()) if has_range.any() else np.nan,
+            float(high[has_range].max()) if has_range.any() else np.nan,
+            *(np.nan if np.isnan(c).any() else float(c.max()) for c in caps),
+        )
+
+
+def compile_formulary(antibiotics: dict, others: dict) -> Formulary:
+    records = [
+        (system, drug, option)
+        for system, drugs in antibiotics.items()
+        for drug, options in drugs.items()
+        for option in options
+    ]
+    records += [(OTHERS, drug, option) for drug, options in others.items() for option in options]
+    return Formulary(records)
+
+
+@lru_cache(maxsize=None)
+def formulary() -> Formulary:
+    """Process-wide formulary compiled from data.antibiotics_data and data.others_data."""
+    from data.antibiotics_data import antibiotics_data
+    from data.others_data import others_data
+
+    return compile_formulary(antibiotics_data, others_data)
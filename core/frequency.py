@@ -0,0 +1,47 @@
+"""Dosing frequency strings → doses per 24 hours.
+
+Understands interval forms ("Q8H", "q 6 hr", "4-hourly"), the Latin
+abbreviations ("OD", "BD", "TDS", "QDS", ...) and once-only orders ("STAT").
+Results are memoized per raw string, so a bulk run parses each distinct
+spelling once.
+"""
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Offered in the dosage page, in this order.
+COMMON_FREQUENCIES = ("Q24H", "Q12H", "Q8H", "Q6H", "Q4H", "Q36H", "Q48H", "BD", "TDS", "QDS", "STAT")
+
+NAMED_FREQUENCIES = {
+    "OD": 1, "OM": 1, "ON": 1, "QD": 1, "DAILY": 1, "QAM": 1, "QPM": 1, "NOCTE": 1,
+    "BD": 2, "BID": 2,
+    "TDS": 3, "TID": 3,
+    "QDS": 4, "QID": 4,
+    # Once-only: a single dose in the 24 hours.
+    "STAT": 1, "ONCE": 1,
+}
+ONCE_ONLY = frozenset({"STAT", "ONCE"})
+
+_INTERVAL = re.compile(r"^(?:Q\s*(\d+(?:\.\d+)?)\s*(?:H|HR|HRS|HOURLY)|(\d+(?:\.\d+)?)\s*-?\s*HOURLY)$")
+
+
+@lru_cache(maxsize=4096)
+def doses_per_day(frequency: str) -> Optional[float]:
+    """Doses per 24 h for a frequency string, or None if it is not recognised."""
+    text = frequency.strip().upper()
+    if text in NAMED_FREQUENCIES:
+        return float(NAMED_FREQUENCIES[text])
+    match = _INTERVAL.match(text)
+    if match:
+        hours = float(match.group(1) or match.group(2))
+        if hours > 0:
+            return 24 / hours
+    return None
+
+
+def is_once_only(frequency: str) -> bool:
+    return frequency.strip().upper() in ONCE_ONLY
+
+
+for _frequency in COMMON_FREQUENCIES:
+    doses_per_day(_frequency)
@@ -0,0 +1,86 @@
+"""Hospital-local wall clock and hours-of-life arithmetic.
+
+Birth and sample times are recorded as naive local wall-clock times in the
+hospital's time zone (KKH_HOSPITAL_TZ, default Asia/Singapore).
+"""
+import os
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+HOSPITAL_TZ = os.environ.get("KKH_HOSPITAL_TZ", "Asia/Singapore")
+
+# Inputs spanning more local hours than this resolve offsets per distinct
+# hour (a sort) instead of per hour of the span.
+_MAX_SPAN_HOURS = 100_000
+
+
+@lru_cache(maxsize=None)
+def hospital_tz(name: str = HOSPITAL_TZ) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def now(tz: Optional[ZoneInfo] = None) -> datetime:
+    """Current aware time in the hospital time zone."""
+    return datetime.now(tz or hospital_tz())
+
+
+def hours_of_life(birth_date: date, birth_time: time, as_of: Optional[datetime] = None,
+                  tz: Optional[ZoneInfo] = None) -> float:
+    """Fractional hours from a local birth date/time to `as_of` (default now).
+
+    A naive `as_of` is taken as hospital local time.
+    """
+    tz = tz or hospital_tz()
+    birth = datetime.combine(birth_date, birth_time, tzinfo=tz)
+    if as_of is None:
+        as_of = now(tz)
+    elif as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=tz)
+    # Via epoch seconds: subtracting two datetimes that share a tzinfo
+    # ignores a DST change between them.
+    return (as_of.timestamp() - birth.timestamp()) / 3600
+
+
+def epoch_seconds(local, tz: Optional[ZoneInfo] = None) -> np.ndarray:
+    """Epoch seconds (float, NaN for NaT) for naive local datetime64 values.
+
+    The UTC offset is resolved once per local hour in the span of the input
+    rather than per value, so a census covering a few weeks costs a few
+    hundred tzinfo calls however many rows it has.
+    """
+    tz = tz or hospital_tz()
+    local = np.asarray(local, dtype="datetime64[s]")
+    seconds = local.astype(np.int64).astype(float)
+    valid = ~np.isnat(local)
+    seconds[~valid] = np.nan
+    if not valid.any():
+        return seconds
+
+    hours = local[valid].astype("datetime64[h]").astype(np.int64)
+    first, last = hours.min(), hours.max()
+    if last - first < _MAX_SPAN_HOURS:
+        span = np.arange(first, last + 1).astype("datetime64[h]")
+        index = hours - first
+    else:
+        span, index = np.unique(hours.astype("datetime64[h]"), return_inverse=True)
+    offsets = np.array([tz.utcoffset(h).total_seconds() for h in span.tolist()])
+    seconds[valid] -= offsets[index]
+    return seconds
+
+
+def hours_of_life_array(birth, as_of, tz: Optional[ZoneInfo] = None) -> np.ndarray:
+    """Vectorized hours of life from local birth times to `as_of`.
+
+    `birth` is an array of naive local datetime64 values; `as_of` is either
+    another such array (e.g. sample times), a naive local datetime64 scalar,
+    or an aware datetime.
+    """
+    if isinstance(as_of, datetime) and as_of.tzinfo is not None:
+        end = as_of.timestamp()
+    else:
+        end = epoch_seconds(as_of, tz)
+    return (end - epoch_seconds(birth, tz)) / 3600
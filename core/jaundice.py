@@ -0,0 +1,306 @@
+"""KKH neonatal jaundice thresholds: TcB screening and SB phototherapy bands.
+
+The guideline tables below list inclusive whole-hour brackets. At import they
+are compiled into one interval index of contiguous half-open brackets
+``[start, next start)``, so fractional ages such as 12.5 h fall into the
+bracket that began at 0 h instead of into the gap before 13 h.
+
+That index is then expanded into a per-hour nomogram (0-336 h) stored as
+``data/jaundice_nomogram.npy`` and memory-mapped; because every bracket
+starts on a whole hour, ``floor(hours)`` selects the same thresholds as a
+bracket search. After editing the tables below, regenerate the file with
+``python -m batch.nomogram``; until then a stale file is ignored and the
+nomogram is built in memory (see core.artifacts). ``jaundice_actions``
+scores whole arrays at once.
+"""
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from core.artifacts import load_artifact
+from core.metrics import instrumented
+
+HIGH_RISK = "High-Risk"
+NORMAL_RISK = "Normal-Risk"
+
+# ===============================
+# TcB → SB SCREENING
+# ===============================
+# (from hour, to hour, TcB above which a serum bilirubin is needed)
+TCB_NORMAL_RISK_RULES = [
+    (25, 36, 160), (37, 48, 180), (49, 72, 200), (73, 96, 220),
+    (97, 120, 220), (121, 168, 240), (169, 336, 250),
+]
+TCB_HIGH_RISK_RULES = [
+    (0, 12, 80), (13, 24, 120), (25, 36, 140), (37, 48, 160),
+    (49, 72, 180), (73, 96, 200), (97, 120, 200),
+    (121, 168, 220), (169, 336, 240),
+]
+
+# ===============================
+# SB RULE TABLES
+# ===============================
+# (from hour, to hour, stop PT, single, double, intense, exchange)
+HIGH_RISK_RULES = [
+    (0, 12,    None, 100, 150, 175, 200),
+    (13, 24,   None, 150, 200, 225, 250),
+    (25, 36,   135, 175, 225, 250, 275),
+    (37, 48,   160, 200, 250, 275, 300),
+    (49, 72,   185, 225, 275, 300, 325),
+    (73, 96,   210, 250, 300, 325, 350),
+    (97, 120,  210, 250, 300, 325, 350),
+    (121, 168, 235, 275, 325, 350, 375),
+    (169, 336, 260, 300, 325, 350, 375),
+]
+
+NORMAL_RISK_RULES = [
+    (25, 36,   160, 200, 250, 275, 300),
+    (37, 48,   185, 225, 300, 325, 350),
+    (49, 72,   210, 250, 300, 325, 350),
+    (73, 96,   235, 275, 325, 350, 375),
+    (97, 120,  235, 275, 350, 375, 400),
+    (121, 168, 260, 300, 350, 375, 400),
+    (169, 336, 285, 325, 375, 400, 425),
+]
+
+SB_RULES = {HIGH_RISK: HIGH_RISK_RULES, NORMAL_RISK: NORMAL_RISK_RULES}
+TCB_RULES = {HIGH_RISK: TCB_HIGH_RISK_RULES, NORMAL_RISK: TCB_NORMAL_RISK_RULES}
+
+# ===============================
+# ACTION CODES
+# ===============================
+OUT_OF_RANGE = 0
+CONTINUE_MONITORING = 1
+START_SINGLE = 2
+CONTINUE_SINGLE = 3
+STOP_PHOTOTHERAPY = 4
+DOUBLE = 5
+INTENSE = 6
+EXCHANGE = 7
+
+ACTIONS = {
+    OUT_OF_RANGE: ("Age out of range", "lightgray"),
+    CONTINUE_MONITORING: ("🟢 Continue monitoring (outpatient)", "lightgreen"),
+    START_SINGLE: ("🟡 Start single blue phototherapy", "khaki"),
+    CONTINUE_SINGLE: ("🟡 Continue single blue phototherapy", "khaki"),
+    STOP_PHOTOTHERAPY: ("🟢 Stop phototherapy", "lightblue"),
+    DOUBLE: ("🟠 Double blue phototherapy", "orange"),
+    INTENSE: ("🔴 Intense phototherapy", "tomato"),
+    EXCHANGE: ("⚠️ Exchange transfusion indicated", "red"),
+}
+
+TCB_MESSAGES = {
+    True: "⚠️ TcB exceeds threshold – perform Serum Bilirubin test",
+    False: "✅ TcB below threshold – continue monitoring",
+}
+
+# Action for the number of thresholds reached, outpatient (single, double,
+# intense, exchange) and inpatient (double, intense, exchange).
+_OUTPATIENT_CODES = np.array(
+    [CONTINUE_MONITORING, START_SINGLE, DOUBLE, INTENSE, EXCHANGE], dtype=np.int8
+)
+_INPATIENT_CODES = np.array([CONTINUE_SINGLE, DOUBLE, INTENSE, EXCHANGE], dtype=np.int8)
+
+# ===============================
+# INTERVAL INDEX
+# ===============================
+_RISKS = (NORMAL_RISK, HIGH_RISK)
+
+
+def _compile(tables, width):
+    """Merge inclusive-hour rule tables into shared half-open boundaries.
+
+    Returns the sorted boundary list and a float array of shape
+    (risk, bracket, width) holding NaN where a table has no rule.
+    """
+    edges = sorted({edge for rules in tables for rule in rules for edge in (rule[0], rule[1] + 1)})
+    values = np.full((len(tables), len(edges) - 1, width), np.nan)
+    for r, rules in enumerate(tables):
+        for start, end, *thresholds in rules:
+            first, last = edges.index(start), edges.index(end + 1)
+            values[r, first:last] = [np.nan if t is None else t for t in thresholds]
+    return edges, values
+
+
+SB_EDGES, SB_THRESHOLDS = _compile([SB_RULES[r] for r in _RISKS], 5)
+TCB_EDGES, TCB_THRESHOLDS = _compile([TCB_RULES[r] for r in _RISKS], 1)
+
+
+def _bracket(edges, hours):
+    """Index of the half-open bracket containing `hours`, or -1."""
+    if hours < edges[0] or hours >= edges[-1]:
+        return -1
+    return bisect_right(edges, hours) - 1
+
+
+def _brackets(edges, hours):
+    """Vectorized `_bracket`; returns the indices and an in-range mask."""
+    hours = np.asarray(hours, dtype=float)
+    idx = np.searchsorted(edges, hours, side="right") - 1
+    valid = (hours >= edges[0]) & (hours < edges[-1])
+    return np.where(valid, idx, 0), valid
+
+
+# ===============================
+# NOMOGRAM
+# ===============================
+NOMOGRAM_NAME = "jaundice_nomogram"
+NOMOGRAM_COLUMNS = ("stop_pt", "single", "double", "intense", "exchange", "tcb")
+NOMOGRAM_HOURS = max(SB_EDGES[-1], TCB_EDGES[-1])
+
+
+def build_nomogram() -> np.ndarray:
+    """float32 array (risk, hour, NOMOGRAM_COLUMNS); NaN where no rule applies."""
+    hours = np.arange(NOMOGRAM_HOURS)
+    sb_idx, sb_valid = _brackets(SB_EDGES, hours)
+    tcb_idx, tcb_valid = _brackets(TCB_EDGES, hours)
+    out = np.empty((len(_RISKS), NOMOGRAM_HOURS, len(NOMOGRAM_COLUMNS)), dtype=np.float32)
+    out[..., :5] = np.where(sb_valid[:, None], SB_THRESHOLDS[:, sb_idx], np.nan)
+    out[..., 5] = np.where(tcb_valid, TCB_THRESHOLDS[:, tcb_idx, 0], np.nan)
+    return out
+
+
+def threshold_steps(nomogram, risk: str, column: str) -> List[Tuple[int, float]]:
+    """(first hour, threshold) at each change along one nomogram column."""
+    values = nomogram[_RISKS.index(risk), :, NOMOGRAM_COLUMNS.index(column)].tolist()
+    steps = []
+    for hour, value in enumerate(values):
+        last = steps[-1][1] if steps else None
+        if not steps or (value != last and not (value != value and last != last)):
+            steps.append((hour, value))
+    return steps
+
+
+def nomogram_summary(nomogram) -> Dict[str, Dict[str, str]]:
+    """Sidecar summary: one "hour:threshold" line per band, so guideline
+    edits show up in diffs."""
+    return {
+        risk: {
+            column: " ".join(
+                f"{h}:{'-' if v != v else f'{v:g}'}" for h, v in threshold_steps(nomogram, risk, column)
+            )
+            for column in NOMOGRAM_COLUMNS
+        }
+        for risk in _RISKS
+    }
+
+
+# Everything the nomogram is generated from; a change triggers a rebuild.
+NOMOGRAM_SOURCE = {"risks": _RISKS, "columns": NOMOGRAM_COLUMNS, "sb": SB_RULES, "tcb": TCB_RULES}
+
+NOMOGRAM = load_artifact(NOMOGRAM_NAME, NOMOGRAM_SOURCE, build_nomogram)
+
+# Plain-Python copies for scalar lookups, which would only pay for numpy boxing.
+_SB_ROWS = NOMOGRAM[..., :5].tolist()
+_TCB_ROWS = NOMOGRAM[..., 5].tolist()
+
+
+def _hour(hours):
+    """Nomogram row for `hours` of life, or -1 outside the table (or NaN)."""
+    if not 0 <= hours < NOMOGRAM_HOURS:
+        return -1
+    return int(hours)
+
+
+def _hours(hours):
+    """Vectorized `_hour`; returns the rows and an in-range mask."""
+    hours = np.asarray(hours, dtype=float)
+    valid = (hours >= 0) & (hours < NOMOGRAM_HOURS)
+    return np.where(valid, hours, 0).astype(np.intp), valid
+
+
+@instrumented("jaundice.tcb_to_sb_needed")
+def tcb_to_sb_needed(hours: float, risk: str, tcb: float) -> bool:
+    """True when a TcB reading exceeds the screening threshold for its age."""
+    h = _hour(hours)
+    if h < 0:
+        return False
+    threshold = _TCB_ROWS[_RISKS.index(risk)][h]
+    # NaN (no rule for this risk) compares False.
+    return tcb > threshold
+
+
+def jaundice_action(hours: float, sb: float, risk: str, on_phototherapy: bool) -> int:
+    """Action code for a single serum bilirubin."""
+    h = _hour(hours)
+    if h < 0:
+        return OUT_OF_RANGE
+    stop_pt, single, double, intense, exchange = _SB_ROWS[_RISKS.index(risk)][h]
+    if single != single:
+        return OUT_OF_RANGE
+
+    # INPATIENT
+    if on_phototherapy:
+        if sb <= stop_pt:
+            return STOP_PHOTOTHERAPY
+        if sb < double:
+            return CONTINUE_SINGLE
+        if sb < intense:
+            return DOUBLE
+        if sb < exchange:
+            return INTENSE
+        return EXCHANGE
+
+    # OUTPATIENT
+    if sb < single:
+        return CONTINUE_MONITORING
+    if sb < double:
+        return START_SINGLE
+    if sb < intense:
+        return DOUBLE
+    if sb < exchange:
+        return INTENSE
+    return EXCHANGE
+
+
+def jaundice_key(hours: float, sb: float, risk: str, on_phototherapy: bool) -> tuple:
+    """Memo key for `jaundice_action`: only the bracket containing `hours` matters."""
+    return (_bracket(SB_EDGES, hours), sb, risk, bool(on_phototherapy))
+
+
+def tcb_key(hours: float, risk: str, tcb: float) -> tuple:
+    """Memo key for `tcb_to_sb_needed`."""
+    return (_bracket(TCB_EDGES, hours), risk, tcb)
+
+
+@instrumented("jaundice.evaluate_jaundice")
+def evaluate_jaundice(hours: float, sb: float, risk: str, on_phototherapy: bool) -> Tuple[str, str]:
+    """Action band for a serum bilirubin as (message, display colour)."""
+    return ACTIONS[jaundice_action(hours, sb, risk, on_phototherapy)]
+
+
+@instrumented("jaundice.jaundice_actions")
+def jaundice_actions(hours, sb, high_risk, on_phototherapy) -> np.ndarray:
+    """Vectorized `jaundice_action` over equal-length arrays.
+
+    `high_risk` and `on_phototherapy` are boolean arrays (or scalars that
+    broadcast). Returns an int8 array of action codes.
+    """
+    sb = np.asarray(sb, dtype=float)
+    idx, valid = _hours(hours)
+    risk = np.asarray(high_risk, dtype=bool).astype(np.intp)
+    on_pt = np.asarray(on_phototherapy, dtype=bool)
+
+    stop_pt, single, double, intense, exchange = np.moveaxis(NOMOGRAM[risk, idx, :5], -1, 0)
+    sb_col = sb[..., None]
+
+    reached = (sb_col >= np.stack([single, double, intense, exchange], axis=-1)).sum(axis=-1)
+    outpatient = _OUTPATIENT_CODES[reached]
+    inpatient = np.where(
+        sb <= stop_pt,  # NaN stop threshold never matches
+        STOP_PHOTOTHERAPY,
+        _INPATIENT_CODES[(sb_col >= np.stack([double, intense, exchange], axis=-1)).sum(axis=-1)],
+    )
+    codes = np.where(on_pt, inpatient, outpatient).astype(np.int8)
+    codes[~(valid & ~np.isnan(single))] = OUT_OF_RANGE
+    return codes
+
+
+@instrumented("jaundice.tcb_sb_needed")
+def tcb_sb_needed(hours, tcb, high_risk) -> np.ndarray:
+    """Vectorized `tcb_to_sb_needed`; returns a boolean array."""
+    idx, valid = _hours(hours)
+    risk = np.asarray(high_risk, dtype=bool).astype(np.intp)
+    threshold = NOMOGRAM[risk, idx, 5]
+    return valid & (np.asarray(tcb, dtype=float) > threshold)
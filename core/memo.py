@@ -0,0 +1,92 @@
+"""Bounded LRU memoization for calculator results.
+
+A MemoStore holds one LRU cache per function. The app keeps one store per
+Streamlit session (see `session_memo`), so reruns that repeat an earlier
+input reuse its result.
+
+Keys default to the call arguments with floats rounded to `FLOAT_DIGITS`;
+callers pass `key=` when a coarser key gives the same result, e.g. the
+jaundice bracket rather than the exact hours of life.
+"""
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, MutableMapping, Optional
+
+DEFAULT_MAXSIZE = int(os.environ.get("KKH_MEMO_MAXSIZE", "256"))
+FLOAT_DIGITS = 6
+SESSION_KEY = "_memo"
+
+_MISSING = object()
+
+
+def normalize_key(*args) -> tuple:
+    return tuple(round(a, FLOAT_DIGITS) if isinstance(a, float) else a for a in args)
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default=None):
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+
+class MemoStore:
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._caches: Dict[str, LRUCache] = {}
+
+    def cache(self, name: str) -> LRUCache:
+        if name not in self._caches:
+            self._caches[name] = LRUCache(self.maxsize)
+        return self._caches[name]
+
+    def call(self, func: Callable, *args, key: Optional[Hashable] = None):
+        """func(*args), memoized under `key` (default: the normalized args)."""
+        cache = self.cache(f"{func.__module__}.{func.__qualname__}")
+        if key is None:
+            key = normalize_key(*args)
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = func(*args)
+            cache.put(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            name: {"hits": c.hits, "misses": c.misses, "entries": len(c), "maxsize": c.maxsize}
+            for name, c in sorted(self._caches.items())
+        }
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+
+def session_memo(state: MutableMapping) -> MemoStore:
+    """The MemoStore kept in a session-state mapping, created on first use."""
+    if SESSION_KEY not in state:
+        state[SESSION_KEY] = MemoStore()
+    return state[SESSION_KEY]
@@ -0,0 +1,142 @@
+"""In-process timing histograms with a Prometheus text exposition.
+
+`registry` is shared by every session in the process. Page renders are
+timed by the app; core calculations are wrapped with `instrumented`. Each
+observation is two perf_counter() calls and a bisect under a lock.
+Control-flow exceptions that do not derive from Exception (st.stop,
+st.rerun) are timed but not counted as errors.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Tuple
+
+# Upper bounds in seconds; the +Inf bucket is implicit.
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+METRIC_HELP = {
+    "page": ("kkh_page_render_seconds", "Wall time of one calculator page script run."),
+    "calc": ("kkh_calc_seconds", "Wall time of one core calculation call."),
+    "endpoint": ("kkh_endpoint_seconds", "Wall time of one service batch request, excluding I/O."),
+}
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.errors: Dict[str, int] = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._last_write = 0.0
+        # Separate from _lock: rendering takes _lock, and observations must
+        # not wait on file I/O.
+        self._write_lock = threading.Lock()
+
+    def observe(self, kind: str, name: str, seconds: float, error: str = None) -> None:
+        with self._lock:
+            h = self._histograms.get((kind, name))
+            if h is None:
+                h = self._histograms[(kind, name)] = Histogram()
+            h.counts[bisect_left(BUCKETS, seconds)] += 1
+            h.total += seconds
+            h.count += 1
+            if error:
+                h.errors[error] = h.errors.get(error, 0) + 1
+
+    @contextmanager
+    def timer(self, kind: str, name: str):
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            self.observe(kind, name, time.perf_counter() - start, error)
+
+    def snapshot(self) -> Dict[Tuple[str, str], Histogram]:
+        with self._lock:
+            snap = {}
+            for key, h in self._histograms.items():
+                copy = Histogram()
+                copy.counts, copy.total, copy.count, copy.errors = list(h.counts), h.total, h.count, dict(h.errors)
+                snap[key] = copy
+            return snap
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        snap = self.snapshot()
+        lines = []
+        for kind, (metric, help_text) in METRIC_HELP.items():
+            series = sorted((name, h) for (k, name), h in snap.items() if k == kind)
+            if not series:
+                continue
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for name, h in series:
+                label = f'{kind}="{name}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float("inf"),), h.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f"{metric}_sum{{{label}}} {h.total:.9f}")
+                lines.append(f"{metric}_count{{{label}}} {h.count}")
+
+            errors_metric = metric.replace("_seconds", "_exceptions_total")
+            lines += [f"# HELP {errors_metric} Exceptions raised, by type.", f"# TYPE {errors_metric} counter"]
+            for name, h in series:
+                for error, count in sorted(h.errors.items()):
+                    lines.append(f'{errors_metric}{{{kind}="{name}",type="{error}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str, min_interval: float = 0.0) -> bool:
+        """Atomically write the exposition to `path` (node_exporter textfile style).
+
+        Skips the write if the last one was less than `min_interval` seconds
+        ago, or if another thread is writing right now; returns True when the
+        file was written.
+        """
+        if not self._write_lock.acquire(blocking=False):
+            return False
+        try:
+            now = time.monotonic()
+            if now - self._last_write < min_interval:
+                return False
+            self._last_write = now
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp, path)
+            return True
+        finally:
+            self._write_lock.release()
+
+
+registry = MetricsRegistry()
+
+
+def instrumented(name: str):
+    """Decorator recording each call of a core calculation under `name`."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with registry.timer("calc", name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,161 @@
+"""Medication name search over the formulary, including brand and synonym aliases.
+
+Names and aliases are normalized (lower case, punctuation folded to spaces)
+once when the index is built. Queries of three or more characters are
+answered from trigram postings; shorter ones scan the pre-normalized terms.
+"""
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+from core.metrics import instrumented
+
+OTHERS = "Others"
+
+# Rank tiers, best first.
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+MIN_FUZZY_SIMILARITY = 0.3
+
+_NON_ALNUM = re.compile(r"[^0-9a-z%.]+")
+
+
+class SearchHit(NamedTuple):
+    name: str
+    system: str
+    matched: str
+    score: float
+
+
+def normalize(text: str) -> str:
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def trigrams(term: str) -> set:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+class MedicationIndex:
+    """Search index over (system, name) entries and their aliases."""
+
+    def __init__(self, entries):
+        # entries: iterable of (system, name, aliases, route options)
+        self._entries = []
+        self._options = {}
+        self._by_system: Dict[str, List[int]] = defaultdict(list)
+        self._terms = []  # (normalized term, entry id, display text)
+        self._term_trigrams = []
+        self._postings = defaultdict(list)
+
+        for system, name, aliases, options in entries:
+            entry_id = len(self._entries)
+            self._entries.append((system, name))
+            self._options[(system, name)] = options
+            self._by_system[system].append(entry_id)
+            for text in [name, *aliases]:
+                term_id = len(self._terms)
+                term = normalize(text)
+                grams = trigrams(term)
+                self._terms.append((term, entry_id, text))
+                self._term_trigrams.append(len(grams))
+                for gram in grams:
+                    self._postings[gram].append(term_id)
+
+        self._entry_terms = defaultdict(list)
+        for term_id, (_, entry_id, _) in enumerate(self._terms):
+            self._entry_terms[entry_id].append(term_id)
+        for ids in self._by_system.values():
+            ids.sort(key=lambda i: self._entries[i][1])
+
+    @property
+    def systems(self) -> List[str]:
+        return list(self._by_system)
+
+    def options(self, system: str, name: str) -> list:
+        """Route options (formulary dicts) for one entry."""
+        return self._options[(system, name)]
+
+    def names(self, system: str) -> List[str]:
+        return [self._entries[i][1] for i in self._by_system.get(system, ())]
+
+    def filter(self, query: str, system: str) -> List[str]:
+        """Sorted names in `system` whose name or an alias contains `query`."""
+        q = normalize(query)
+        if not q:
+            return self.names(system)
+        return [
+            self._entries[i][1]
+            for i in self._by_system.get(system, ())
+            if any(q in self._terms[t][0] for t in self._entry_terms[i])
+        ]
+
+    def _rank(self, q: str, term: str) -> Optional[int]:
+        if term == q:
+            return EXACT
+        if term.startswith(q):
+            return PREFIX
+        if (" " + q) in term:
+            return WORD_PREFIX
+        if q in term:
+            return SUBSTRING
+        return None
+
+    @instrumented("search.search")
+    def search(self, query: str, limit: int = 20, system: Optional[str] = None) -> List[SearchHit]:
+        """Ranked hits across all systems (or one), best match per entry."""
+        q = normalize(query)
+        if not q:
+            return []
+
+        best = {}
+
+        def offer(term_id, score):
+            term, entry_id, text = self._terms[term_id]
+            entry_system, name = self._entries[entry_id]
+            if system is not None and entry_system != system:
+                return
+            if entry_id not in best or score < best[entry_id].score:
+                best[entry_id] = SearchHit(name, entry_system, text, score)
+
+        q_grams = trigrams(q)
+        if q_grams:
+            shared = Counter()
+            for gram in q_grams:
+                shared.update(self._postings.get(gram, ()))
+            for term_id, count in shared.items():
+                tier = self._rank(q, self._terms[term_id][0]) if count == len(q_grams) else None
+                if tier is not None:
+                    offer(term_id, tier)
+                    continue
+                similarity = count / (len(q_grams) + self._term_trigrams[term_id] - count)
+                if similarity >= MIN_FUZZY_SIMILARITY:
+                    offer(term_id, FUZZY + 1 - similarity)
+        else:
+            for term_id, (term, _, _) in enumerate(self._terms):
+                tier = self._rank(q, term)
+                if tier is not None:
+                    offer(term_id, tier)
+
+        hits = sorted(best.values(), key=lambda h: (h.score, h.name, h.system))
+        return hits[:limit]
+
+
+def build_index(antibiotics: dict, others: dict, antibiotic_aliases=None, others_aliases=None) -> MedicationIndex:
+    antibiotic_aliases = antibiotic_aliases or {}
+    others_aliases = others_aliases or {}
+    entries = [
+        (system, name, antibiotic_aliases.get(name, ()), options)
+        for system, drugs in antibiotics.items()
+        for name, options in drugs.items()
+    ]
+    entries += [(OTHERS, name, others_aliases.get(name, ()), options) for name, options in others.items()]
+    return MedicationIndex(entries)
+
+
+@lru_cache(maxsize=None)
+def medication_index() -> MedicationIndex:
+    """Process-wide index over data.antibiotics_data and data.others_data."""
+    from data.antibiotics_data import antibiotic_aliases, antibiotics_data
+    from data.others_data import others_aliases, others_data
+
+    return build_index(antibiotics_data, others_data, antibiotic_aliases, others_aliases)
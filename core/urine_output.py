@@ -0,0 +1,20 @@
+"""Urine output rate and age-specific adequacy."""
+from core.metrics import instrumented
+
+NEONATE = "Neonate (<28 days)"
+PEDIATRIC = "Pediatric (≥28 days)"
+
+# Lower limit of normal, ml/kg/hr (output must be strictly above it).
+NORMAL_THRESHOLD = {NEONATE: 0.5, PEDIATRIC: 1.0}
+
+
+@instrumented("urine_output.urine_output_rate")
+def urine_output_rate(weight: float, urine_24h: float) -> float:
+    """Urine output in ml/kg/hr from a 24-hour total."""
+    if weight <= 0 or urine_24h <= 0:
+        raise ValueError("weight and urine volume must be positive")
+    return urine_24h / weight / 24
+
+
+def is_normal_output(rate: float, age_group: str) -> bool:
+    return rate > NORMAL_THRESHOLD[age_group]
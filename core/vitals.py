@@ -0,0 +1,169 @@
+"""Pediatric vital-sign reference ranges and classification."""
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.metrics import instrumented
+
+Range = Tuple[float, float]
+
+# (age from, age to in years, HR range, RR range); lower bound inclusive.
+# Band edges must fall on whole months of age.
+VITAL_RANGES = [
+    (0, 0.25, (90, 180), (30, 60)),
+    (0.25, 0.5, (80, 160), (30, 60)),
+    (0.5, 1, (80, 140), (25, 45)),
+    (1, 6, (75, 130), (20, 30)),
+    (6, 10, (70, 110), (16, 24)),
+    (10, 15, (60, 100), (14, 20)),
+    (15, 200, (60, 100), (12, 20)),
+]
+
+SBP_UPPER = 120
+FEVER_THRESHOLD = 38.0
+
+LOW, NORMAL, HIGH = "low", "normal", "high"
+
+
+class ReferenceRanges(NamedTuple):
+    hr: Optional[Range]
+    rr: Optional[Range]
+    sbp: Range
+
+
+# ===============================
+# CLASSIFICATION CODES
+# ===============================
+NOT_SCORED = 0
+LOW_CODE = 1
+NORMAL_CODE = 2
+HIGH_CODE = 3
+
+# Code -> label, so LABELS[codes] maps a whole array.
+LABELS = ("", LOW, NORMAL, HIGH)
+
+# ===============================
+# MONTH-OF-AGE BUCKETS
+# ===============================
+# Float slack when turning years into whole months (e.g. 7 / 12 * 12).
+_MONTH_EPS = 1e-9
+
+
+def _compile(ranges):
+    """Band index per whole month of age (-1 past the table) and (n + 1, 2) HR/RR bounds.
+
+    The extra last row of bounds is NaN, so band -1 indexes "no range".
+    """
+    edges = []
+    for low, high, _, _ in ranges:
+        months = (low * 12, high * 12)
+        if any(abs(m - round(m)) > _MONTH_EPS for m in months):
+            raise ValueError(f"age band {low}-{high} years does not start and end on whole months")
+        edges.append(tuple(round(m) for m in months))
+
+    bands = np.full(max(high for _, high in edges), -1, dtype=np.intp)
+    for i, (low, high) in enumerate(edges):
+        bands[low:high] = i
+    hr = np.array([r[2] for r in ranges] + [(np.nan, np.nan)], dtype=float)
+    rr = np.array([r[3] for r in ranges] + [(np.nan, np.nan)], dtype=float)
+    return bands, hr, rr
+
+
+_MONTH_BANDS, _HR_BOUNDS, _RR_BOUNDS = _compile(VITAL_RANGES)
+# Plain list for the scalar path.
+_MONTH_BAND_LIST = _MONTH_BANDS.tolist()
+
+
+def _band(age_years: float) -> int:
+    months = age_years * 12 + _MONTH_EPS
+    if 0 <= months < len(_MONTH_BAND_LIST):  # False for NaN
+        return _MONTH_BAND_LIST[int(months)]
+    return -1
+
+
+def _bands(age_years) -> np.ndarray:
+    months = np.floor(np.asarray(age_years, dtype=float) * 12 + _MONTH_EPS)
+    inside = (months >= 0) & (months < len(_MONTH_BANDS))  # False for NaN
+    return np.where(inside, _MONTH_BANDS[np.where(inside, months, 0).astype(np.intp)], -1)
+
+
+# ===============================
+# SINGLE PATIENT
+# ===============================
+def sbp_range(age_years: float) -> Range:
+    """Systolic BP range; lower limit is 70 + 2 × age below 10 years."""
+    if age_years < 10:
+        return ((age_years * 2) + 70, SBP_UPPER)
+    return (90, SBP_UPPER)
+
+
+@instrumented("vitals.reference_ranges")
+def reference_ranges(age_years: float) -> ReferenceRanges:
+    band = _band(age_years)
+    if band < 0:
+        return ReferenceRanges(None, None, sbp_range(age_years))
+    _, _, hr_range, rr_range = VITAL_RANGES[band]
+    return ReferenceRanges(hr_range, rr_range, sbp_range(age_years))
+
+
+def fever_compensation(temp: Optional[float]) -> int:
+    """Expected HR rise (bpm) due to fever: 10 bpm per °C above 37."""
+    if not temp:
+        return 0
+    return int((temp - 37.0) * 10)
+
+
+def classify(value: float, value_range: Range) -> str:
+    if value < value_range[0]:
+        return LOW
+    if value > value_range[1]:
+        return HIGH
+    return NORMAL
+
+
+# ===============================
+# BULK SCORING
+# ===============================
+class VitalScores(NamedTuple):
+    """int8 classification codes per row, plus the fever-adjusted HR."""
+    hr: np.ndarray
+    rr: np.ndarray
+    sbp: np.ndarray
+    adjusted_hr: np.ndarray
+
+
+def _classify_codes(value: np.ndarray, low, high, entered: np.ndarray) -> np.ndarray:
+    # LOW_CODE, plus one for reaching the low limit, plus one for exceeding the high.
+    codes = LOW_CODE + (value >= low) + (value > high)
+    # As on the page, a missing or zero reading (or range) is not scored.
+    return np.where(entered & ~np.isnan(low), codes, NOT_SCORED).astype(np.int8)
+
+
+@instrumented("vitals.score_vitals")
+def score_vitals(age_years, hr, rr, sbp, temp=np.nan) -> VitalScores:
+    """Vectorized `classify` of HR, RR and SBP against the age reference ranges.
+
+    Inputs are equal-length arrays (or scalars that broadcast); NaN marks a
+    missing value. HR is reduced by `fever_compensation` when the
+    temperature is at least `FEVER_THRESHOLD`. Ages outside the table leave
+    HR and RR not scored; SBP is scored at any non-negative age.
+    """
+    age, hr, rr, sbp, temp = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (age_years, hr, rr, sbp, temp))
+    )
+
+    band = _bands(age)
+    hr_low, hr_high = np.moveaxis(_HR_BOUNDS[band], -1, 0)
+    rr_low, rr_high = np.moveaxis(_RR_BOUNDS[band], -1, 0)
+
+    fever = temp >= FEVER_THRESHOLD  # False for NaN
+    adjusted_hr = hr - np.where(fever, np.trunc((temp - 37.0) * 10), 0)
+
+    # min() gives 70 + 2 × age below 10 years and 90 from then on.
+    sbp_low = np.where(age >= 0, np.minimum(age * 2 + 70, 90), np.nan)
+    return VitalScores(
+        hr=_classify_codes(adjusted_hr, hr_low, hr_high, hr > 0),
+        rr=_classify_codes(rr, rr_low, rr_high, rr > 0),
+        sbp=_classify_codes(sbp, sbp_low, SBP_UPPER, sbp > 0),
+        adjusted_hr=adjusted_hr,
+    )
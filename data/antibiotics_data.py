@@ -389,4 +389,27 @@ antibiotics_data = {
             }
         ]
     }
-}
\ No newline at end of file
+}
+
+# Synonyms, INN spellings and brand names searched alongside the drug name.
+antibiotic_aliases = {
+    "Acyclovir": ["Aciclovir", "Zovirax"],
+    "Amoxicillin": ["Amoxycillin", "Amoxil"],
+    "Amoxicillin-Clavulanate (Augmentin)": ["Co-amoxiclav", "Amoxicillin/Clavulanate", "Augmentin"],
+    "Ampicillin": ["Penbritin"],
+    "Azithromycin": ["Zithromax"],
+    "Cefazolin": ["Cefazoline", "Ancef"],
+    "Ceftriaxone": ["Rocephin"],
+    "Cefuroxime": ["Zinacef", "Zinnat"],
+    "Cephalexin": ["Cefalexin", "Keflex"],
+    "Clarithromycin": ["Klacid"],
+    "Clindamycin": ["Dalacin"],
+    "Cloxacillin": ["Orbenin"],
+    "Doxycycline": ["Vibramycin"],
+    "Erythromycin": ["Erythrocin"],
+    "Gentamicin": ["Genta"],
+    "Levofloxacin": ["Tavanic", "Levaquin"],
+    "Metronidazole": ["Flagyl"],
+    "Oseltamivir": ["Tamiflu"],
+    "Vancomycin": ["Vanco", "Vancocin"],
+}
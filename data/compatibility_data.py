@@ -0,0 +1,35 @@
+# Y-site compatibility status codes.
+UNKNOWN = 0        # No information
+COMPATIBLE = 1
+CONDITIONAL = 2    # Compatible under the condition in compatibility_conditions
+INCOMPATIBLE = 3
+
+compatibility_drugs = [
+    "Acetaminophen (Paracetamol)",
+    "Acyclovir",
+    "Amikacin",
+    "Amoxicillin/Clavulanate (Co-amoxiclav)",
+    "Ampicillin",
+    "Ampicillin/Sulbactam (Unasyn)",
+]
+
+# Packed upper triangle of the symmetric matrix: for each drug, its status
+# with every drug listed after it, in compatibility_drugs order.
+compatibility_matrix = [
+    # Acetaminophen (Paracetamol) vs Acyclovir, Amikacin, Co-amoxiclav, Ampicillin, Unasyn
+    INCOMPATIBLE, UNKNOWN, UNKNOWN, UNKNOWN, INCOMPATIBLE,
+    # Acyclovir vs Amikacin, Co-amoxiclav, Ampicillin, Unasyn
+    COMPATIBLE, UNKNOWN, COMPATIBLE, INCOMPATIBLE,
+    # Amikacin vs Co-amoxiclav, Ampicillin, Unasyn
+    UNKNOWN, CONDITIONAL, CONDITIONAL,
+    # Co-amoxiclav vs Ampicillin, Unasyn
+    UNKNOWN, UNKNOWN,
+    # Ampicillin vs Unasyn
+    UNKNOWN,
+]
+
+# Conditions for CONDITIONAL pairs (either order).
+compatibility_conditions = {
+    ("Amikacin", "Ampicillin"): "Compatible if NaCl 0.9% used",
+    ("Amikacin", "Ampicillin/Sulbactam (Unasyn)"): "Compatible if NaCl 0.9% used",
+}
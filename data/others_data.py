@@ -80,4 +80,16 @@ others_data = {
             "notes": "0.03 mL/kg/dose, max 2 mL."
         }
     ]
-}
\ No newline at end of file
+}
+
+# Synonyms and brand names searched alongside the drug name.
+others_aliases = {
+    "Omeprazole": ["Losec"],
+    "Nifedipine": ["Adalat"],
+    "Aspirin (Antiplatelet)": ["Acetylsalicylic acid", "ASA"],
+    "Aspirin (Anti-inflammatory)": ["Acetylsalicylic acid", "ASA"],
+    "Sodium Valproate": ["Valproic acid", "Epilim"],
+    "Hydrocortisone": ["Solu-Cortef"],
+    "Salbutamol MDI": ["Albuterol", "Ventolin"],
+    "Salbutamol Nebuliser (0.5%)": ["Albuterol", "Ventolin"],
+}
@@ -1,12 +1,10 @@
 import streamlit as st
 
+from core.bmi import bmi
+
 def run_bmi_page():
     st.subheader("⚖️ BMI Calculator")
 
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
-
     # ALWAYS independent inputs (NO self-reference)
     height_bmi = st.number_input(
         "Height (cm):",
@@ -26,7 +24,6 @@ def run_bmi_page():
 
     if st.button("Calculate BMI"):
         if height_bmi > 0 and weight_bmi > 0:
-            bmi = weight_bmi / ((height_bmi / 100) ** 2)
-            st.success(f"BMI: {bmi:.1f}")
+            st.success(f"BMI: {bmi(height_bmi, weight_bmi):.1f}")
         else:
             st.warning("Please enter both height and weight.")
\ No newline at end of file
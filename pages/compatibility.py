@@ -1,76 +1,14 @@
+import pandas as pd
 import streamlit as st
 
-def run_compatibility_page():
-    st.subheader("💉 Pediatric Drug Compatibility")
+from core.compatibility import STATUS_LABELS, compatibility_matrix
+from core.memo import session_memo
+from data.compatibility_data import COMPATIBLE, CONDITIONAL, INCOMPATIBLE, UNKNOWN
 
-    # Back button
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
+STATUS_SYMBOLS = {COMPATIBLE: "✅", CONDITIONAL: "🟡", INCOMPATIBLE: "❌"}
 
-    # =========================
-    # DRUG LIST
-    # =========================
-    drugs = [
-        "Acetaminophen (Paracetamol)",
-        "Acyclovir",
-        "Amikacin",
-        "Amoxicillin/Clavulanate (Co-amoxiclav)",
-        "Ampicillin",
-        "Ampicillin/Sulbactam (Unasyn)"
-    ]
 
-    # =========================
-    # COMPATIBILITY DATA
-    # =========================
-    compatibility = {
-        "Acetaminophen (Paracetamol)": {
-            "Acyclovir": "Not compatible",
-            "Amikacin": "No information",
-            "Amoxicillin/Clavulanate (Co-amoxiclav)": "No information",
-            "Ampicillin": "No information",
-            "Ampicillin/Sulbactam (Unasyn)": "No information"
-        },
-        "Acyclovir": {
-            "Acetaminophen (Paracetamol)": "Not compatible",
-            "Amikacin": "Compatible",
-            "Amoxicillin/Clavulanate (Co-amoxiclav)": "No information",
-            "Ampicillin": "Compatible",
-            "Ampicillin/Sulbactam (Unasyn)": "Not compatible"
-        },
-        "Amikacin": {
-            "Acetaminophen (Paracetamol)": "No information",
-            "Acyclovir": "Compatible",
-            "Amoxicillin/Clavulanate (Co-amoxiclav)": "No information",
-            "Ampicillin": "Compatible if NaCl 0.9% used",
-            "Ampicillin/Sulbactam (Unasyn)": "Compatible if NaCl 0.9% used"
-        },
-        "Amoxicillin/Clavulanate (Co-amoxiclav)": {
-            "Acetaminophen (Paracetamol)": "No information",
-            "Acyclovir": "No information",
-            "Amikacin": "No information",
-            "Ampicillin": "No information",
-            "Ampicillin/Sulbactam (Unasyn)": "No information"
-        },
-        "Ampicillin": {
-            "Acetaminophen (Paracetamol)": "No information",
-            "Acyclovir": "Compatible",
-            "Amikacin": "Compatible if NaCl 0.9% used",
-            "Amoxicillin/Clavulanate (Co-amoxiclav)": "No information",
-            "Ampicillin/Sulbactam (Unasyn)": "No information"
-        },
-        "Ampicillin/Sulbactam (Unasyn)": {
-            "Acetaminophen (Paracetamol)": "Not compatible",
-            "Acyclovir": "Not compatible",
-            "Amikacin": "Compatible if NaCl 0.9% used",
-            "Amoxicillin/Clavulanate (Co-amoxiclav)": "No information",
-            "Ampicillin": "No information"
-        }
-    }
-
-    # =========================
-    # UI
-    # =========================
+def show_pair_check(matrix, drugs):
     drug1 = st.selectbox("Select Drug 1:", drugs, index=0)
     drug2 = st.selectbox("Select Drug 2:", drugs, index=1)
 
@@ -78,11 +16,90 @@ def run_compatibility_page():
         if drug1 == drug2:
             st.info("Same drug — generally compatible")
         else:
-            result = compatibility.get(drug1, {}).get(drug2, "No information")
+            status, result = matrix.describe(drug1, drug2)
 
-            if "Not compatible" in result:
+            if status == INCOMPATIBLE:
                 st.error(f"⚠️ {result}")
-            elif "Compatible" in result:
+            elif status in (COMPATIBLE, CONDITIONAL):
                 st.success(f"✅ {result}")
             else:
-                st.warning(f"ℹ️ {result}")
\ No newline at end of file
+                st.warning(f"ℹ️ {result}")
+
+
+def show_multi_check(matrix, drugs):
+    selected = st.multiselect("Concurrent infusions:", drugs, key="compat_multi")
+    unknown_is_incompatible = st.checkbox(
+        "Treat 'No information' pairs as incompatible",
+        value=True,
+        key="compat_unknown_incompatible"
+    )
+
+    if len(selected) < 2:
+        st.info("Select at least two drugs.")
+        return
+
+    analysis = session_memo(st.session_state).call(
+        matrix.analyse, selected, unknown_is_incompatible,
+        key=(tuple(selected), unknown_is_incompatible)
+    )
+
+    # Pairwise grid
+    grid = pd.DataFrame(
+        [[STATUS_SYMBOLS.get(int(s), "ℹ️") for s in row] for row in analysis.statuses],
+        index=analysis.drugs,
+        columns=analysis.drugs,
+    )
+    st.markdown("**Pairwise Y-site compatibility** (✅ compatible · 🟡 conditional · ❌ not compatible · ℹ️ no information)")
+    st.dataframe(grid)
+
+    # Pairs needing attention
+    notes = []
+    for i, a in enumerate(analysis.drugs):
+        for b in analysis.drugs[i + 1:]:
+            status, text = matrix.describe(a, b)
+            if status != COMPATIBLE:
+                notes.append((status, f"{a} + {b}: {text}"))
+    for status, text in sorted(notes, key=lambda n: -n[0]):
+        if status == INCOMPATIBLE:
+            st.error(f"⚠️ {text}")
+        elif status == CONDITIONAL:
+            st.warning(f"🟡 {text}")
+        else:
+            st.caption(f"ℹ️ {text}")
+
+    if analysis.incompatible_groups:
+        st.markdown("**Groups that must be fully separated** (each drug in a group needs its own lumen):")
+        for group in analysis.incompatible_groups:
+            st.write("• " + " / ".join(group))
+
+    # Lumen plan
+    st.markdown(f"### 🧪 Suggested lumens: {len(analysis.lumens)}")
+    for n, lumen in enumerate(analysis.lumens, start=1):
+        st.success(f"Lumen {n}: " + ", ".join(lumen))
+    if unknown_is_incompatible:
+        st.caption(f"Pairs marked '{STATUS_LABELS[UNKNOWN]}' were kept in separate lumens.")
+
+
+def run_compatibility_page():
+    st.subheader("💉 Pediatric Drug Compatibility")
+
+    # =========================
+    # COMPATIBILITY DATA
+    # =========================
+    matrix = compatibility_matrix()
+    drugs = matrix.drugs
+
+    # =========================
+    # UI
+    # =========================
+    mode = st.radio(
+        "Check:",
+        ["Two drugs", "Multiple infusions (Y-site)"],
+        horizontal=True,
+        key="compat_mode"
+    )
+
+    if mode == "Two drugs":
+        show_pair_check(matrix, drugs)
+    else:
+        show_multi_check(matrix, drugs)
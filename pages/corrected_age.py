@@ -1,14 +1,103 @@
+import csv
+import io
+import re
+
+import numpy as np
 import streamlit as st
 from datetime import datetime
 
-def run_corrected_age_page():
-    st.subheader("🍼 Corrected Age / Post Menstrual Age")
+from core.corrected_age import MILESTONE_NAMES, cohort_ages, preterm_age, weeks_days
+
+COHORT_EXAMPLE = "id,dob,ga_weeks,ga_days\nA1023,2026-01-14,27,3\nA1187,2025-11-02,31,0\nB0412,2025-06-20,25,6"
+COHORT_COLUMNS = {"id": "Infant", "dob": "Date of birth", "ga_weeks": "GA weeks", "ga_days": "GA days"}
+# Normalised header -> column; the first header matching a column is used.
+COHORT_ALIASES = {
+    "id": ("id", "mrn", "name", "infant", "infant_id", "patient", "patient_id"),
+    "dob": ("dob", "date_of_birth", "birth_date", "birthdate"),
+    "ga_weeks": ("ga_weeks", "ga_wk", "ga_wks", "gestation_weeks", "gestational_age_weeks"),
+    "ga_days": ("ga_days", "ga_d", "gestation_days", "gestational_age_days"),
+    "ga": ("ga", "gestation", "gestational_age"),
+}
+
+
+def read_cohort(source):
+    """Cohort DataFrame with id, dob, ga_weeks and ga_days columns from CSV/TSV text or a file.
+
+    Gestation may instead be given as a single "ga" column such as "27+3".
+    """
+    import pandas as pd  # deferred: single-infant mode should not pay for it
+
+    text = source if isinstance(source, str) else source.getvalue().decode("utf-8-sig")
+    try:
+        sep = csv.Sniffer().sniff(text.split("\n", 1)[0], delimiters=",\t;").delimiter
+    except csv.Error:
+        sep = ","
+    df = pd.read_csv(io.StringIO(text), sep=sep, dtype=str)
+    # Accept headers such as "Date of birth", "GA (weeks)" or "MRN".
+    headers = [re.sub(r"[^a-z0-9]+", "_", str(c).lower()).strip("_") for c in df.columns]
+    picked = {}
+    for i, col in enumerate(headers):
+        for name, aliases in COHORT_ALIASES.items():
+            if col in aliases and name not in picked:
+                picked[name] = i
+    df = pd.DataFrame({name: df.iloc[:, i] for name, i in picked.items()})
+    if "dob" not in df:
+        raise ValueError("no date of birth column")
+    if "ga_weeks" not in df:
+        if "ga" not in df:
+            raise ValueError("no gestational age column")
+        split = df["ga"].str.split("+", n=1, expand=True).reindex(columns=[0, 1])
+        df["ga_weeks"], df["ga_days"] = split[0], split[1].fillna("0")
+    if "ga_days" not in df:
+        df["ga_days"] = "0"
+    if "id" not in df:
+        df["id"] = range(1, len(df) + 1)
+    return df[list(COHORT_COLUMNS)]
+
 
-    # Back button
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun() 
- 
+def _weeks_days_text(days):
+    """Weeks+days text ("4+2") for an array of day counts, blank for NaN.
+
+    Formatted once per distinct count rather than per row.
+    """
+    days = np.asarray(days, dtype=float)
+    valid = ~np.isnan(days)
+    counts, index = np.unique(days[valid].astype(np.int64), return_inverse=True)
+    out = np.full(days.shape, "", dtype=object)
+    out[valid] = np.array([f"{d // 7}+{d % 7}" for d in counts.tolist()], dtype=object)[index]
+    return out
+
+
+def cohort_table(df, clinic_date, window_days):
+    """Ages for every cohort row on `clinic_date`, with milestones due in the window."""
+    import pandas as pd
+
+    text = df["dob"].str.strip()
+    # ISO dates first, then local day-first entry (14/01/2026).
+    dob = pd.to_datetime(text, errors="coerce", format="ISO8601")
+    if dob.isna().any():
+        dob = dob.fillna(pd.to_datetime(text[dob.isna()], errors="coerce", dayfirst=True, format="mixed"))
+    weeks = pd.to_numeric(df["ga_weeks"], errors="coerce").to_numpy(float)
+    # Only a blank GA days cell means +0; anything unparseable invalidates the row.
+    days = pd.to_numeric(df["ga_days"].fillna("").str.strip().replace("", "0"), errors="coerce").to_numpy(float)
+    dob = dob.to_numpy("datetime64[D]")
+    ages = cohort_ages(dob, weeks, days, clinic_date, window_days)
+
+    names = np.array(MILESTONE_NAMES + ("",), dtype=object)  # -1 (none) -> ""
+    out = df.rename(columns=COHORT_COLUMNS)
+    out["Date of birth"] = dob
+    out["Chronological age (wk+d)"] = _weeks_days_text(ages.chronological_days)
+    out["Corrected age (wk+d)"] = _weeks_days_text(ages.corrected_days)
+    out["PMA (wk+d)"] = _weeks_days_text(ages.pma_days)
+    out["Milestone due"] = names[ages.milestone]
+    out["Milestone date"] = ages.milestone_date
+    out["Check"] = pd.Series(ages.chronological_days).isna().map(
+        {True: "Check date of birth / gestation", False: ""}
+    ).to_numpy()
+    return out
+
+
+def show_single_infant():
   # Date of birth (preterm)
     dob_preterm = st.date_input("Date of Birth (Preterm)", key="dob_preterm")
 
@@ -30,36 +119,78 @@ def run_corrected_age_page():
     current_date = st.date_input("Current Date", value=datetime.today(), key="current_date")
 
     # Validate dates
-    chronological_age_days = (current_date - dob_preterm).days
-    if chronological_age_days < 0:
+    try:
+        age = preterm_age(dob_preterm, gestational_age_weeks, gestational_age_days, current_date)
+    except ValueError:
         st.error("⚠️ Current date is before the date of birth. Please check your inputs.")
     else:
         # Chronological age
-        chronological_weeks = chronological_age_days // 7
-        chronological_days = chronological_age_days % 7
+        chronological_weeks, chronological_days = weeks_days(age.chronological_days)
         st.write(f"📅 Chronological Age: **{chronological_weeks} weeks + {chronological_days} days**")
 
-        # GA total days
-        gestational_age_total_days = gestational_age_weeks * 7 + gestational_age_days
-
-        # Correction for prematurity
-        full_term_days = 40 * 7
-        correction_days = full_term_days - gestational_age_total_days
-        corrected_age_days = chronological_age_days - correction_days
-
-        if corrected_age_days >= 0:
-            corrected_weeks = corrected_age_days // 7
-            corrected_days = corrected_age_days % 7
+        if age.corrected_days is not None:
+            corrected_weeks, corrected_days = weeks_days(age.corrected_days)
             st.success(
                 f"✅ Corrected Age: **{corrected_weeks} weeks + {corrected_days} days**\n\n"
                 "Corrected age is used for growth and developmental assessment in preterm infants."
             )
         else:
-            pma_total_days = gestational_age_total_days + chronological_age_days
-            pma_weeks = pma_total_days // 7
-            pma_days = pma_total_days % 7
+            pma_weeks, pma_days = weeks_days(age.pma_days)
             st.info(
                 f"ℹ️ Post-Menstrual Age (PMA): **{pma_weeks} weeks + {pma_days} days**\n\n"
                 "PMA = gestational age at birth + chronological age."
             )
 
+
+def show_cohort():
+    import pandas as pd
+
+    st.caption(
+        "Columns: id, date of birth, GA weeks and GA days (or GA as 27+3). "
+        "Paste from a spreadsheet or upload a CSV."
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        clinic_date = st.date_input("Clinic Date", value=datetime.today(), key="ca_clinic_date")
+    with col2:
+        window_weeks = st.number_input(
+            "Flag milestones within (weeks)", min_value=1, max_value=26, value=4, step=1, key="ca_window_weeks"
+        )
+    upload = st.file_uploader("Upload cohort (CSV)", type=["csv", "tsv", "txt"], key="ca_cohort_file")
+    pasted = st.text_area("…or paste the cohort here:", key="ca_cohort_text", placeholder=COHORT_EXAMPLE, height=160)
+
+    source = upload if upload is not None else pasted.strip()
+    if not source:
+        return
+
+    try:
+        table = cohort_table(read_cohort(source), clinic_date, int(window_weeks) * 7)
+    except (ValueError, pd.errors.ParserError) as e:
+        st.warning(f"Could not read the cohort: {e}.")
+        return
+
+    due = int((table["Milestone due"] != "").sum())
+    flagged = int((table["Check"] != "").sum())
+    st.dataframe(table, hide_index=True)
+    st.caption(
+        f"{len(table)} infants · {due} reach a milestone within {int(window_weeks)} week(s)"
+        + (f" · {flagged} row(s) need checking" if flagged else "")
+    )
+    st.download_button(
+        "Download ages table (CSV)",
+        table.to_csv(index=False),
+        file_name=f"corrected_age_{clinic_date.isoformat()}.csv",
+        mime="text/csv",
+        key="ca_cohort_download"
+    )
+
+
+def run_corrected_age_page():
+    st.subheader("🍼 Corrected Age / Post Menstrual Age")
+
+    mode = st.radio("Mode:", ["Single infant", "Clinic cohort"], horizontal=True, key="ca_mode")
+
+    if mode == "Single infant":
+        show_single_infant()
+    else:
+        show_cohort()
@@ -1,85 +1,125 @@
+import pandas as pd
 import streamlit as st
 from data.antibiotics_data import antibiotics_data
-from data.others_data import others_data
+
+from core.dosage import check_dose, dispensing_volume
+from core.formulary import formulary
+from core.frequency import COMMON_FREQUENCIES, doses_per_day, is_once_only
+from core.memo import session_memo
+from core.search import OTHERS, medication_index
+
+
+def formulary_ranges_table(weight, doses_per_day):
+    table = formulary()
+    ranges = table.dose_ranges(weight, doses_per_day)
+    return pd.DataFrame({
+        "System": [table.systems[i] for i in table.system_id],
+        "Medication": [table.drugs[i] for i in table.drug_id],
+        "Route": [table.routes[i] for i in table.route_id],
+        "Unit": [table.units[i] for i in table.unit_id],
+        "Usual low (/kg/day)": table.usual_low,
+        "Usual high (/kg/day)": table.usual_high,
+        "Dose low": ranges["capped_low"],
+        "Dose high": ranges["capped_high"],
+        "Cap per dose": ranges["cap"],
+        "Cap binds": ranges["cap_binds"],
+    })
+
+
+def show_formulary_ranges(weight):
+    if not st.toggle("Show recommended dose range for every medication at this weight", key="dose_all_ranges"):
+        return
+
+    # A once-only dose has no per-dose share of a mg/kg/day range.
+    regular = [f for f in COMMON_FREQUENCIES if not is_once_only(f)]
+    freq_label = st.selectbox("Frequency", regular, key="dose_all_ranges_freq")
+    df = session_memo(st.session_state).call(formulary_ranges_table, weight, doses_per_day(freq_label))
+    st.caption(
+        f"Per-dose range for {weight:g} kg {freq_label}, clamped to max per dose and max daily dose. "
+        "Sort by clicking a column header."
+    )
+    st.dataframe(
+        df,
+        hide_index=True,
+        column_config={
+            "Dose low": st.column_config.NumberColumn(format="%.1f"),
+            "Dose high": st.column_config.NumberColumn(format="%.1f"),
+            "Cap per dose": st.column_config.NumberColumn(format="%.1f"),
+        },
+    )
+
 
 def run_dosage_page():
 
     st.subheader("💊 Dosage Verification / Dispensing Calculator")
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
-
     # ------------------------------
     # Inputs
     # ------------------------------
     weight = st.number_input("Patient weight (kg)", min_value=0.1, step=0.1)
 
-    med_group = st.radio(
-        "Medication group",
-        ["Antibiotics", "Others"],
-        horizontal=True
-    )
-
-    med_info = None
-
-    # ---------------- ANTIBIOTICS ----------------
-    if med_group == "Antibiotics":
-        system = st.radio("Diagnosis by system", list(antibiotics_data.keys()), horizontal=True)
+    show_formulary_ranges(weight)
 
-        med_search = st.text_input("Search antibiotic").strip()
+    index = medication_index()
 
-        available_meds = sorted(antibiotics_data.get(system, {}).keys())
+    search_all = st.toggle("Search across all systems", key="dose_search_all")
 
-        filtered_meds = [
-            m for m in available_meds
-            if med_search.lower() in m.lower()
-        ] if med_search else available_meds
+    # ---------------- ALL SYSTEMS ----------------
+    if search_all:
+        med_search = st.text_input("Search medication (name, synonym or brand)").strip()
 
-        if not filtered_meds:
-            st.warning("No antibiotic found.")
+        if not med_search:
+            st.info("Type a medication name to search.")
             st.stop()
 
-        med = st.selectbox("Medication", filtered_meds)
-        med_options = antibiotics_data[system][med]
+        hits = index.search(med_search)
 
-        if len(med_options) == 1:
-            selected_option = med_options[0]
-        else:
-            option_labels = [opt["route"] for opt in med_options]
-            selected_label = st.radio("Choose route", option_labels, horizontal=True)
-            selected_option = med_options[option_labels.index(selected_label)]
+        if not hits:
+            st.warning("No medication found.")
+            st.stop()
 
-        med_info = selected_option
+        hit = st.selectbox(
+            "Medication",
+            hits,
+            format_func=lambda h: f"{h.name} — {h.system}" + (f" ({h.matched})" if h.matched != h.name else "")
+        )
+        med_options = index.options(hit.system, hit.name)
 
-    # ---------------- OTHERS ----------------
     else:
-        med_search = st.text_input("Search medication").strip()
-
-        available_meds = sorted(others_data.keys())
+        med_group = st.radio(
+            "Medication group",
+            ["Antibiotics", "Others"],
+            horizontal=True
+        )
+
+        # ---------------- ANTIBIOTICS ----------------
+        if med_group == "Antibiotics":
+            system = st.radio("Diagnosis by system", list(antibiotics_data.keys()), horizontal=True)
+            med_search = st.text_input("Search antibiotic").strip()
+            not_found = "No antibiotic found."
+
+        # ---------------- OTHERS ----------------
+        else:
+            system = OTHERS
+            med_search = st.text_input("Search medication").strip()
+            not_found = "No medication found."
 
-        filtered_meds = [
-            m for m in available_meds
-            if med_search.lower() in m.lower()
-        ] if med_search else available_meds
+        filtered_meds = index.filter(med_search, system)
 
         if not filtered_meds:
-            st.warning("No medication found.")
+            st.warning(not_found)
             st.stop()
 
         med = st.selectbox("Medication", filtered_meds)
-        med_options = others_data[med]
-
-        if len(med_options) == 1:
-            selected_option = med_options[0]
-        else:
-            option_labels = [opt["route"] for opt in med_options]
-            selected_label = st.radio("Choose route", option_labels, horizontal=True)
-            selected_option = med_options[option_labels.index(selected_label)]
+        med_options = index.options(system, med)
 
-        med_info = selected_option
+    if len(med_options) == 1:
+        selected_option = med_options[0]
+    else:
+        option_labels = [opt["route"] for opt in med_options]
+        selected_label = st.radio("Choose route", option_labels, horizontal=True)
+        selected_option = med_options[option_labels.index(selected_label)]
 
-    if med_info is None:
-        st.stop()
+    med_info = selected_option
 
     st.markdown(f"**Route:** {med_info['route']}")
     st.markdown(f"**Unit:** {med_info['unit']}")
@@ -93,8 +133,9 @@ def run_dosage_page():
         step=0.1
     )
 
-    freq_map = {"Q24H":1, "Q12H":2, "Q8H":3, "Q6H":4}
-    freq = freq_map[st.selectbox("Frequency", list(freq_map.keys()))]
+    freq_label = st.selectbox("Frequency", COMMON_FREQUENCIES)
+    freq = doses_per_day(freq_label)
+    once = is_once_only(freq_label)
 
     # ------------------------------
     # MAIN BUTTON
@@ -103,41 +144,33 @@ def run_dosage_page():
 
         st.markdown("### ⚖️ Recommended vs Ordered Dose")
 
-        key = "usual"
-        daily = dose * freq
+        # Formulary entries are module-level dicts, so their id is stable.
+        result = session_memo(st.session_state).call(
+            check_dose, med_info, weight, dose, freq, once,
+            key=(id(med_info), weight, dose, freq, once)
+        )
 
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("#### 📘 Recommended")
 
-            if key in med_info:
-                low, high = med_info[key]
+            if result.usual:
+                low, high = result.usual
                 st.write(f"{low}–{high} mg/kg/day")
-                st.write(f"{(low*weight/freq):.1f}–{(high*weight/freq):.1f} mg/dose")
+                if result.per_dose:
+                    dose_low, dose_high = result.per_dose
+                    st.write(f"{dose_low:.1f}–{dose_high:.1f} mg/dose")
+                else:
+                    st.caption("Once-only dose: checked against the max per dose, not the daily range.")
 
         with col2:
             st.markdown("#### 📊 Ordered")
-            st.write(f"{(daily/weight):.2f} mg/kg/day")
+            st.write(f"{result.mg_kg_day:.2f} mg/kg" + ("" if once else "/day"))
             st.write(f"{dose:.1f} mg/dose")
 
         # ---------------- Safety ----------------
-        warnings = []
-
-        if key in med_info:
-            low, high = med_info[key]
-            if daily/weight < low:
-                warnings.append("Below recommended range")
-            if daily/weight > high:
-                warnings.append("Above recommended range")
-
-        if "max_day" in med_info and daily > med_info["max_day"]:
-            warnings.append("Exceeds max daily dose")
-
-        if "max_dose" in med_info and dose > med_info["max_dose"]:
-            warnings.append("Exceeds max per dose")
-
-        for w in warnings:
+        for w in result.warnings:
             st.warning(w)
 
     # ------------------------------
@@ -160,14 +193,13 @@ def run_dosage_page():
     if st.button("Calculate Volume", key="calc_dispense"):
 
         try:
-            ordered_val = float(ordered_dose_dispense)
-            med_amount_val = float(med_amount)
-            med_volume_val = float(med_volume)
-
-            conc = med_amount_val / med_volume_val
-            volume = ordered_val / conc
+            volume = dispensing_volume(
+                float(ordered_dose_dispense),
+                float(med_amount),
+                float(med_volume)
+            )
 
             st.success(f"➡️ Dispense: {volume:.2f} ml")
 
-        except:
+        except ValueError:
             st.warning("Invalid input")
@@ -1,12 +1,74 @@
+import csv
+import io
+import re
+
 import streamlit as st
 
-def run_fluids_page():
-    st.subheader("🧒 Pediatric Fluids Requirement")
+from core.fluids import fluid_requirement, fluid_requirements
+from core.memo import session_memo
+
+REHYDRATION_OPTIONS = {
+    "Maintenance Only": 0,
+    "Maintenance + 3% Rehydration": 3,
+    "Maintenance + 5% Rehydration": 5,
+}
+
+CENSUS_EXAMPLE = "bed,weight,rehydration\n12A,8.4,0\n12B,15.2,5\n14,23,3"
+CENSUS_COLUMNS = {"bed": "Bed", "weight": "Weight (kg)", "rehydration": "Rehydration %"}
+# Normalised header (lower case, runs of other characters as "_") -> column.
+CENSUS_ALIASES = {
+    "bed": ("bed", "bed_no", "bed_number", "location", "patient", "mrn", "id"),
+    "weight": ("weight", "weight_kg", "wt", "wt_kg", "kg"),
+    "rehydration": ("rehydration", "rehydration_percent", "dehydration", "dehydration_percent"),
+}
+
 
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
+def read_census(source):
+    """Census DataFrame with bed, weight and rehydration columns from CSV/TSV text or a file."""
+    import pandas as pd  # deferred: single-patient mode should not pay for it
 
+    text = source if isinstance(source, str) else source.getvalue().decode("utf-8-sig")
+    try:
+        sep = csv.Sniffer().sniff(text.split("\n", 1)[0], delimiters=",\t;").delimiter
+    except csv.Error:
+        sep = ","  # single column
+    df = pd.read_csv(io.StringIO(text), sep=sep, dtype={0: str})
+    # Accept headers such as "Weight (kg)" or "Rehydration %".
+    headers = [re.sub(r"[^a-z0-9]+", "_", str(c).lower()).strip("_") for c in df.columns]
+    picked = {}
+    for i, col in enumerate(headers):
+        for name, aliases in CENSUS_ALIASES.items():
+            if col in aliases and name not in picked:
+                picked[name] = i
+    df = pd.DataFrame({name: df.iloc[:, i] for name, i in picked.items()})
+    if "weight" not in df:
+        raise ValueError("no weight column")
+    if "bed" not in df:
+        df["bed"] = range(1, len(df) + 1)
+    if "rehydration" not in df:
+        df["rehydration"] = 0
+    return df[list(CENSUS_COLUMNS)]
+
+
+def census_table(df):
+    """Fluids for every census row; rows that cannot be calculated are flagged."""
+    import pandas as pd
+
+    weight = pd.to_numeric(df["weight"], errors="coerce").to_numpy(float)
+    # Only a blank cell means maintenance only; "five" or "5 percent" is flagged.
+    percent = df["rehydration"].astype("string").str.strip().str.rstrip("%").str.strip()
+    percent = pd.to_numeric(percent.fillna("").replace("", "0"), errors="coerce").to_numpy(float)
+    result = fluid_requirements(weight, percent)
+    out = df.rename(columns=CENSUS_COLUMNS)
+    out["Maintenance (ml/day)"] = result.maintenance.round()
+    out["Deficit (ml/day)"] = result.rehydration.round()
+    out["Total (ml/day)"] = result.total.round()
+    out["Rate (ml/hr)"] = result.ml_per_hr.round(1)
+    out["Check"] = pd.Series(result.total).isna().map({True: "Check weight / rehydration %", False: ""}).to_numpy()
+    return out
+
+
+def show_single_patient():
     weight_fluid = st.text_input(
         "Enter child's weight (kg):",
         key="fluids_weight",
@@ -15,35 +77,60 @@ def run_fluids_page():
 
     option = st.radio(
         "Include Rehydration?",
-        ["Maintenance Only", "Maintenance + 3% Rehydration", "Maintenance + 5% Rehydration"],
+        list(REHYDRATION_OPTIONS),
         index=0,
         key="rehydration_option"
     )
 
     if st.button("Calculate Fluids Requirement", key="calc_fluids"):
         try:
-            weight_val = float(weight_fluid)
+            result = session_memo(st.session_state).call(
+                fluid_requirement, float(weight_fluid), REHYDRATION_OPTIONS[option]
+            )
+            st.success(f"{result.total:.0f} ml/day | {result.ml_per_hr:.0f} ml/hr")
 
-            def calculate_fluids(weight):
-                if weight <= 10:
-                    return weight * 100
-                elif weight <= 20:
-                    return 1000 + (weight - 10) * 50
-                else:
-                    return 1500 + (weight - 20) * 20
+        except ValueError:
+            st.warning("Enter valid weight.")
 
-            maintenance = calculate_fluids(weight_val)
-            rehydration_3 = weight_val * 30
-            rehydration_5 = weight_val * 50
 
-            if option == "Maintenance Only":
-                total = maintenance
-            elif option == "Maintenance + 3% Rehydration":
-                total = maintenance + rehydration_3
-            else:
-                total = maintenance + rehydration_5
+def show_census():
+    import pandas as pd
 
-            st.success(f"{total:.0f} ml/day | {total/24:.0f} ml/hr")
+    st.caption("Columns: bed, weight (kg), rehydration (0, 3 or 5 %). Paste from a spreadsheet or upload a CSV.")
+    upload = st.file_uploader("Upload census (CSV)", type=["csv", "tsv", "txt"], key="fluids_census_file")
+    pasted = st.text_area("…or paste the census here:", key="fluids_census_text", placeholder=CENSUS_EXAMPLE, height=160)
 
-        except ValueError:
-            st.warning("Enter valid weight.")
\ No newline at end of file
+    source = upload if upload is not None else pasted.strip()
+    if not source:
+        return
+
+    try:
+        table = census_table(read_census(source))
+    except (ValueError, pd.errors.ParserError) as e:
+        st.warning(f"Could not read the census: {e}.")
+        return
+
+    flagged = int((table["Check"] != "").sum())
+    st.dataframe(table, hide_index=True)
+    st.caption(
+        f"{len(table)} patients · {table['Total (ml/day)'].sum():,.0f} ml/day in total"
+        + (f" · {flagged} row(s) need checking" if flagged else "")
+    )
+    st.download_button(
+        "Download fluids table (CSV)",
+        table.to_csv(index=False),
+        file_name="fluids_census.csv",
+        mime="text/csv",
+        key="fluids_census_download"
+    )
+
+
+def run_fluids_page():
+    st.subheader("🧒 Pediatric Fluids Requirement")
+
+    mode = st.radio("Mode:", ["Single patient", "Ward census"], horizontal=True, key="fluids_mode")
+
+    if mode == "Single patient":
+        show_single_patient()
+    else:
+        show_census()
@@ -1,20 +1,111 @@
-import streamlit as st
 from datetime import datetime
-import pytz
+
+import streamlit as st
+
+from core.bilirubin import (
+    RAPID_RISE_CRITERION, RAPID_RISE_PER_DAY, SB, TCB, Trajectory, session_trajectories, threshold_curves
+)
+from core.hospital_time import hours_of_life as hours_since_birth
+from core.jaundice import (
+    HIGH_RISK, NORMAL_RISK, TCB_MESSAGES, evaluate_jaundice, jaundice_key, tcb_key, tcb_to_sb_needed
+)
+from core.memo import session_memo
+
+RISK_FACTORS_KEY = "jaundice_risk_factors"
+
+
+@st.cache_resource(show_spinner=False)
+def threshold_layer(risk):
+    """Phototherapy / exchange step curves for one risk group, built once per process."""
+    import altair as alt  # deferred: only needed once readings are charted
+    import pandas as pd
+
+    rows = [
+        {"Hours of life": h, "µmol/L": v, "Threshold": name}
+        for name, hours, values in threshold_curves(risk)
+        for h, v in zip(hours, values)
+    ]
+    return alt.Chart(pd.DataFrame(rows)).mark_line(interpolate="step-after", strokeDash=[6, 3]).encode(
+        x="Hours of life:Q",
+        y="µmol/L:Q",
+        color=alt.Color("Threshold:N", scale=alt.Scale(range=["goldenrod", "red"])),
+    )
+
+
+def show_serial_readings(dob, birth_time):
+    """Record serial TcB/SB readings for one infant; returns its Trajectory or None."""
+    with st.expander("📈 Serial readings and rate of rise"):
+        infant = st.text_input("Infant identifier (MRN or bed):", key="bili_infant").strip()
+        if not infant:
+            st.caption("Enter an identifier to record serial TcB/SB readings for this infant.")
+            return None
+        trajectory = session_trajectories(st.session_state).setdefault(infant, Trajectory())
+
+        with st.form("bili_reading", clear_on_submit=True):
+            c1, c2, c3, c4 = st.columns(4)
+            sample_date = c1.date_input("Sample date", key="bili_date")
+            sample_time = c2.time_input("Sample time", key="bili_time")
+            kind = c3.radio("Type", [SB, TCB], horizontal=True, key="bili_kind")
+            value = c4.number_input("Level (µmol/L)", min_value=0, key="bili_value")
+            submitted = st.form_submit_button("Add reading")
+
+        if submitted:
+            try:
+                was_rapid = trajectory.rapid_rise
+                hours = hours_since_birth(dob, birth_time, datetime.combine(sample_date, sample_time))
+                trajectory.add(hours, value, kind)
+                # Tick the high-risk criterion once, when the rise first crosses
+                # the limit; the nurse can still untick it afterwards.
+                if trajectory.rapid_rise and not was_rapid:
+                    risk_factors = st.session_state.get(RISK_FACTORS_KEY, [])
+                    if RAPID_RISE_CRITERION not in risk_factors:
+                        st.session_state[RISK_FACTORS_KEY] = risk_factors + [RAPID_RISE_CRITERION]
+            except ValueError as e:
+                st.warning(f"Reading not added: {e}.")
+
+        if trajectory.readings:
+            st.dataframe(
+                [
+                    {
+                        "Hours of life": round(r.hours, 1),
+                        "Type": r.kind,
+                        "µmol/L": r.value,
+                        "Rise (µmol/L/day)": None if r.rate is None else round(r.rate),
+                    }
+                    for r in trajectory.readings
+                ],
+                hide_index=True,
+            )
+        if trajectory.rapid_rise:
+            st.error(
+                f"⚠️ Serum bilirubin rising faster than {RAPID_RISE_PER_DAY} µmol/L per day "
+                f"(peak {trajectory.max_rate[SB]:.0f}) — high-risk criterion applies."
+            )
+        return trajectory
+
+
+def show_trajectory_chart(trajectory, risk):
+    import altair as alt
+    import pandas as pd
+
+    hours, values, kinds = trajectory.arrays()
+    readings = alt.Chart(
+        pd.DataFrame({"Hours of life": hours, "µmol/L": values, "Type": kinds})
+    ).mark_line(point=True).encode(
+        x="Hours of life:Q",
+        y="µmol/L:Q",
+        detail="Type:N",
+        shape="Type:N",
+        tooltip=["Hours of life", "Type", "µmol/L"],
+    )
+    st.markdown(f"**Readings against {risk} thresholds**")
+    st.altair_chart(threshold_layer(risk) + readings)
+
 
 def run_neonatal_jaundice_page():
 
     st.subheader("🌞 Neonatal Jaundice")
 
-    # Back button
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
-    # ===============================
-    # TIMEZONE CONFIGURATION
-    # ===============================
-    HOSPITAL_TZ = pytz.timezone("Asia/Singapore")
-
     # --- Patient birth info ---
     dob = st.date_input("Date of Birth")
     birth_time = st.time_input("Time of Birth (24-hour format)")
@@ -22,14 +113,13 @@ def run_neonatal_jaundice_page():
     # --- Calculate hours of life ---
     hours_of_life = None
     try:
-        birth_naive = datetime.combine(dob, birth_time)
-        birth_datetime = HOSPITAL_TZ.localize(birth_naive)
-        current_datetime = datetime.now(HOSPITAL_TZ)
-        hours_of_life = (current_datetime - birth_datetime).total_seconds() / 3600
+        hours_of_life = hours_since_birth(dob, birth_time)
         st.success(f"✅ Hours of Life: {hours_of_life:.1f} hours")
     except Exception:
         st.warning("Unable to calculate age. Please check date and time inputs.")
 
+    trajectory = show_serial_readings(dob, birth_time)
+
     # --- High-Risk Criteria ---
     st.markdown("**Select Risk Factors (High-Risk Criteria):**")
     risk_factors = st.multiselect(
@@ -39,7 +129,7 @@ def run_neonatal_jaundice_page():
             "G6PD deficiency & other hemolytic conditions",
             "ABO incompatibility",
             "Rhesus incompatibility",
-            "Rapidly rising serum bilirubin (>103 µmol/L per day)",
+            RAPID_RISE_CRITERION,
             "Late preterm (35–36 weeks)",
             "Asphyxia (Apgar ≤ 5 at 1 and 5 minutes)",
             "Family history of severe NNJ in siblings needing exchange transfusion",
@@ -47,14 +137,15 @@ def run_neonatal_jaundice_page():
             "Infants with birth weight 2000–2500 g",
             "Mother's blood group and antibody titers unknown",
             "Exclusive breastfeeding with ≥10% weight loss before regaining birth weight"
-        ]
+        ],
+        key=RISK_FACTORS_KEY
     )
 
-    auto_risk = "High-Risk" if risk_factors else "Normal-Risk"
+    auto_risk = HIGH_RISK if risk_factors else NORMAL_RISK
     selected_risk = st.radio(
         "Infant Risk Category (can override):",
-        ["High-Risk", "Normal-Risk"],
-        index=0 if auto_risk == "High-Risk" else 1
+        [HIGH_RISK, NORMAL_RISK],
+        index=0 if auto_risk == HIGH_RISK else 1
     )
 
     # --- Measurement Type ---
@@ -63,83 +154,6 @@ def run_neonatal_jaundice_page():
         ["Transcutaneous Bilirubin (TcB)", "Serum Bilirubin (SB)"]
     )
 
-    # ===============================
-    # TcB → SB SCREENING
-    # ===============================
-    def tcb_to_sb_needed(hours, risk, tcb):
-        rules_normal = [
-            (25,36,160),(37,48,180),(49,72,200),(73,96,220),
-            (97,120,220),(121,168,240),(169,336,250)
-        ]
-        rules_high = [
-            (0,12,80),(13,24,120),(25,36,140),(37,48,160),
-            (49,72,180),(73,96,200),(97,120,200),
-            (121,168,220),(169,336,240)
-        ]
-        rules = rules_high if risk == "High-Risk" else rules_normal
-        for start, end, threshold in rules:
-            if start <= hours <= end:
-                return tcb > threshold
-        return False
-
-    # ===============================
-    # SB RULE TABLES
-    # ===============================
-    HIGH_RISK_RULES = [
-        (0,12,   None,100,150,175,200),
-        (13,24,  None,150,200,225,250),
-        (25,36,  135,175,225,250,275),
-        (37,48,  160,200,250,275,300),
-        (49,72,  185,225,275,300,325),
-        (73,96,  210,250,300,325,350),
-        (97,120, 210,250,300,325,350),
-        (121,168,235,275,325,350,375),
-        (169,336,260,300,325,350,375),
-    ]
-
-    NORMAL_RISK_RULES = [
-        (25,36,  160,200,250,275,300),
-        (37,48,  185,225,300,325,350),
-        (49,72,  210,250,300,325,350),
-        (73,96,  235,275,325,350,375),
-        (97,120, 235,275,350,375,400),
-        (121,168,260,300,350,375,400),
-        (169,336,285,325,375,400,425),
-    ]
-
-    # ===============================
-    # SB EVALUATION ENGINE
-    # ===============================
-    def evaluate_jaundice(age, sb, on_phototherapy, rules):
-        for start, end, stop_pt, single, double, intense, exchange in rules:
-            if start <= age <= end:
-
-                # INPATIENT
-                if on_phototherapy:
-                    if stop_pt is not None and sb <= stop_pt:
-                        return ("🟢 Stop phototherapy", "lightblue")
-                    if sb < double:
-                        return ("🟡 Continue single blue phototherapy", "khaki")
-                    if sb < intense:
-                        return ("🟠 Double blue phototherapy", "orange")
-                    if sb < exchange:
-                        return ("🔴 Intense phototherapy", "tomato")
-                    return ("⚠️ Exchange transfusion indicated", "red")
-
-                # OUTPATIENT
-                else:
-                    if sb < single:
-                        return ("🟢 Continue monitoring (outpatient)", "lightgreen")
-                    if sb < double:
-                        return ("🟡 Start single blue phototherapy", "khaki")
-                    if sb < intense:
-                        return ("🟠 Double blue phototherapy", "orange")
-                    if sb < exchange:
-                        return ("🔴 Intense phototherapy", "tomato")
-                    return ("⚠️ Exchange transfusion indicated", "red")
-
-        return ("Age out of range", "lightgray")
-
     # ===============================
     # DISPLAY RESULTS
     # ===============================
@@ -148,27 +162,31 @@ def run_neonatal_jaundice_page():
         if measurement_type == "Transcutaneous Bilirubin (TcB)":
             tcb_value = st.number_input("Enter TcB level (µmol/L):", min_value=0)
             if st.button("Evaluate TcB"):
-                if tcb_to_sb_needed(hours_of_life, selected_risk, tcb_value):
-                    st.warning("⚠️ TcB exceeds threshold – perform Serum Bilirubin test")
+                memo = session_memo(st.session_state)
+                args = (hours_of_life, selected_risk, tcb_value)
+                if memo.call(tcb_to_sb_needed, *args, key=tcb_key(*args)):
+                    st.warning(TCB_MESSAGES[True])
                 else:
-                    st.success("✅ TcB below threshold – continue monitoring")
+                    st.success(TCB_MESSAGES[False])
 
         else:
             sb_level = st.number_input("Enter SB level (µmol/L):", min_value=0)
             on_phototherapy = st.checkbox("Infant is currently on phototherapy (inpatient)")
 
             if st.button("Evaluate SB"):
-                rules = HIGH_RISK_RULES if selected_risk == "High-Risk" else NORMAL_RISK_RULES
-                message, color = evaluate_jaundice(
-                    hours_of_life,
-                    sb_level,
-                    on_phototherapy,
-                    rules
-                )
+                memo = session_memo(st.session_state)
+                args = (hours_of_life, sb_level, selected_risk, on_phototherapy)
+                message, color = memo.call(evaluate_jaundice, *args, key=jaundice_key(*args))
 
                 st.markdown(
                     f"<div style='background-color:{color}; padding:15px; "
                     f"border-radius:10px; font-weight:bold; text-align:center;'>"
                     f"{message}</div>",
                     unsafe_allow_html=True
-                )
\ No newline at end of file
+                )
+
+    # ===============================
+    # TRAJECTORY
+    # ===============================
+    if trajectory is not None and trajectory.readings:
+        show_trajectory_chart(trajectory, selected_risk)
@@ -1,13 +1,87 @@
 import streamlit as st
 
+from core.feeds import (
+    FEEDS_PER_DAY, IV_FLUIDS_ML_PER_KG, PROTOCOLS, SCHEDULE_DAYS, day_feeds, feed_plan, feed_volumes
+)
+from core.memo import session_memo
+
+DAYS_PER_PAGE = 7
+
+
+def parse_weights(birth_weight, text):
+    """((day, kg), ...) from the birth weight plus "day:kg" entries such as "7:2.6, 14:2.9"."""
+    weights = {1: birth_weight}
+    for entry in text.replace(";", ",").split(","):
+        if not entry.strip():
+            continue
+        day, _, kg = entry.partition(":")
+        try:
+            day, kg = int(day), float(kg)
+        except ValueError:
+            day = kg = 0
+        if not 1 <= day <= SCHEDULE_DAYS or kg <= 0:
+            raise ValueError(entry.strip())
+        weights[day] = kg
+    return tuple(sorted(weights.items()))
+
+
+def show_schedule(weight, interval):
+    st.markdown(f"### 📅 Feed schedule to day {SCHEDULE_DAYS}")
+    protocol = st.selectbox("Advancement protocol", list(PROTOCOLS), key="ft_protocol")
+    later_weights = st.text_input(
+        "Later weights (day:kg, comma-separated):",
+        key="ft_later_weights",
+        placeholder="e.g., 7:2.6, 14:2.9"
+    )
+    try:
+        weights = parse_weights(weight, later_weights)
+    except ValueError as e:
+        st.warning(f"Could not read weight entry '{e}'. Use day:kg, e.g. 7:2.6.")
+        return
+
+    # Only the visible week is generated; the plan is shared across reruns.
+    plan = feed_plan(weights, interval, protocol)
+    pages = range(1, SCHEDULE_DAYS + 1, DAYS_PER_PAGE)
+    first = st.radio(
+        "Days:",
+        list(pages),
+        format_func=lambda d: f"{d}–{min(d + DAYS_PER_PAGE - 1, SCHEDULE_DAYS)}",
+        horizontal=True,
+        key="ft_schedule_page"
+    )
+    days = plan.days(first, min(first + DAYS_PER_PAGE - 1, SCHEDULE_DAYS))
+
+    st.dataframe(
+        [
+            {
+                "Day": d.day,
+                "Weight (kg)": d.weight,
+                "Enteral (ml/kg/day)": d.enteral_ml_per_kg,
+                "Enteral (ml/day)": round(d.enteral),
+                f"Per feed ({interval}, ml)": round(d.per_feed, 1),
+                "IV top-up (ml/day)": round(d.iv_top_up),
+                "IV top-up (ml/hr)": round(d.iv_top_up / 24, 1),
+            }
+            for d in days
+        ],
+        hide_index=True,
+    )
+    st.caption(
+        f"IV top-up = IV fluids at {IV_FLUIDS_ML_PER_KG} ml/kg/day (the figure above, with no feeds) "
+        "less the day's enteral volume, never below zero."
+    )
+
+    selected = st.selectbox("Feed-by-feed for day:", [d.day for d in days], key="ft_schedule_day")
+    plan_day = days[selected - first]
+    st.caption(
+        " · ".join(f"+{feed.hour:02d}h {feed.volume:.1f} ml" for feed in day_feeds(plan_day, interval))
+    )
+
+
 def run_neonate_feeds_page():
     st.subheader("🍼 Neonate Feeds / IV Fluids Calculator")
 
-    # Back button
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
-        # --- Inputs with blank defaults ---
+    # --- Inputs with blank defaults ---
     weight_neonate = st.number_input(
         "Enter neonate weight (kg):",
         min_value=0.0,
@@ -28,24 +102,20 @@ def run_neonate_feeds_page():
 
     feed_interval = st.radio(
         "Feeding Interval:",
-        ["2-hourly", "3-hourly"],
+        list(FEEDS_PER_DAY),
         index=None,   # 👈 no default selection
         key="ft_interval"
     )
 
-    # Feed ml/kg/day by day (default from day 4 onwards is 150 ml/kg/day)
-    feed_dict = {1: 60, 2: 90, 3: 120}
-    feed_ml_per_kg = feed_dict.get(day_of_life, 150) if day_of_life else None
-
     if st.button("Calculate Feeds", key="calc_feeds"):
         if weight_neonate is not None and day_of_life is not None and feed_interval is not None:
-            total_feed = weight_neonate * feed_ml_per_kg
-            feeds_per_day = 12 if feed_interval == "2-hourly" else 8
-            feed_per_time = total_feed / feeds_per_day
-            iv_fluids = weight_neonate * 100
-
-            st.success(f"Total Feed Volume: {total_feed:.0f} ml/day")
-            st.info(f"Feed Volume per Feed ({feed_interval}): {feed_per_time:.0f} ml")
-            st.warning(f"IV Fluids Volume: {iv_fluids:.0f} ml/day")
+            volumes = session_memo(st.session_state).call(feed_volumes, weight_neonate, day_of_life, feed_interval)
+
+            st.success(f"Total Feed Volume: {volumes.total_feed:.0f} ml/day")
+            st.info(f"Feed Volume per Feed ({feed_interval}): {volumes.per_feed:.0f} ml")
+            st.warning(f"IV Fluids Volume: {volumes.iv_fluids:.0f} ml/day")
         else:
-            st.warning("⚠️ Please enter all inputs before calculating.")    
\ No newline at end of file
+            st.warning("⚠️ Please enter all inputs before calculating.")    
+
+    if weight_neonate and feed_interval is not None:
+        show_schedule(weight_neonate, feed_interval)
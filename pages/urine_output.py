@@ -1,19 +1,17 @@
 import streamlit as st
 
+from core.urine_output import NEONATE, NORMAL_THRESHOLD, PEDIATRIC, is_normal_output, urine_output_rate
+
 def run_urine_output_page():
     st.subheader("🚰 Urine Output Calculator")
 
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
-
     # =========================
     # INPUTS (SAFE STREAMLIT TYPES)
     # =========================
 
     age_group = st.radio(
         "Select Age Group:",
-        ["Neonate (<28 days)", "Pediatric (≥28 days)"],
+        [NEONATE, PEDIATRIC],
         key="uo_age_group"
     )
 
@@ -46,21 +44,14 @@ def run_urine_output_page():
 
         if weight > 0 and urine_24h > 0:
 
-            uo_mlkg_hr = urine_24h / weight / 24
+            uo_mlkg_hr = urine_output_rate(weight, urine_24h)
 
             st.info(f"Urine Output: {uo_mlkg_hr:.2f} ml/kg/hr")
 
-            if age_group == "Neonate (<28 days)":
-                if uo_mlkg_hr > 0.5:
-                    st.success("✅ Normal (>0.5 ml/kg/hr)")
-                else:
-                    st.error("⚠️ Low urine output")
-
+            if is_normal_output(uo_mlkg_hr, age_group):
+                st.success(f"✅ Normal (>{NORMAL_THRESHOLD[age_group]:g} ml/kg/hr)")
             else:
-                if uo_mlkg_hr > 1.0:
-                    st.success("✅ Normal (>1 ml/kg/hr)")
-                else:
-                    st.error("⚠️ Low urine output")
+                st.error("⚠️ Low urine output")
 
         else:
             st.warning("Please enter valid values.")
\ No newline at end of file
@@ -1,13 +1,13 @@
 import streamlit as st
 
+from core.ews import ESCALATION, ews_scores
+from core.memo import session_memo
+from core.vitals import HIGH, LOW, classify, fever_compensation, reference_ranges
+
+
 def run_vitals_page():
     st.subheader("📊 Vital Signs Reference")
 
-    # Back button
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
-
     # =========================
     # AGE INPUT
     # =========================
@@ -58,37 +58,12 @@ def run_vitals_page():
         )
 
     # =========================
-    # AGE RANGES
-    # =========================
-    ranges = [
-        (0, 0.25, (90, 180), (30, 60)),
-        (0.25, 0.5, (80, 160), (30, 60)),
-        (0.5, 1, (80, 140), (25, 45)),
-        (1, 6, (75, 130), (20, 30)),
-        (6, 10, (70, 110), (16, 24)),
-        (10, 15, (60, 100), (14, 20)),
-        (15, 200, (60, 100), (12, 20))
-    ]
-
-    hr_range, rr_range = None, None
-
-    if age_years is not None:
-        for low, high, hr_r, rr_r in ranges:
-            if low <= age_years < high:
-                hr_range, rr_range = hr_r, rr_r
-                break
-
-    # =========================
-    # SBP RANGE
+    # REFERENCE RANGES
     # =========================
-    sbp_range = None
+    hr_range, rr_range, sbp_range = None, None, None
 
     if age_years is not None:
-        if age_years < 10:
-            sbp_min = (age_years * 2) + 70
-            sbp_range = (sbp_min, 120)
-        else:
-            sbp_range = (90, 120)
+        hr_range, rr_range, sbp_range = session_memo(st.session_state).call(reference_ranges, age_years)
 
     # =========================
     # FEVER HR ADJUSTMENT
@@ -96,7 +71,7 @@ def run_vitals_page():
     adjusted_hr = hr
 
     if temp and hr:
-        compensation = int((temp - 37.0) * 10)
+        compensation = fever_compensation(temp)
         adjusted_hr = hr - compensation
         st.info(f"Fever adjustment: -{compensation} bpm → {adjusted_hr} bpm")
 
@@ -104,25 +79,35 @@ def run_vitals_page():
     # RESULTS
     # =========================
     if hr_range and hr:
-        if adjusted_hr < hr_range[0]:
+        status = classify(adjusted_hr, hr_range)
+        if status == LOW:
             st.error(f"Bradycardia (HR {hr})")
-        elif adjusted_hr > hr_range[1]:
+        elif status == HIGH:
             st.error(f"Tachycardia (HR {hr})")
         else:
             st.success(f"HR normal ({hr_range[0]}–{hr_range[1]})")
 
     if rr_range and rr:
-        if rr < rr_range[0]:
+        status = classify(rr, rr_range)
+        if status == LOW:
             st.error("Bradypnea")
-        elif rr > rr_range[1]:
+        elif status == HIGH:
             st.error("Tachypnea")
         else:
             st.success("RR normal")
 
     if sbp_range and sbp:
-        if sbp < sbp_range[0]:
+        status = classify(sbp, sbp_range)
+        if status == LOW:
             st.error("Hypotension")
-        elif sbp > sbp_range[1]:
+        elif status == HIGH:
             st.error("Hypertension")
         else:
-            st.success("BP normal")
\ No newline at end of file
+            st.success("BP normal")
+
+    # =========================
+    # EARLY-WARNING SCORE
+    # =========================
+    if age_years is not None and (hr or rr or sbp):
+        ews = ews_scores(age_years, hr, rr, sbp, temp or float("nan"))
+        st.markdown(f"**Early-warning score:** {int(ews.score)} – {ESCALATION[int(ews.band)][1]}")
@@ -0,0 +1,26 @@
+"""Run the calculation service.
+
+    python -m service [--host 127.0.0.1] [--port 8600] [--workers N]
+"""
+import argparse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the calculators as JSON endpoints.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--workers", type=int, help="worker processes for large batches (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+
+        from service.app import create_app
+    except ImportError:
+        raise SystemExit("The service needs starlette and uvicorn: pip install -r requirements-service.txt")
+
+    uvicorn.run(create_app(args.workers), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
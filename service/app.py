@@ -0,0 +1,198 @@
+"""JSON calculation service exposing the calculators to other ward systems.
+
+Every endpoint takes a batch and answers in the same order:
+
+    POST /v1/fluids       {"items": [{"weight": 12.5, "rehydration_percent": 5}, ...]}
+    POST /v1/jaundice     {"items": [{"birth_datetime": ..., "sample_datetime": ...,
+                                      "value": 220, "measurement_type": "SB",
+                                      "risk_factors": "", "on_phototherapy": false}, ...]}
+    POST /v1/dose-check   {"items": [{"weight": 20, "drug": "Rocephin", "route": "IV",
+                                      "dose": 1000, "frequency": "Q12H", "system": ""}, ...]}
+    GET  /health
+    GET  /metrics         Prometheus text
+
+    -> {"results": [...]}
+
+Item fields match the batch.jaundice / batch.orders CSV columns and are
+scored by the same code. Large batches are handed to a process pool so the
+event loop keeps serving small requests; nothing is fetched over the network.
+"""
+import asyncio
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from batch import jaundice as batch_jaundice
+from batch import orders as batch_orders
+from core.fluids import fluid_requirement
+from core.formulary import formulary
+from core.metrics import registry as metrics
+from core.search import medication_index
+
+# Batches at least this long go to the worker pool; smaller ones are cheaper
+# to score inline than to pickle across processes.
+POOL_MIN_ITEMS = int(os.environ.get("KKH_SERVICE_POOL_MIN", "256"))
+MAX_ITEMS = int(os.environ.get("KKH_SERVICE_MAX_ITEMS", "10000"))
+
+
+# ===============================
+# BATCH SCORERS (run inline or in a worker)
+# ===============================
+def fluids_batch(items):
+    results = []
+    for item in items:
+        try:
+            weight = float(item["weight"])
+            if not math.isfinite(weight):
+                raise ValueError(f"weight must be a finite number, got {item['weight']!r}")
+            r = fluid_requirement(weight, int(item.get("rehydration_percent", 0)))
+        except (KeyError, TypeError, ValueError) as e:
+            results.append({"error": f"invalid item: {e}"})
+            continue
+        results.append({
+            "maintenance_ml_day": r.maintenance,
+            "rehydration_ml_day": r.rehydration,
+            "total_ml_day": r.total,
+            "ml_per_hr": round(r.ml_per_hr, 1),
+        })
+    return results
+
+
+def _cell(value):
+    """A JSON value as the CSV cell text the batch parsers expect.
+
+    null, false and empty arrays/objects are blank cells and true is "yes",
+    so a JSON false risk factor is not read as the text "False".
+    """
+    if value is None or value is False or value == [] or value == {}:
+        return ""
+    if value is True:
+        return "yes"
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    raise TypeError(f"expected a string, number or boolean, got {type(value).__name__}")
+
+
+def _rows(items, header):
+    """(rows, errors): CSV-style rows for the valid items and {index: error} for the rest."""
+    rows, errors = [], {}
+    for i, item in enumerate(items):
+        try:
+            rows.append([_cell(item.get(c)) for c in header])
+        except TypeError as e:
+            errors[i] = {"error": f"invalid item: {e}"}
+    return rows, errors
+
+
+def _merge(results, errors, n):
+    """Put per-item errors back in request order."""
+    results = iter(results)
+    return [errors[i] if i in errors else next(results) for i in range(n)]
+
+
+def jaundice_batch(items):
+    header = batch_jaundice.REQUIRED_COLUMNS + ("on_phototherapy",)
+    rows, errors = _rows(items, header)
+    results = []
+    if rows:
+        scored = batch_jaundice.score_chunk(dict(zip(header, zip(*rows))))
+        results = [
+            {
+                "hours_of_life": None if np.isnan(h) else float(h),
+                "risk": str(risk),
+                "action": str(action),
+            }
+            for h, risk, action in zip(scored["hours_of_life"], scored["risk"], scored["action"])
+        ]
+    return _merge(results, errors, len(items))
+
+
+def dose_check_batch(items):
+    header = batch_orders.REQUIRED_COLUMNS + ("system",)
+    rows, errors = _rows(items, header)
+    results = []
+    if rows:
+        out, _ = batch_orders.verify_chunk(header, rows)
+        results = [
+            {"resolved_drug": name or None, "warnings": warnings.split("; ") if warnings else []}
+            for name, warnings in out
+        ]
+    return _merge(results, errors, len(items))
+
+
+def _warm_worker():
+    # Build the process-wide lookup tables once per worker, not per batch.
+    formulary()
+    medication_index()
+
+
+# ===============================
+# HANDLERS
+# ===============================
+def _error(status, message):
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def batch_endpoint(name, scorer):
+    async def endpoint(request):
+        try:
+            body = await request.json()
+        except ValueError:
+            return _error(400, "body must be JSON")
+        items = body.get("items") if isinstance(body, dict) else None
+        if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+            return _error(400, 'expected {"items": [{...}, ...]}')
+        if len(items) > MAX_ITEMS:
+            return _error(413, f"at most {MAX_ITEMS} items per request")
+
+        pool = request.app.state.pool
+        with metrics.timer("endpoint", name):
+            if pool is not None and len(items) >= POOL_MIN_ITEMS:
+                results = await asyncio.get_running_loop().run_in_executor(pool, scorer, items)
+            else:
+                results = scorer(items)
+        return JSONResponse({"results": results})
+
+    return endpoint
+
+
+async def health(request):
+    return JSONResponse({"status": "ok"})
+
+
+async def prometheus(request):
+    return PlainTextResponse(metrics.render_prometheus())
+
+
+# ===============================
+# APP
+# ===============================
+def create_app(workers=None):
+    """Starlette app; `workers` worker processes (0 scores everything inline)."""
+    if workers is None:
+        workers = int(os.environ.get("KKH_SERVICE_WORKERS", os.cpu_count() or 1))
+
+    @asynccontextmanager
+    async def lifespan(app):
+        _warm_worker()
+        app.state.pool = ProcessPoolExecutor(workers, initializer=_warm_worker) if workers > 0 else None
+        try:
+            yield
+        finally:
+            if app.state.pool is not None:
+                app.state.pool.shutdown(cancel_futures=True)
+
+    routes = [
+        Route("/v1/fluids", batch_endpoint("fluids", fluids_batch), methods=["POST"]),
+        Route("/v1/jaundice", batch_endpoint("jaundice", jaundice_batch), methods=["POST"]),
+        Route("/v1/dose-check", batch_endpoint("dose_check", dose_check_batch), methods=["POST"]),
+        Route("/health", health),
+        Route("/metrics", prometheus),
+    ]
+    return Starlette(routes=routes, lifespan=lifespan)
@@ -1,15 +1,16 @@
+import importlib
+import os
+from typing import NamedTuple
+
 import streamlit as st
-from datetime import datetime
-import pytz
-from pages.dosage import run_dosage_page 
-from pages.fluids import run_fluids_page
-from pages.bmi import run_bmi_page
-from pages.neonatal_jaundice import run_neonatal_jaundice_page
-from pages.corrected_age import run_corrected_age_page
-from pages.neonate_feeds import run_neonate_feeds_page
-from pages.compatibility import run_compatibility_page
-from pages.vitals import run_vitals_page
-from pages.urine_output import run_urine_output_page
+
+from core.memo import session_memo
+from core.metrics import registry as metrics
+
+# Optional Prometheus textfile export, rewritten at most every
+# KKH_METRICS_INTERVAL seconds.
+METRICS_FILE = os.environ.get("KKH_METRICS_FILE")
+METRICS_INTERVAL = float(os.environ.get("KKH_METRICS_INTERVAL", "15"))
 
 
 st.set_page_config(page_title="🩺 Nursing Calculator", page_icon="🩺", layout="wide")
@@ -27,99 +28,144 @@ st.markdown("A collection of essential nursing calculators.")
 # ------------------------------
 # SESSION STATE
 # ------------------------------
-if "page" not in st.session_state:
-    st.session_state.page = "home"
-
 if "sync_ordered_dose" not in st.session_state:
     st.session_state.sync_ordered_dose = 0.0
 
 
 # ------------------------------
-# HOME PAGE
+# PAGE REGISTRY
 # ------------------------------
-def show_home():
-    st.subheader("Select a Calculator:")
+class Page(NamedTuple):
+    title: str
+    module: str
+    func: str
 
-    calculators = [
-        ("💊 Dosage Verification / Dispensing", "dosage_dispensing"),
-        ("🧒 Pediatric Fluids Requirement", "fluids"),
-        ("⚖️ BMI", "bmi"),
-        ("🌞 Neonatal Jaundice", "jaundice"),
-        ("🍼 Corrected Age", "corrected_age"),
-        ("🍼 Neonate Feeds", "neonate_feeds"),
-        ("💉 Drug Compatibility", "compatibility"),
-        ("📊 Vital Signs", "vitals"),
-        ("🚰 Urine Output", "urine_output"),
-    ]
 
-    for i in range(0, len(calculators), 5):
-        cols = st.columns(5)
-        for col, (name, key) in zip(cols, calculators[i:i+5]):
-            if col.button(name, key=key):
-                st.session_state.page = key
-                st.rerun()
+HOME = "home"
 
+# Route (the ?page= query parameter) -> page. Modules are only imported
+# when their page is shown, so the home screen never pays for them.
+PAGES = {
+    "dosage_dispensing": Page("💊 Dosage Verification / Dispensing", "pages.dosage", "run_dosage_page"),
+    "fluids": Page("🧒 Pediatric Fluids Requirement", "pages.fluids", "run_fluids_page"),
+    "bmi": Page("⚖️ BMI", "pages.bmi", "run_bmi_page"),
+    "jaundice": Page("🌞 Neonatal Jaundice", "pages.neonatal_jaundice", "run_neonatal_jaundice_page"),
+    "corrected_age": Page("🍼 Corrected Age", "pages.corrected_age", "run_corrected_age_page"),
+    "neonate_feeds": Page("🍼 Neonate Feeds", "pages.neonate_feeds", "run_neonate_feeds_page"),
+    "compatibility": Page("💉 Drug Compatibility", "pages.compatibility", "run_compatibility_page"),
+    "vitals": Page("📊 Vital Signs", "pages.vitals", "run_vitals_page"),
+    "urine_output": Page("🚰 Urine Output", "pages.urine_output", "run_urine_output_page"),
+}
 
-def back_to_home():
-    if st.button("🏠 Back to Home"):
-        st.session_state.page = "home"
-        st.rerun()
+
+@st.cache_resource(show_spinner=False)
+def load_page(key):
+    page = PAGES[key]
+    module = importlib.import_module(page.module)
+    return getattr(module, page.func)
 
 
 # ------------------------------
-# NAVIGATION
+# ROUTING
 # ------------------------------
-if st.session_state.page == "home":
-    show_home()
+# The current page lives in the URL (?page=fluids), so calculators can be
+# bookmarked and survive a browser refresh. Navigation happens in button
+# callbacks, which run before the script: one rerun per click.
+def current_page():
+    page = st.query_params.get("page", HOME)
+    return page if page in PAGES else HOME
 
 
-# ==========================================================
-#1 💊 DOSAGE PAGE (FIXED - FULLY SCOPED)
-# ==========================================================
-elif st.session_state.page == "dosage_dispensing":
-    run_dosage_page()
+def go_to(page):
+    if page == HOME:
+        st.query_params.pop("page", None)
+    else:
+        st.query_params["page"] = page
 
-# ------------------------------
-#2 Pediatric Fluids Requirement
-# ------------------------------
-elif st.session_state.page == "fluids":
-    run_fluids_page()
 
 # ------------------------------
-# 4. BMI
+# HOME PAGE
 # ------------------------------
-elif st.session_state.page == "bmi":
-    run_bmi_page()
+def show_home():
+    st.subheader("Select a Calculator:")
+
+    calculators = list(PAGES.items())
+    for i in range(0, len(calculators), 5):
+        cols = st.columns(5)
+        for col, (key, page) in zip(cols, calculators[i:i+5]):
+            col.button(page.title, key=key, on_click=go_to, args=(key,))
+
+
+def back_to_home():
+    st.button("🏠 Back to Home", on_click=go_to, args=(HOME,))
 
-# ------------------------------
-# 5. Neonatal Jaundice
-# ------------------------------
-elif st.session_state.page == "jaundice":
-    run_neonatal_jaundice_page()
 
 # ------------------------------
-# 6. Corrected Age
+# DEBUG PANEL (?debug=1)
 # ------------------------------
-elif st.session_state.page == "corrected_age":
-    run_corrected_age_page()
+def show_debug_panel():
+    memo = session_memo(st.session_state)
+    with st.sidebar.expander("🛠 Result cache (this session)", expanded=True):
+        stats = memo.stats()
+        if not stats:
+            st.caption("No cached results yet.")
+        for name, s in stats.items():
+            calls = s["hits"] + s["misses"]
+            st.markdown(
+                f"`{name.split('.', 1)[-1]}`  \n"
+                f"hits {s['hits']} · misses {s['misses']} · "
+                f"hit rate {s['hits'] / calls if calls else 0:.0%} · "
+                f"entries {s['entries']}/{s['maxsize']}"
+            )
+        if st.button("Clear cache", key="debug_clear_memo"):
+            memo.clear()
+
+
+if st.query_params.get("debug") == "1":
+    show_debug_panel()
 
-#7. Neonate feeds 
-#------------------------------
-elif st.session_state.page == "neonate_feeds":
-    run_neonate_feeds_page()
 
 # ------------------------------
-# 8. Drug Compatibility
+# METRICS PAGE (?admin=metrics)
 # ------------------------------
-elif st.session_state.page == "compatibility":
-    run_compatibility_page()
+def show_metrics_page():
+    st.subheader("📈 Performance metrics")
+    snapshot = metrics.snapshot()
+    rows = [
+        {
+            "Kind": kind,
+            "Name": name,
+            "Calls": h.count,
+            "Mean ms": h.total / h.count * 1000 if h.count else 0.0,
+            "Exceptions": sum(h.errors.values()),
+        }
+        for (kind, name), h in sorted(snapshot.items())
+    ]
+    st.dataframe(rows, hide_index=True)
+    text = metrics.render_prometheus()
+    st.download_button("Download Prometheus metrics", text, file_name="kkh_nursing_metrics.prom")
+    with st.expander("Prometheus text"):
+        st.code(text, language="text")
 
-# 9. Vital Signs
-# ------------------------------
-elif st.session_state.page == "vitals":
-    run_vitals_page()
 
-# 10. Urine Output
-#----------------------------------------------
-elif st.session_state.page == "urine_output":
-    run_urine_output_page()
\ No newline at end of file
+# ------------------------------
+# NAVIGATION
+# ------------------------------
+def render_page():
+    page = current_page()
+    try:
+        with metrics.timer("page", page):
+            if page == HOME:
+                show_home()
+            else:
+                back_to_home()
+                load_page(page)()
+    finally:
+        if METRICS_FILE:
+            metrics.write_textfile(METRICS_FILE, METRICS_INTERVAL)
+
+
+if st.query_params.get("admin") == "metrics":
+    show_metrics_page()
+else:
+    render_page()